@@ -0,0 +1,62 @@
+"""
+Benchmark batch rendering throughput from 1 to N worker processes.
+
+Renders every bundled template with its default preset against a sweep of
+repo_path/scope overrides and reports items per second for each worker
+count.
+
+Usage:
+    python benchmarks/render_throughput.py [--items N] [--max-jobs N] [--chunksize N]
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import time
+
+from pk.batch import render_many
+from pk.render import list_presets, list_templates
+
+
+def sweep(count: int) -> list[dict]:
+    """Build count distinct override sets."""
+    return [
+        {"repo_path": f"/srv/repos/project-{i}", "scope": [f"src/{i}/", "lib/"]}
+        for i in range(count)
+    ]
+
+
+def run(items: int, jobs: int, chunksize: int) -> tuple[int, float]:
+    """Render items per template with jobs workers; return (rendered, seconds)."""
+    params = sweep(items)
+    rendered = 0
+    start = time.perf_counter()
+    for template in list_templates():
+        name = template["name"]
+        preset = "default" if "default" in list_presets(name) else None
+        for result in render_many(name, preset, params, jobs=jobs, chunksize=chunksize):
+            if not result.ok:
+                raise SystemExit(f"{name}: {result.error}")
+            rendered += 1
+    return rendered, time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--items", type=int, default=2000, help="items per template")
+    parser.add_argument("--max-jobs", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--chunksize", type=int, default=64)
+    args = parser.parse_args()
+
+    print(f"{'jobs':>4}  {'items':>7}  {'seconds':>8}  {'items/s':>9}  speedup")
+    baseline = None
+    for jobs in range(1, args.max_jobs + 1):
+        count, seconds = run(args.items, jobs, args.chunksize)
+        rate = count / seconds
+        baseline = baseline or rate
+        print(f"{jobs:>4}  {count:>7}  {seconds:>8.2f}  {rate:>9.0f}  {rate / baseline:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
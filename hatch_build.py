@@ -0,0 +1,55 @@
+"""Hatch build hook that ships precompiled templates and preset snapshots in the wheel."""
+
+from __future__ import annotations
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+from hatchling.builders.hooks.plugin.interface import BuildHookInterface
+
+
+class PrecompileTemplatesHook(BuildHookInterface):
+    """
+    Compile every templates/*/template.md into pk/_precompiled and render
+    every templates/*/examples/*.yaml preset into pk/_snapshots.
+    """
+
+    PLUGIN_NAME = "custom"
+
+    def initialize(self, version: str, build_data: dict) -> None:
+        # Editable installs read templates straight from the source tree.
+        if self.target_name != "wheel" or version == "editable":
+            return
+
+        root = Path(self.root)
+        sys.path.insert(0, str(root))
+        try:
+            from pk.precompile import precompile_templates
+            from pk.snapshots import build_snapshots
+        finally:
+            sys.path.pop(0)
+
+        self._out_dir = tempfile.TemporaryDirectory(prefix="pk-precompiled-")
+        out = Path(self._out_dir.name) / "_precompiled"
+        precompile_templates(root / "templates", out)
+        build_data["force_include"][str(out)] = "pk/_precompiled"
+
+        # Rendering fills pk's disk caches; keep them out of the builder's home
+        snapshots = Path(self._out_dir.name) / "_snapshots"
+        saved = os.environ.get("PK_CACHE_DIR")
+        os.environ["PK_CACHE_DIR"] = str(Path(self._out_dir.name) / "cache")
+        try:
+            build_snapshots(root / "templates", snapshots)
+        finally:
+            if saved is None:
+                del os.environ["PK_CACHE_DIR"]
+            else:
+                os.environ["PK_CACHE_DIR"] = saved
+        build_data["force_include"][str(snapshots)] = "pk/_snapshots"
+
+    def finalize(self, version: str, build_data: dict, artifact_path: str) -> None:
+        out_dir = getattr(self, "_out_dir", None)
+        if out_dir is not None:
+            out_dir.cleanup()
@@ -0,0 +1,212 @@
+"""
+Batch rendering of one template against many parameter sets.
+
+Loading, parsing, validator construction, validation of the preset layer
+and template compilation happen once per batch (and once per worker
+process in parallel mode); each item only merges its overrides, validates
+the overridden keys and renders.
+"""
+
+from __future__ import annotations
+
+import itertools
+import os
+from collections import deque
+from collections.abc import Iterable, Iterator
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, NamedTuple
+
+from jinja2 import TemplateSyntaxError
+
+from pk.catalog import _load_shared_schema
+from pk.render import (
+    RenderError,
+    TemplateError,
+    compute_hash,
+    get_compiled_template,
+    get_specialized_template,
+    load_preset,
+    load_template,
+    prepare_validated_base,
+    render_compiled,
+    specializable_keys,
+    validate_overlay,
+)
+
+
+class RenderResult(NamedTuple):
+    """Outcome of rendering one parameter set in a batch."""
+
+    params: dict[str, Any]
+    rendered: str | None
+    prompt_hash: str | None
+    error: TemplateError | None = None
+
+    @property
+    def ok(self) -> bool:
+        """Whether the item rendered successfully."""
+        return self.error is None
+
+
+class BatchRenderer:
+    """
+    Render one template and preset against many parameter overrides.
+
+    Args:
+        template_name: Name of the template.
+        preset: Optional preset name applied beneath every item.
+        specialize: Render each item with a template variant specialized
+            for its enum and boolean parameter values (see
+            pk.render.get_specialized_template). Variants are cached, so
+            batches where those values rarely change compile only a few.
+
+    Raises:
+        TemplateNotFoundError: If the template doesn't exist.
+        PresetNotFoundError: If the preset doesn't exist.
+        TemplateError: If the template, schema or preset cannot be loaded.
+    """
+
+    def __init__(self, template_name: str, preset: str | None = None, specialize: bool = False):
+        self.template_name = template_name
+        self.preset = preset
+        self.template_text = load_template(template_name)
+        self.schema = _load_shared_schema(template_name)
+
+        preset_params = load_preset(template_name, preset) if preset else None
+        self.base = prepare_validated_base(self.schema, preset_params=preset_params)
+        self.base_params = self.base.params
+
+        self.fixed_keys = specializable_keys(self.schema) if specialize else []
+        try:
+            self.template = get_compiled_template(self.template_text, template_name)
+        except TemplateSyntaxError as e:
+            raise RenderError(f"Template syntax error: {e}") from e
+
+    def render_one(self, overrides: dict[str, Any] | None = None) -> RenderResult:
+        """
+        Render a single parameter set.
+
+        Args:
+            overrides: Parameters layered over schema defaults and the preset.
+
+        Returns:
+            RenderResult; validation and render failures are reported in
+            its error field rather than raised.
+        """
+        params = dict(self.base_params)
+        if overrides:
+            params.update(overrides)
+
+        try:
+            validate_overlay(self.base, overrides)
+            template = self.template
+            if self.fixed_keys:
+                fixed = {key: params[key] for key in self.fixed_keys if key in params}
+                template = get_specialized_template(
+                    self.template_text, fixed, self.template_name
+                )
+            rendered = render_compiled(template, params)
+        except TemplateError as e:
+            return RenderResult(params, None, None, e)
+
+        return RenderResult(params, rendered, compute_hash(rendered))
+
+
+def render_many(
+    template_name: str,
+    preset: str | None = None,
+    param_iter: Iterable[dict[str, Any]] = (),
+    jobs: int | None = 1,
+    chunksize: int = 64,
+    specialize: bool = False,
+) -> Iterator[RenderResult]:
+    """
+    Render a template against many parameter sets.
+
+    The template, schema and preset are loaded and compiled before this
+    returns, so missing templates or presets raise immediately. Items are
+    rendered lazily as the returned iterator is consumed.
+
+    With jobs > 1, items are sent in chunks to a process pool whose
+    workers each load and compile the template once. Results are still
+    yielded in input order, and only a few chunks per worker are in
+    flight at a time, so param_iter may be arbitrarily long.
+
+    Args:
+        template_name: Name of the template.
+        preset: Optional preset name applied beneath every item.
+        param_iter: Iterable of parameter overrides, one dict per item.
+        jobs: Number of worker processes. 1 renders in-process; None
+            uses os.cpu_count().
+        chunksize: Items sent to a worker per task in parallel mode.
+        specialize: Use template variants specialized for each item's
+            enum and boolean values (see BatchRenderer).
+
+    Returns:
+        Iterator of RenderResult in input order. Items that fail
+        validation carry the SchemaValidationError (with per-field
+        details in its errors attribute) instead of aborting the batch.
+
+    Raises:
+        TemplateError: If the template, schema or preset cannot be loaded.
+        ValueError: If jobs or chunksize is less than 1.
+    """
+    if jobs is None:
+        jobs = os.cpu_count() or 1
+    if jobs < 1:
+        raise ValueError("jobs must be at least 1")
+    if chunksize < 1:
+        raise ValueError("chunksize must be at least 1")
+
+    renderer = BatchRenderer(template_name, preset, specialize)
+    if jobs == 1:
+        return (renderer.render_one(overrides) for overrides in param_iter)
+    return _render_parallel(template_name, preset, param_iter, jobs, chunksize, specialize)
+
+
+# Per-process renderer installed by _init_worker in pool workers
+_worker_renderer: BatchRenderer | None = None
+
+
+def _init_worker(template_name: str, preset: str | None, specialize: bool) -> None:
+    """Warm a pool worker with the compiled template and validator."""
+    global _worker_renderer
+    _worker_renderer = BatchRenderer(template_name, preset, specialize)
+
+
+def _render_chunk(chunk: list[dict[str, Any]]) -> list[RenderResult]:
+    """Render a chunk of items in a pool worker."""
+    return [_worker_renderer.render_one(overrides) for overrides in chunk]
+
+
+def _render_parallel(
+    template_name: str,
+    preset: str | None,
+    param_iter: Iterable[dict[str, Any]],
+    jobs: int,
+    chunksize: int,
+    specialize: bool,
+) -> Iterator[RenderResult]:
+    """Render items across a process pool, yielding results in input order."""
+    items = iter(param_iter)
+    # Keep every worker busy with one chunk queued behind it
+    max_in_flight = jobs * 2
+
+    executor = ProcessPoolExecutor(
+        max_workers=jobs,
+        initializer=_init_worker,
+        initargs=(template_name, preset, specialize),
+    )
+    pending: deque[Future[list[RenderResult]]] = deque()
+    try:
+        while True:
+            while len(pending) < max_in_flight:
+                chunk = list(itertools.islice(items, chunksize))
+                if not chunk:
+                    break
+                pending.append(executor.submit(_render_chunk, chunk))
+            if not pending:
+                break
+            yield from pending.popleft().result()
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
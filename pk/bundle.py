@@ -0,0 +1,360 @@
+"""
+Single-file template bundles.
+
+A bundle packs a whole templates directory (templates, schemas, presets,
+goldens) into one file so read-only deployments avoid thousands of small
+file lookups at startup. Layout::
+
+    header   8s magic, u32 version, u32 reserved, u64 index offset,
+             u64 index length (little-endian)
+    data     file contents, back to back
+    index    UTF-8 JSON: {"files": {relpath: [offset, size, sha256]},
+                          "templates": {name: {title, description, presets}}}
+
+Bundles are memory-mapped, so only the entries actually read are paged
+in. BundlePath exposes a bundle through the subset of the pathlib API
+that pk.render uses, so a bundle can stand in for the templates
+directory.
+
+This module must only depend on the standard library.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import mmap
+import os
+import struct
+import threading
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any, NamedTuple
+
+from pk.fsutil import atomic_writer
+from pk.manifest import scan_template
+
+MAGIC = b"PKBUNDLE"
+BUNDLE_VERSION = 1
+BUNDLE_SUFFIX = ".pkb"
+
+_HEADER = struct.Struct("<8sIIQQ")
+
+# Open bundles by resolved path
+_bundles: dict[str, Bundle] = {}
+_lock = threading.Lock()
+
+
+class BundleError(ValueError):
+    """A bundle file is malformed or corrupt."""
+
+
+class BundleStat(NamedTuple):
+    """Subset of os.stat_result reported for bundle entries."""
+
+    st_mtime_ns: int
+    st_size: int
+
+
+def build_bundle(templates_dir: str | Path, out_path: str | Path) -> int:
+    """
+    Pack a templates directory into a bundle file.
+
+    Hidden files and ``__pycache__`` directories are skipped. The bundle
+    is written atomically.
+
+    Args:
+        templates_dir: Templates directory to pack.
+        out_path: Bundle file to write.
+
+    Returns:
+        Number of files packed.
+
+    Raises:
+        ValueError: If a template's schema.json is not valid JSON.
+    """
+    templates_dir = Path(templates_dir)
+    files: dict[str, list[Any]] = {}
+    templates: dict[str, dict[str, Any]] = {}
+
+    with atomic_writer(out_path, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, BUNDLE_VERSION, 0, 0, 0))
+        offset = _HEADER.size
+        for path in _walk(templates_dir):
+            data = path.read_bytes()
+            rel = path.relative_to(templates_dir).as_posix()
+            files[rel] = [offset, len(data), hashlib.sha256(data).hexdigest()]
+            f.write(data)
+            offset += len(data)
+
+        for item in sorted(templates_dir.iterdir()):
+            entry = scan_template(item) if item.is_dir() else None
+            if entry is not None:
+                templates[item.name] = {
+                    key: entry[key] for key in ("title", "description", "presets")
+                }
+
+        index = json.dumps({"files": files, "templates": templates}).encode("utf-8")
+        f.write(index)
+        f.seek(0)
+        f.write(_HEADER.pack(MAGIC, BUNDLE_VERSION, 0, offset, len(index)))
+    # Temporary files are private; bundles are meant to be shipped
+    os.chmod(out_path, 0o644)
+    return len(files)
+
+
+def verify_bundle(bundle_path: str | Path, templates_dir: str | Path | None = None) -> list[str]:
+    """
+    Check a bundle's integrity, optionally against its source directory.
+
+    Args:
+        bundle_path: Bundle file.
+        templates_dir: If given, also report files that are missing from,
+            extra in, or different in the bundle compared to this
+            directory.
+
+    Returns:
+        Problem descriptions; empty if the bundle is sound.
+    """
+    try:
+        bundle = Bundle.open(bundle_path)
+    except (OSError, BundleError) as e:
+        return [f"cannot read bundle: {e}"]
+
+    problems = []
+    with bundle:
+        for rel, (_, _, digest) in bundle.files.items():
+            try:
+                data = bundle.read(rel)
+            except BundleError as e:
+                problems.append(str(e))
+                continue
+            if hashlib.sha256(data).hexdigest() != digest:
+                problems.append(f"{rel}: checksum mismatch")
+
+        if templates_dir is not None:
+            templates_dir = Path(templates_dir)
+            source = {p.relative_to(templates_dir).as_posix(): p for p in _walk(templates_dir)}
+            for rel in sorted(source.keys() - bundle.files.keys()):
+                problems.append(f"{rel}: missing from bundle")
+            for rel in sorted(bundle.files.keys() - source.keys()):
+                problems.append(f"{rel}: not in {templates_dir}")
+            for rel in sorted(source.keys() & bundle.files.keys()):
+                digest = hashlib.sha256(source[rel].read_bytes()).hexdigest()
+                if digest != bundle.files[rel][2]:
+                    problems.append(f"{rel}: differs from {source[rel]}")
+    return problems
+
+
+def open_bundle(path: str | Path) -> Bundle:
+    """
+    Get the shared open bundle for a path.
+
+    Bundles stay mapped for the life of the process and are reopened if
+    the file is replaced.
+
+    Args:
+        path: Bundle file.
+
+    Returns:
+        The open Bundle.
+
+    Raises:
+        OSError: If the file cannot be opened.
+        BundleError: If the file is not a valid bundle.
+    """
+    key = os.path.realpath(path)
+    with _lock:
+        bundle = _bundles.get(key)
+        if bundle is None or bundle.mtime_ns != os.stat(key).st_mtime_ns:
+            bundle = _bundles[key] = Bundle.open(key)
+        return bundle
+
+
+class Bundle:
+    """
+    An open template bundle.
+
+    Use open() for files (memory-mapped) or from_bytes() for bundles that
+    are not on a real filesystem, such as package data inside a zipapp.
+    """
+
+    def __init__(self, data: bytes | mmap.mmap, path: str, mtime_ns: int = 0):
+        self.path = path
+        self.mtime_ns = mtime_ns
+        self._data = data
+
+        if len(data) < _HEADER.size:
+            raise BundleError(f"{path}: not a template bundle")
+        magic, version, _, index_offset, index_length = _HEADER.unpack_from(data)
+        if magic != MAGIC:
+            raise BundleError(f"{path}: not a template bundle")
+        if version != BUNDLE_VERSION:
+            raise BundleError(f"{path}: unsupported bundle version {version}")
+        if index_offset + index_length > len(data):
+            raise BundleError(f"{path}: truncated bundle")
+        try:
+            index = json.loads(bytes(data[index_offset:index_offset + index_length]))
+            self.files: dict[str, list[Any]] = index["files"]
+            self.templates: dict[str, dict[str, Any]] = index["templates"]
+        except (ValueError, KeyError, TypeError) as e:
+            raise BundleError(f"{path}: corrupt index: {e}") from e
+
+        children: dict[tuple[str, ...], set[str]] = {(): set()}
+        for rel in self.files:
+            parts = tuple(rel.split("/"))
+            for depth in range(len(parts)):
+                children.setdefault(parts[:depth], set()).add(parts[depth])
+        self._children = {parent: sorted(names) for parent, names in children.items()}
+        self.root = BundlePath(self, ())
+
+    @classmethod
+    def open(cls, path: str | Path) -> Bundle:
+        """Memory-map a bundle file."""
+        with open(path, "rb") as f:
+            st = os.fstat(f.fileno())
+            if st.st_size == 0:
+                raise BundleError(f"{path}: not a template bundle")
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return cls(data, str(path), st.st_mtime_ns)
+
+    @classmethod
+    def from_bytes(cls, data: bytes, name: str = "<bundle>") -> Bundle:
+        """Load a bundle held in memory."""
+        return cls(data, name)
+
+    def read(self, rel: str) -> bytes:
+        """
+        Read one file from the bundle.
+
+        Args:
+            rel: POSIX path relative to the templates directory.
+
+        Returns:
+            The file's bytes.
+
+        Raises:
+            FileNotFoundError: If there is no such file.
+            BundleError: If the entry lies outside the bundle data.
+        """
+        try:
+            offset, size, _ = self.files[rel]
+        except KeyError:
+            raise FileNotFoundError(f"{self.path}: no such entry: {rel}") from None
+        if offset < _HEADER.size or offset + size > len(self._data):
+            raise BundleError(f"{rel}: entry out of bounds")
+        return bytes(self._data[offset:offset + size])
+
+    def close(self) -> None:
+        if isinstance(self._data, mmap.mmap):
+            self._data.close()
+
+    def __enter__(self) -> Bundle:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class BundlePath:
+    """
+    Read-only path to a file or directory inside a bundle.
+
+    Implements the parts of pathlib.Path that template loading uses:
+    joining, name parts, exists/is_dir/is_file, iterdir, read_text,
+    read_bytes and stat. Entries report the bundle file's mtime.
+    """
+
+    __slots__ = ("bundle", "parts")
+
+    def __init__(self, bundle: Bundle, parts: tuple[str, ...]):
+        self.bundle = bundle
+        self.parts = parts
+
+    def __truediv__(self, other: str | os.PathLike) -> BundlePath:
+        parts = list(self.parts)
+        for part in os.fspath(other).split("/"):
+            if part == "..":
+                if parts:
+                    parts.pop()
+            elif part and part != ".":
+                parts.append(part)
+        return BundlePath(self.bundle, tuple(parts))
+
+    def joinpath(self, *others: str | os.PathLike) -> BundlePath:
+        path = self
+        for other in others:
+            path = path / other
+        return path
+
+    @property
+    def name(self) -> str:
+        return self.parts[-1] if self.parts else ""
+
+    @property
+    def suffix(self) -> str:
+        return Path(self.name).suffix
+
+    @property
+    def stem(self) -> str:
+        return Path(self.name).stem
+
+    @property
+    def parent(self) -> BundlePath:
+        return BundlePath(self.bundle, self.parts[:-1])
+
+    def is_dir(self) -> bool:
+        return self.parts in self.bundle._children
+
+    def is_file(self) -> bool:
+        return "/".join(self.parts) in self.bundle.files
+
+    def exists(self) -> bool:
+        return self.is_file() or self.is_dir()
+
+    def iterdir(self) -> Iterator[BundlePath]:
+        if not self.is_dir():
+            raise NotADirectoryError(str(self))
+        for child in self.bundle._children[self.parts]:
+            yield BundlePath(self.bundle, (*self.parts, child))
+
+    def read_bytes(self) -> bytes:
+        return self.bundle.read("/".join(self.parts))
+
+    def read_text(self, encoding: str = "utf-8") -> str:
+        # Same newline translation as Path.read_text
+        text = self.read_bytes().decode(encoding)
+        return text.replace("\r\n", "\n").replace("\r", "\n")
+
+    def stat(self) -> BundleStat:
+        rel = "/".join(self.parts)
+        if rel in self.bundle.files:
+            return BundleStat(self.bundle.mtime_ns, self.bundle.files[rel][1])
+        if self.is_dir():
+            return BundleStat(self.bundle.mtime_ns, 0)
+        raise FileNotFoundError(str(self))
+
+    def __str__(self) -> str:
+        return os.path.join(self.bundle.path, *self.parts)
+
+    def __repr__(self) -> str:
+        return f"BundlePath({str(self)!r})"
+
+    def __eq__(self, other: object) -> bool:
+        return (
+            isinstance(other, BundlePath)
+            and other.bundle is self.bundle
+            and other.parts == self.parts
+        )
+
+    def __hash__(self) -> int:
+        return hash((id(self.bundle), self.parts))
+
+
+def _walk(templates_dir: Path) -> Iterator[Path]:
+    """Yield the files to pack, in sorted order."""
+    for root, dirs, files in os.walk(templates_dir):
+        dirs[:] = sorted(d for d in dirs if not d.startswith(".") and d != "__pycache__")
+        for name in sorted(files):
+            if not name.startswith("."):
+                yield Path(root) / name
@@ -0,0 +1,276 @@
+"""
+On-disk caches for promptkit.
+
+Everything promptkit persists between processes lives under one
+user-level cache directory:
+
+- ``$PK_CACHE_DIR`` if set
+- otherwise ``$XDG_CACHE_HOME/promptkit``
+- otherwise ``~/.cache/promptkit``
+
+It also provides DiskRenderCache, a content-addressed render cache that
+several processes or hosts can share. It lives in its own directory,
+``$PK_RENDER_CACHE_DIR`` if set (otherwise ``<cache dir>/renders``), which
+is the only cache directory that is safe to put on a shared filesystem:
+the other caches hold executable code or are keyed by local paths.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import time
+from collections.abc import Iterator
+from pathlib import Path
+from typing import IO, NamedTuple
+
+from pk.fsutil import create_temp_file
+
+CACHE_DIR_ENV = "PK_CACHE_DIR"
+RENDER_CACHE_DIR_ENV = "PK_RENDER_CACHE_DIR"
+
+_FALSY = {"0", "false", "no", "off"}
+
+
+def get_cache_dir() -> Path:
+    """Get the root directory for promptkit's persistent caches."""
+    override = os.environ.get(CACHE_DIR_ENV)
+    if override:
+        return Path(override).expanduser()
+
+    xdg = os.environ.get("XDG_CACHE_HOME")
+    base = Path(xdg).expanduser() if xdg else Path.home() / ".cache"
+    return base / "promptkit"
+
+
+def get_render_cache_dir() -> Path:
+    """Get the directory of the shared render cache (see DiskRenderCache)."""
+    override = os.environ.get(RENDER_CACHE_DIR_ENV)
+    if override:
+        return Path(override).expanduser()
+    return get_cache_dir() / "renders"
+
+
+def env_flag(name: str, default: bool = True) -> bool:
+    """
+    Read a boolean flag from the environment.
+
+    Args:
+        name: Environment variable name.
+        default: Value used when the variable is unset or empty.
+
+    Returns:
+        False for "0", "false", "no" or "off" (any case), True otherwise.
+    """
+    value = os.environ.get(name, "").strip()
+    if not value:
+        return default
+    return value.lower() not in _FALSY
+
+
+class DiskRenderCache:
+    """
+    Content-addressed cache of rendered prompts on a shared filesystem.
+
+    Entries are plain files named by the SHA256 of the library version,
+    template source hash, schema hash and canonical params hash, so any
+    process or host that resolves the same inputs reads the same file.
+    Writes go to a temporary file in the same directory followed by an
+    atomic rename; readers never see partial entries and concurrent
+    writers of the same key simply race to an identical result.
+    """
+
+    SUFFIX = ".md"
+    _TMP_SUFFIX = ".tmp"
+
+    def __init__(self, directory: str | Path | None = None):
+        self.directory = Path(directory) if directory is not None else get_render_cache_dir()
+
+    @staticmethod
+    def make_key(template_hash: str, schema_hash: str, params_hash: str) -> str:
+        """
+        Build the cache key for a render.
+
+        Args:
+            template_hash: SHA256 of the template source.
+            schema_hash: SHA256 of the canonical schema JSON.
+            params_hash: SHA256 of the canonical resolved params JSON.
+
+        Returns:
+            Hex-encoded SHA256 key.
+        """
+        from pk import __version__
+
+        material = "\0".join((__version__, template_hash, schema_hash, params_hash))
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+    def path_for(self, key: str) -> Path:
+        """Get the entry path for a key (sharded by its first two characters)."""
+        return self.directory / key[:2] / f"{key}{self.SUFFIX}"
+
+    def read_chunks(self, key: str, chunk_size: int = 1 << 16) -> Iterator[str] | None:
+        """
+        Open a cached entry for streaming.
+
+        Args:
+            key: Cache key from make_key().
+            chunk_size: Characters per yielded chunk.
+
+        Returns:
+            Iterator over the entry's text, or None on a miss.
+        """
+        try:
+            f = open(self.path_for(key), encoding="utf-8", newline="")
+        except OSError:
+            return None
+        return _iter_file(f, chunk_size)
+
+    def get(self, key: str) -> str | None:
+        """Read a whole cached entry, or None on a miss."""
+        chunks = self.read_chunks(key)
+        return None if chunks is None else "".join(chunks)
+
+    def writer(self, key: str) -> CacheEntryWriter:
+        """
+        Start writing an entry.
+
+        Use as a context manager; the entry is published when the block
+        exits cleanly and discarded if it raises.
+        """
+        return CacheEntryWriter(self.path_for(key))
+
+    def gc(
+        self,
+        max_bytes: int | None = None,
+        max_age_seconds: float | None = None,
+        now: float | None = None,
+    ) -> GcResult:
+        """
+        Evict entries by age and total size.
+
+        Entries older than max_age_seconds are removed first; then the
+        oldest remaining entries are removed until the total size is at
+        most max_bytes. Abandoned temporary files older than an hour are
+        always removed.
+
+        Args:
+            max_bytes: Maximum total size of entries to keep.
+            max_age_seconds: Maximum entry age by modification time.
+            now: Current time, for testing.
+
+        Returns:
+            GcResult with counts of removed and kept entries.
+        """
+        now = time.time() if now is None else now
+        entries: list[tuple[float, int, Path]] = []
+        removed = freed = 0
+
+        if not self.directory.is_dir():
+            return GcResult(0, 0, 0, 0)
+
+        for path in self.directory.glob("*/*"):
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            age = now - st.st_mtime
+            stale_tmp = path.name.endswith(self._TMP_SUFFIX) and age > 3600
+            expired = max_age_seconds is not None and age > max_age_seconds
+            if stale_tmp or (path.suffix == self.SUFFIX and expired):
+                if _unlink(path):
+                    removed += 1
+                    freed += st.st_size
+            elif path.suffix == self.SUFFIX:
+                entries.append((st.st_mtime, st.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        if max_bytes is not None and total > max_bytes:
+            entries.sort()
+            while entries and total > max_bytes:
+                _, size, path = entries.pop(0)
+                total -= size
+                if _unlink(path):
+                    removed += 1
+                    freed += size
+
+        return GcResult(removed, freed, len(entries), total)
+
+
+class CacheEntryWriter:
+    """
+    Best-effort writer for a DiskRenderCache entry.
+
+    Write errors (full or read-only disk, lost NFS mount) never propagate
+    to the caller; the entry is just not published.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._file: IO[str] | None = None
+        self._tmp_name: str | None = None
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # Readable by other users under the usual umask, so a shared
+            # cache directory works
+            fd, self._tmp_name = create_temp_file(path, suffix=DiskRenderCache._TMP_SUFFIX)
+            self._file = os.fdopen(fd, "w", encoding="utf-8", newline="")
+        except OSError:
+            self._discard()
+
+    def write(self, chunk: str) -> int:
+        """Append a chunk; failures silently disable the entry."""
+        if self._file is not None:
+            try:
+                self._file.write(chunk)
+            except OSError:
+                self._discard()
+        return len(chunk)
+
+    def __enter__(self) -> CacheEntryWriter:
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is not None or self._file is None:
+            self._discard()
+            return
+        try:
+            self._file.close()
+            self._file = None
+            os.replace(self._tmp_name, self.path)
+            self._tmp_name = None
+        except OSError:
+            self._discard()
+
+    def _discard(self) -> None:
+        if self._file is not None:
+            try:
+                self._file.close()
+            except OSError:
+                pass
+            self._file = None
+        if self._tmp_name is not None:
+            _unlink(Path(self._tmp_name))
+            self._tmp_name = None
+
+
+class GcResult(NamedTuple):
+    """Summary of a DiskRenderCache.gc() run."""
+
+    removed: int
+    freed_bytes: int
+    kept: int
+    kept_bytes: int
+
+
+def _iter_file(f: IO[str], chunk_size: int) -> Iterator[str]:
+    with f:
+        while chunk := f.read(chunk_size):
+            yield chunk
+
+
+def _unlink(path: Path) -> bool:
+    try:
+        path.unlink()
+        return True
+    except OSError:
+        return False
@@ -0,0 +1,576 @@
+"""
+Template catalog: search roots, template and preset discovery, and
+schema loading.
+
+This is everything ``pk list``, ``pk show`` and ``pk presets`` need, so
+it is kept free of Jinja2, jsonschema and PyYAML; pk.render builds on it
+and re-exports its public names.
+
+This module must only depend on the standard library.
+"""
+
+from __future__ import annotations
+
+import importlib.resources
+import json
+import os
+import threading
+from collections.abc import Hashable
+from dataclasses import dataclass
+from importlib.resources.abc import Traversable
+from pathlib import Path
+from typing import Any, NamedTuple
+
+from pk.bundle import Bundle, BundleError, BundlePath, open_bundle
+from pk.config import ConfigError, get_config_path, get_config_template_path
+from pk.errors import TemplateError, TemplateNotFoundError
+from pk.manifest import get_template_entry, load_manifest
+
+# Path of a template bundle to use instead of the templates directory.
+TEMPLATES_BUNDLE_ENV = "PK_TEMPLATES_BUNDLE"
+PACKAGED_BUNDLE = "templates.pkb"
+
+# Extra template roots (os.pathsep-separated), searched before those from
+# the config file and the built-in templates.
+TEMPLATE_PATH_ENV = "PK_TEMPLATE_PATH"
+
+_packaged_bundle: Bundle | None = None
+
+# Parsed schema documents and resolved template schemas, keyed by file
+# path. Each entry records the (mtime_ns, size) stamps of the files it was
+# built from and is rebuilt when any of them changes. Resolved $ref targets
+# are memoized per document and copied into each schema that uses them.
+# Defaults are indexed by id() of the resolved schema, which the registry
+# keeps alive. Only internal callers that never mutate them get the cached
+# schemas (see _load_shared_schema); load_schema() returns copies.
+_schema_documents: dict[Path, _SchemaDocument] = {}
+_resolved_schemas: dict[Path, _ResolvedSchema] = {}
+_schema_defaults: dict[int, dict[str, Any]] = {}
+_schemas_lock = threading.Lock()
+
+# Template name -> winning root, per search path. Built with one directory
+# listing per root and rebuilt only when a lookup misses.
+_template_indexes: dict[tuple[TemplateRoot, ...], dict[str, TemplateRoot]] = {}
+_TEMPLATE_INDEXES_MAX = 8
+_configured_roots: tuple[Hashable, tuple[TemplateRoot, ...]] | None = None
+_template_index_lock = threading.Lock()
+
+
+@dataclass
+class _SchemaDocument:
+    """A parsed schema file and its memoized $ref targets."""
+
+    stamp: tuple[int, int]
+    data: Any
+    refs: dict[str, tuple[Any, dict[Path, tuple[int, int] | None]]]
+
+
+@dataclass(frozen=True)
+class _ResolvedSchema:
+    """A template schema with all $refs resolved."""
+
+    stamps: dict[Path, tuple[int, int] | None]
+    schema: dict[str, Any]
+    defaults: dict[str, Any]
+
+
+def get_templates_dir() -> Path | BundlePath:
+    """
+    Get the path to the templates directory.
+
+    If ``$PK_TEMPLATES_BUNDLE`` names a template bundle, or no templates
+    directory exists but the package ships ``pk/templates.pkb``, the
+    bundle's root is returned instead (see pk.bundle).
+    """
+    bundle_file = os.environ.get(TEMPLATES_BUNDLE_ENV)
+    if bundle_file:
+        return _open_templates_bundle(bundle_file)
+
+    # Wheels ship templates inside the package; source checkouts and
+    # editable installs keep them next to it.
+    pkg_dir = Path(__file__).parent
+    bundled = pkg_dir / "templates"
+    if bundled.is_dir():
+        return bundled
+    sibling = pkg_dir.parent / "templates"
+    if not sibling.is_dir():
+        packed = importlib.resources.files("pk").joinpath(PACKAGED_BUNDLE)
+        if packed.is_file():
+            return _open_templates_bundle(packed)
+    return sibling
+
+
+def _open_templates_bundle(source: str | Path | Traversable) -> BundlePath:
+    """Open a bundle file, or read one from package data inside a zipapp."""
+    global _packaged_bundle
+    try:
+        try:
+            return open_bundle(os.fspath(source)).root
+        except TypeError:
+            # Not on a real filesystem; it cannot be memory-mapped
+            if _packaged_bundle is None:
+                _packaged_bundle = Bundle.from_bytes(source.read_bytes(), str(source))
+            return _packaged_bundle.root
+    except (OSError, BundleError) as e:
+        raise TemplateError(f"Cannot open template bundle {source}: {e}") from e
+
+
+class TemplateRoot(NamedTuple):
+    """A directory (or bundle) on the template search path."""
+
+    path: Path | BundlePath
+    source: str  # "PK_TEMPLATE_PATH", "config" or "built-in"
+
+
+def get_template_roots() -> list[TemplateRoot]:
+    """
+    Get the template search path.
+
+    Roots are searched in order: ``$PK_TEMPLATE_PATH`` entries, then the
+    ``templates.path`` entries of the config file (see pk.config), then
+    the built-in templates directory. Entries that are files are opened
+    as template bundles.
+
+    Returns:
+        Template roots in search order.
+
+    Raises:
+        TemplateError: If the config file or a bundle is invalid.
+    """
+    global _configured_roots
+    env_path = os.environ.get(TEMPLATE_PATH_ENV, "")
+    config_path = get_config_path()
+    key = (env_path, config_path, _file_stamp(config_path))
+
+    cached = _configured_roots
+    if cached is None or cached[0] != key:
+        try:
+            config_entries = get_config_template_path()
+        except ConfigError as e:
+            raise TemplateError(str(e)) from e
+        roots = [
+            TemplateRoot(_open_template_root(Path(entry).expanduser()), TEMPLATE_PATH_ENV)
+            for entry in env_path.split(os.pathsep) if entry
+        ]
+        roots += [TemplateRoot(_open_template_root(entry), "config") for entry in config_entries]
+        cached = _configured_roots = (key, tuple(roots))
+    return [*cached[1], TemplateRoot(get_templates_dir(), "built-in")]
+
+
+def _open_template_root(path: Path) -> Path | BundlePath:
+    """Use bundle files as roots; anything else is taken as a directory."""
+    return _open_templates_bundle(path) if path.is_file() else path
+
+
+def resolve_template_root(template_name: str) -> TemplateRoot:
+    """
+    Find the search root that provides a template.
+
+    The first root with a directory of that name wins, even if a later
+    root also has one.
+
+    Args:
+        template_name: Name of the template.
+
+    Returns:
+        The winning TemplateRoot.
+
+    Raises:
+        TemplateNotFoundError: If no root has the template.
+    """
+    roots = tuple(get_template_roots())
+    root = _get_template_index(roots).get(template_name)
+    if root is None or not (root.path / template_name).is_dir():
+        # Added or removed since the index was built
+        root = _get_template_index(roots, rebuild=True).get(template_name)
+    if root is None:
+        available = [t["name"] for t in list_templates()]
+        raise TemplateNotFoundError(
+            f"Template '{template_name}' not found. "
+            f"Available templates: {', '.join(available) if available else 'none'}"
+        )
+    return root
+
+
+def _get_template_index(
+    roots: tuple[TemplateRoot, ...], rebuild: bool = False
+) -> dict[str, TemplateRoot]:
+    """Get the name -> root index of a search path, listing each root once."""
+    with _template_index_lock:
+        index = _template_indexes.get(roots)
+        if index is not None and not rebuild:
+            return index
+
+    index = {}
+    for root in reversed(roots):
+        for name in _list_template_dirs(root.path):
+            index[name] = root
+
+    with _template_index_lock:
+        if roots not in _template_indexes and len(_template_indexes) >= _TEMPLATE_INDEXES_MAX:
+            _template_indexes.clear()
+        _template_indexes[roots] = index
+    return index
+
+
+def _list_template_dirs(path: Path | BundlePath) -> list[str]:
+    """Names of the subdirectories of a root; empty if it does not exist."""
+    if isinstance(path, BundlePath):
+        return [child.name for child in path.iterdir() if child.is_dir()] if path.is_dir() else []
+    try:
+        with os.scandir(path) as entries:
+            return [entry.name for entry in entries if entry.is_dir()]
+    except OSError:
+        return []
+
+
+def clear_template_index() -> None:
+    """Forget the template search path and name index built in this process."""
+    global _configured_roots
+    with _template_index_lock:
+        _template_indexes.clear()
+        _configured_roots = None
+
+
+def list_templates() -> list[dict[str, str]]:
+    """
+    List all available templates with their names and descriptions.
+
+    Templates from every search root are listed; where several roots have
+    the same name, the first root's template is listed (see
+    get_template_roots). Each root's template manifest (see pk.manifest)
+    is refreshed automatically for templates that changed since it was
+    built.
+
+    Returns:
+        List of dicts with 'name' and 'description' keys.
+
+    Raises:
+        TemplateError: If a schema.json is invalid JSON.
+    """
+    roots = tuple(get_template_roots())
+    index = _get_template_index(roots)
+    found: dict[str, str] = {}
+    for root in roots:
+        for name, entry in _root_entries(root.path).items():
+            # A directory without template.md still hides later roots' templates
+            if name not in found and index.get(name, root) == root:
+                found[name] = entry["description"]
+    return [{"name": name, "description": found[name]} for name in sorted(found)]
+
+
+def _root_entries(path: Path | BundlePath) -> dict[str, dict[str, Any]]:
+    """Manifest entries of the templates in one root."""
+    if isinstance(path, BundlePath):
+        return path.bundle.templates
+    if not path.exists():
+        return {}
+    try:
+        return load_manifest(path)["templates"]
+    except ValueError as e:
+        raise TemplateError(str(e)) from e
+
+
+def get_template_dir(template_name: str) -> Path | BundlePath:
+    """
+    Get the directory for a specific template.
+
+    Args:
+        template_name: Name of the template.
+
+    Returns:
+        Path to the template directory in the first search root that has
+        it.
+
+    Raises:
+        TemplateNotFoundError: If template doesn't exist.
+    """
+    return resolve_template_root(template_name).path / template_name
+
+
+def load_template(template_name: str) -> str:
+    """
+    Load the template.md content for a template.
+
+    Args:
+        template_name: Name of the template.
+
+    Returns:
+        Template content as string.
+
+    Raises:
+        TemplateNotFoundError: If template file doesn't exist.
+    """
+    template_dir = get_template_dir(template_name)
+    template_file = template_dir / "template.md"
+
+    if not template_file.exists():
+        raise TemplateNotFoundError(
+            f"Template file not found: {template_file}"
+        )
+
+    return template_file.read_text(encoding="utf-8")
+
+
+def load_schema(template_name: str) -> dict[str, Any]:
+    """
+    Load the schema.json for a template, with ``$ref`` references resolved.
+
+    References may point into the same file (``#/definitions/x``) or into
+    another schema file relative to it (``../base.schema.json#/...``).
+    Keywords next to a ``$ref`` are merged over the referenced schema, so
+    templates can override ``default``, ``minimum`` or ``description`` of
+    a shared definition.
+
+    Resolved schemas are cached per process and reloaded when schema.json
+    or any file it references changes. Each call returns a fresh copy, so
+    callers may modify it.
+
+    Args:
+        template_name: Name of the template.
+
+    Returns:
+        Resolved schema as dict.
+
+    Raises:
+        TemplateNotFoundError: If schema file doesn't exist.
+        TemplateError: If a schema file is invalid JSON or a $ref cannot
+            be resolved.
+    """
+    return _copy_json(_load_shared_schema(template_name))
+
+
+def load_schema_file(schema_file: Path | BundlePath) -> dict[str, Any]:
+    """
+    Load a schema file by path, with ``$ref`` references resolved.
+
+    Same as load_schema(), for schemas outside the template search path
+    (e.g. a templates directory being built).
+
+    Args:
+        schema_file: Path to the schema.json file.
+
+    Returns:
+        Resolved schema as a fresh dict.
+
+    Raises:
+        TemplateNotFoundError: If the file doesn't exist.
+        TemplateError: If a schema file is invalid JSON or a $ref cannot
+            be resolved.
+    """
+    return _copy_json(_load_shared_schema_file(schema_file))
+
+
+def _load_shared_schema(template_name: str) -> dict[str, Any]:
+    """load_schema() without the copy; the result must not be mutated."""
+    return _load_shared_schema_file(get_template_dir(template_name) / "schema.json")
+
+
+def _load_shared_schema_file(schema_file: Path | BundlePath) -> dict[str, Any]:
+    """load_schema_file() without the copy; the result must not be mutated."""
+    with _schemas_lock:
+        entry = _resolved_schemas.get(schema_file)
+        if entry is not None and all(
+            _file_stamp(path) == stamp for path, stamp in entry.stamps.items()
+        ):
+            return entry.schema
+
+        if not schema_file.exists():
+            raise TemplateNotFoundError(
+                f"Schema file not found: {schema_file}"
+            )
+
+        stamps: dict[Path, tuple[int, int] | None] = {}
+        document = _load_schema_document(schema_file, stamps)
+        schema = _resolve_refs(document.data, schema_file, stamps, ())
+        defaults = {
+            name: prop["default"]
+            for name, prop in schema.get("properties", {}).items()
+            if isinstance(prop, dict) and "default" in prop
+        }
+
+        if entry is not None:
+            _schema_defaults.pop(id(entry.schema), None)
+        _resolved_schemas[schema_file] = _ResolvedSchema(stamps, schema, defaults)
+        _schema_defaults[id(schema)] = defaults
+        return schema
+
+
+def clear_schema_cache() -> None:
+    """Drop all cached schema documents and resolved schemas."""
+    with _schemas_lock:
+        _schema_documents.clear()
+        _resolved_schemas.clear()
+        _schema_defaults.clear()
+
+
+def _file_stamp(path: Path) -> tuple[int, int] | None:
+    """Get (mtime_ns, size) for a file, or None if it cannot be stat'ed."""
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+def _stamp(path: Path, stamps: dict[Path, tuple[int, int] | None]) -> tuple[int, int] | None:
+    """Stat a file once per schema build."""
+    if path not in stamps:
+        stamps[path] = _file_stamp(path)
+    return stamps[path]
+
+
+def _load_schema_document(
+    path: Path, stamps: dict[Path, tuple[int, int] | None]
+) -> _SchemaDocument:
+    """Parse a schema file, reusing the cached parse if it is unchanged."""
+    stamp = _stamp(path, stamps)
+    document = _schema_documents.get(path)
+    if document is not None and document.stamp == stamp:
+        return document
+
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except json.JSONDecodeError as e:
+        raise TemplateError(f"Invalid JSON in schema {path}: {e}") from e
+    document = _schema_documents[path] = _SchemaDocument(stamp, data, {})
+    return document
+
+
+def _resolve_refs(
+    node: Any,
+    path: Path,
+    stamps: dict[Path, tuple[int, int] | None],
+    stack: tuple[tuple[Path, str], ...],
+) -> Any:
+    """Return node with every $ref replaced by its (merged) target."""
+    if isinstance(node, list):
+        return [_resolve_refs(item, path, stamps, stack) for item in node]
+    if not isinstance(node, dict):
+        return node
+
+    ref = node.get("$ref")
+    if not isinstance(ref, str):
+        return {key: _resolve_refs(value, path, stamps, stack) for key, value in node.items()}
+
+    # Copied, so no two schemas share a definition
+    target = _copy_json(_resolve_ref(ref, path, stamps, stack))
+    if len(node) == 1:
+        return target
+    if not isinstance(target, dict):
+        raise TemplateError(f"$ref {ref!r} in {path} does not point to a schema object")
+    siblings = {
+        key: _resolve_refs(value, path, stamps, stack)
+        for key, value in node.items()
+        if key != "$ref"
+    }
+    return {**target, **siblings}
+
+
+def _resolve_ref(
+    ref: str,
+    path: Path,
+    stamps: dict[Path, tuple[int, int] | None],
+    stack: tuple[tuple[Path, str], ...],
+) -> Any:
+    """Resolve a single $ref relative to the file containing it."""
+    file_part, _, pointer = ref.partition("#")
+    target_path = path.parent / file_part if file_part else path
+    if isinstance(target_path, Path):
+        target_path = Path(os.path.normpath(target_path))
+    key = (target_path, pointer)
+    if key in stack:
+        raise TemplateError(f"Circular $ref {ref!r} in {path}")
+    if _stamp(target_path, stamps) is None:
+        raise TemplateError(f"Unresolvable $ref {ref!r} in {path}: {target_path} not found")
+
+    document = _load_schema_document(target_path, stamps)
+    memo = document.refs.get(pointer)
+    if memo is not None and all(_stamp(p, stamps) == s for p, s in memo[1].items()):
+        return memo[0]
+
+    # Track the files this target depends on separately, so the memo
+    # can be revalidated on its own.
+    deps = {target_path: stamps[target_path]}
+    node = document.data
+    if pointer and not pointer.startswith("/"):
+        raise TemplateError(f"Unresolvable $ref {ref!r} in {path}")
+    for token in pointer.split("/")[1:]:
+        token = token.replace("~1", "/").replace("~0", "~")
+        try:
+            node = node[int(token)] if isinstance(node, list) else node[token]
+        except (KeyError, IndexError, ValueError, TypeError):
+            raise TemplateError(f"Unresolvable $ref {ref!r} in {path}") from None
+
+    resolved = _resolve_refs(node, target_path, deps, (*stack, key))
+    stamps.update(deps)
+    document.refs[pointer] = (resolved, deps)
+    return resolved
+
+
+def list_presets(template_name: str) -> list[str]:
+    """
+    List available preset names for a template.
+
+    Args:
+        template_name: Name of the template.
+
+    Returns:
+        List of preset names (without extension).
+    """
+    template_dir = get_template_dir(template_name)
+    if isinstance(template_dir, BundlePath):
+        entry = template_dir.bundle.templates.get(template_name)
+    else:
+        try:
+            entry = get_template_entry(template_dir.parent, template_name)
+        except ValueError:
+            entry = None
+    if entry is not None:
+        return list(entry["presets"])
+
+    # Not a complete template (no template.md); scan directly
+    examples_dir = template_dir / "examples"
+
+    if not examples_dir.exists():
+        return []
+
+    presets = []
+    for item in sorted(examples_dir.iterdir()):
+        if item.is_file() and item.suffix in (".yaml", ".yml"):
+            presets.append(item.stem)
+    return presets
+
+
+def get_schema_defaults(schema: dict[str, Any]) -> dict[str, Any]:
+    """
+    Extract default values from a JSON schema.
+
+    Defaults of the cached schemas used for rendering are precomputed.
+    The returned values are copies, so callers may mutate them freely.
+
+    Args:
+        schema: JSON schema dict.
+
+    Returns:
+        Dict of parameter names to their default values.
+    """
+    defaults = _schema_defaults.get(id(schema))
+    if defaults is None:
+        defaults = {}
+        properties = schema.get("properties", {})
+
+        for prop_name, prop_schema in properties.items():
+            if "default" in prop_schema:
+                defaults[prop_name] = prop_schema["default"]
+
+    return {name: _copy_json(value) for name, value in defaults.items()}
+
+
+def _copy_json(value: Any) -> Any:
+    """Copy the lists and dicts of a JSON value; scalars are immutable."""
+    if isinstance(value, list):
+        return [_copy_json(item) for item in value]
+    if isinstance(value, dict):
+        return {key: _copy_json(item) for key, item in value.items()}
+    return value
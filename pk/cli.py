@@ -7,47 +7,97 @@ Commands:
 - presets: List presets for a template
 - render: Render a template with parameters
 - doctor: Validate all templates
+- cache gc: Evict entries from the shared render cache
+- bundle build/verify: Pack templates into a single-file bundle
 """
 
 from __future__ import annotations
 
 import sys
+from contextlib import ExitStack
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 import click
+from click.shell_completion import CompletionItem
 
 from pk import __version__
-from pk.doctor import validate_all_templates
-from pk.render import (
-    PresetNotFoundError,
-    SchemaValidationError,
-    TemplateError,
-    TemplateNotFoundError,
-    emit_run_packet,
+from pk.bundle import build_bundle, verify_bundle
+from pk.catalog import (
+    PACKAGED_BUNDLE,
     get_template_dir,
+    get_templates_dir,
     list_presets,
     list_templates,
-    load_params_file,
-    load_preset,
     load_schema,
-    load_template,
-    merge_params,
-    parse_cli_override,
-    render,
-    validate_params,
+    resolve_template_root,
 )
+from pk.errors import TemplateError, TemplateNotFoundError
+
+if TYPE_CHECKING:
+    from pk.snapshots import Snapshot
+
+# Jinja2, jsonschema and PyYAML are imported inside the commands that use
+# them (via pk.render and pk.doctor), so listing, showing and completing
+# templates stays fast. tests/test_startup.py enforces this.
+
+
+def _complete_template(ctx: click.Context, param: click.Parameter, incomplete: str):
+    """Complete template names from the cached completion index."""
+    from pk.completion import complete_templates
+
+    try:
+        return [CompletionItem(name, help=desc) for name, desc in complete_templates(incomplete)]
+    except TemplateError:
+        return []
+
+
+def _complete_preset(ctx: click.Context, param: click.Parameter, incomplete: str):
+    """Complete preset names of the template given on the command line."""
+    from pk.completion import complete_presets
+
+    try:
+        return complete_presets(_completing_template(ctx), incomplete)
+    except TemplateError:
+        return []
+
+
+def _complete_override(ctx: click.Context, param: click.Parameter, incomplete: str):
+    """Complete --set key=value from the template's schema."""
+    from pk.completion import complete_overrides
+
+    try:
+        return [
+            CompletionItem(item, type="plain")
+            for item in complete_overrides(_completing_template(ctx), incomplete)
+        ]
+    except TemplateError:
+        return []
+
+
+def _completing_template(ctx: click.Context) -> str | None:
+    """Get the template argument while an option value is being completed."""
+    # With an option still waiting for its value, click leaves the
+    # positional arguments unparsed in ctx.args.
+    return ctx.params.get("template") or next(iter(ctx.args), None)
 
 
 @click.group()
 @click.version_option(version=__version__, prog_name="pk")
-def main():
+@click.option("--bytecode-cache/--no-bytecode-cache", default=None,
+              help="Reuse compiled templates across runs (default: on, "
+                   "or $PK_BYTECODE_CACHE)")
+def main(bytecode_cache: bool | None):
     """
     pk - Production-grade prompt template library for LLM-assisted software engineering.
 
     Render, validate, and manage reusable prompt templates with strict schemas
     and deterministic rendering.
     """
-    pass
+    if bytecode_cache is not None:
+        from pk.render import configure_bytecode_cache
+
+        configure_bytecode_cache(enabled=bytecode_cache)
 
 
 @main.command("list")
@@ -75,11 +125,12 @@ def list_cmd():
 
 
 @main.command("show")
-@click.argument("template")
+@click.argument("template", shell_complete=_complete_template)
 def show_cmd(template: str):
     """Show details for a template."""
     try:
-        template_dir = get_template_dir(template)
+        root = resolve_template_root(template)
+        template_dir = root.path / template
         schema = load_schema(template)
     except TemplateNotFoundError as e:
         click.echo(f"Error: {e}", err=True)
@@ -87,6 +138,7 @@ def show_cmd(template: str):
 
     click.echo(f"Template: {template}")
     click.echo(f"Path: {template_dir}")
+    click.echo(f"Root: {root.path} ({root.source})")
     click.echo()
 
     # Show schema summary
@@ -126,7 +178,7 @@ def show_cmd(template: str):
 
 
 @main.command("presets")
-@click.argument("template")
+@click.argument("template", shell_complete=_complete_template)
 def presets_cmd(template: str):
     """List available presets for a template."""
     try:
@@ -147,11 +199,12 @@ def presets_cmd(template: str):
 
 
 @main.command("render")
-@click.argument("template")
-@click.option("--preset", "-p", help="Preset name to use (e.g., 'fast', 'deep')")
+@click.argument("template", shell_complete=_complete_template)
+@click.option("--preset", "-p", shell_complete=_complete_preset,
+              help="Preset name to use (e.g., 'fast', 'deep')")
 @click.option("--params", "-P", "params_file", type=click.Path(exists=True),
               help="YAML or JSON file with parameters")
-@click.option("--set", "-s", "overrides", multiple=True,
+@click.option("--set", "-s", "overrides", multiple=True, shell_complete=_complete_override,
               help="Override parameter: key=value (repeatable)")
 @click.option("--out", "-o", "output_file", type=click.Path(),
               help="Write output to file instead of stdout")
@@ -159,6 +212,13 @@ def presets_cmd(template: str):
               help="Override output_format parameter")
 @click.option("--run-dir", "run_dir", type=click.Path(),
               help="Emit a run packet directory with metadata")
+@click.option("--render-cache/--no-render-cache", default=False, envvar="PK_RENDER_CACHE",
+              help="Reuse prompts rendered by earlier runs from the shared "
+                   "disk cache (default: $PK_RENDER_CACHE)")
+@click.option("--render-cache-dir", type=click.Path(file_okay=False),
+              envvar="PK_RENDER_CACHE_DIR",
+              help="Directory of the render cache; safe to share between hosts "
+                   "(default: $PK_RENDER_CACHE_DIR, else <cache dir>/renders)")
 def render_cmd(
     template: str,
     preset: str | None,
@@ -167,6 +227,8 @@ def render_cmd(
     output_file: str | None,
     output_format: str | None,
     run_dir: str | None,
+    render_cache: bool,
+    render_cache_dir: str | None,
 ):
     """
     Render a template with parameters.
@@ -186,10 +248,39 @@ def render_cmd(
       pk render security --params my_params.yaml --set repo_path=/path/to/repo
       pk render readme --preset default --out prompt.md --run-dir ./runs
     """
+    if preset and not (params_file or overrides or output_format):
+        from pk.snapshots import load_snapshot
+
+        # Shipped presets are pre-rendered at build time
+        snapshot = load_snapshot(template, preset)
+        if snapshot is not None:
+            _write_snapshot(snapshot, output_file, run_dir)
+            return
+
+    from pk.cache import DiskRenderCache
+    from pk.catalog import _load_shared_schema
+    from pk.fsutil import atomic_writer
+    from pk.render import (
+        PresetNotFoundError,
+        RunPacketWriter,
+        SchemaValidationError,
+        compute_hash,
+        compute_params_hash,
+        compute_schema_hash,
+        load_params_file,
+        load_preset,
+        load_template,
+        merge_params,
+        parse_cli_override,
+        render_stream,
+        validate_params,
+        write_stream,
+    )
+
     # Load template and schema
     try:
         template_text = load_template(template)
-        schema = load_schema(template)
+        schema = _load_shared_schema(template)
     except TemplateNotFoundError as e:
         click.echo(f"Error: {e}", err=True)
         sys.exit(1)
@@ -240,51 +331,219 @@ def render_cmd(
         cli_overrides=cli_overrides,
     )
 
-    # Validate parameters
-    try:
-        validate_params(schema, merged_params)
-    except SchemaValidationError as e:
-        click.echo(f"Error: {e}", err=True)
-        sys.exit(1)
+    # A disk cache hit was validated and rendered by an earlier run with
+    # identical template, schema and params
+    disk_cache = DiskRenderCache(render_cache_dir) if render_cache else None
+    cache_key = None
+    chunks = None
+    if disk_cache is not None:
+        try:
+            cache_key = DiskRenderCache.make_key(
+                compute_hash(template_text),
+                compute_schema_hash(schema),
+                compute_params_hash(merged_params),
+            )
+            chunks = disk_cache.read_chunks(cache_key)
+        except (TypeError, ValueError):
+            pass  # Params not JSON-serializable; render without the cache
+
+    if chunks is None:
+        # Validate parameters
+        try:
+            validate_params(schema, merged_params)
+        except SchemaValidationError as e:
+            click.echo(f"Error: {e}", err=True)
+            sys.exit(1)
+        chunks = render_stream(template_text, merged_params, template_name=template)
+    else:
+        cache_key = None  # Already cached; nothing to write back
 
-    # Render template
+    # Render straight into the output and run packet so peak memory stays
+    # flat regardless of prompt size
+    packet = None
     try:
-        rendered = render(template_text, merged_params)
+        with ExitStack() as stack:
+            if output_file:
+                try:
+                    # Written atomically: no partial file is left on failure
+                    sink = stack.enter_context(atomic_writer(output_file))
+                except OSError as e:
+                    click.echo(f"Error writing output file: {e}", err=True)
+                    sys.exit(1)
+            else:
+                sink = sys.stdout
+            sinks = [sink]
+
+            if run_dir:
+                try:
+                    packet = stack.enter_context(
+                        RunPacketWriter(run_dir, template, merged_params)
+                    )
+                    sinks.append(packet)
+                except OSError as e:
+                    click.echo(f"Warning: Failed to create run packet: {e}", err=True)
+
+            if cache_key is not None:
+                sinks.append(stack.enter_context(disk_cache.writer(cache_key)))
+
+            prompt_hash = write_stream(chunks, *sinks)
     except TemplateError as e:
         click.echo(f"Error rendering template: {e}", err=True)
         sys.exit(1)
+    except OSError as e:
+        click.echo(f"Error writing output file: {e}", err=True)
+        sys.exit(1)
 
-    # Emit run packet if requested
-    if run_dir:
+    # The output is committed by now; a packet failure only warns
+    if packet is not None:
         try:
-            packet_dir = emit_run_packet(
-                run_dir=run_dir,
-                template_name=template,
-                rendered_prompt=rendered,
-                resolved_params=merged_params,
-            )
+            packet_dir = packet.finish(prompt_hash)
             click.echo(f"Run packet created: {packet_dir}", err=True)
         except Exception as e:
+            packet.abort()
             click.echo(f"Warning: Failed to create run packet: {e}", err=True)
 
-    # Output result
+    if output_file:
+        click.echo(f"Output written to: {output_file}", err=True)
+    else:
+        sys.stdout.write("\n")
+
+
+def _write_snapshot(snapshot: Snapshot, output_file: str | None, run_dir: str | None) -> None:
+    """Write a pre-rendered prompt like render_cmd writes a rendered one."""
+    from pk.fsutil import atomic_writer
+
     if output_file:
         try:
-            out_path = Path(output_file)
-            # Create parent directories if they don't exist
-            out_path.parent.mkdir(parents=True, exist_ok=True)
-            out_path.write_text(rendered, encoding="utf-8")
-            click.echo(f"Output written to: {output_file}", err=True)
+            with atomic_writer(output_file) as f:
+                f.write(snapshot.prompt)
         except OSError as e:
             click.echo(f"Error writing output file: {e}", err=True)
             sys.exit(1)
     else:
-        click.echo(rendered)
+        sys.stdout.write(snapshot.prompt)
+
+    if run_dir:
+        from pk.render import RunPacketWriter
+
+        try:
+            with RunPacketWriter(run_dir, snapshot.template, snapshot.params) as packet:
+                packet.write(snapshot.prompt)
+                packet_dir = packet.finish(snapshot.prompt_hash)
+            click.echo(f"Run packet created: {packet_dir}", err=True)
+        except OSError as e:
+            click.echo(f"Warning: Failed to create run packet: {e}", err=True)
+
+    if output_file:
+        click.echo(f"Output written to: {output_file}", err=True)
+    else:
+        sys.stdout.write("\n")
+
+
+@main.group("cache")
+def cache_group():
+    """Manage the shared disk render cache."""
+
+
+@cache_group.command("gc")
+@click.option("--max-size-mb", type=click.FloatRange(min=0),
+              help="Evict oldest entries until the cache is at most this size")
+@click.option("--max-age-days", type=click.FloatRange(min=0),
+              help="Evict entries older than this many days")
+@click.option("--render-cache-dir", type=click.Path(file_okay=False),
+              envvar="PK_RENDER_CACHE_DIR",
+              help="Directory of the render cache (default: $PK_RENDER_CACHE_DIR, "
+                   "else <cache dir>/renders)")
+def cache_gc_cmd(
+    max_size_mb: float | None, max_age_days: float | None, render_cache_dir: str | None
+):
+    """
+    Evict render cache entries by size and age.
+
+    Safe to run while other pk processes use the cache.
+    """
+    from pk.cache import DiskRenderCache
+
+    cache = DiskRenderCache(render_cache_dir)
+    result = cache.gc(
+        max_bytes=int(max_size_mb * 1024 * 1024) if max_size_mb is not None else None,
+        max_age_seconds=max_age_days * 86400 if max_age_days is not None else None,
+    )
+    click.echo(f"Cache: {cache.directory}")
+    click.echo(f"Removed {result.removed} entries ({result.freed_bytes} bytes)")
+    click.echo(f"Kept {result.kept} entries ({result.kept_bytes} bytes)")
+
+
+@main.group("bundle")
+def bundle_group():
+    """Pack templates into a single-file bundle."""
+
+
+@bundle_group.command("build")
+@click.option("--templates-dir", type=click.Path(exists=True, file_okay=False),
+              help="Templates directory to pack (default: the active one)")
+@click.option("--out", "-o", "output_file", default=PACKAGED_BUNDLE, show_default=True,
+              type=click.Path(dir_okay=False), help="Bundle file to write")
+def bundle_build_cmd(templates_dir: str | None, output_file: str):
+    """
+    Build a template bundle.
+
+    Use the bundle by setting PK_TEMPLATES_BUNDLE to its path, or ship it
+    as pk/templates.pkb in place of the templates directory.
+    """
+    source = templates_dir or get_templates_dir()
+    if not isinstance(source, (str, Path)):
+        click.echo("Error: templates are already bundled; pass --templates-dir", err=True)
+        sys.exit(1)
+    try:
+        count = build_bundle(source, output_file)
+    except (OSError, ValueError) as e:
+        click.echo(f"Error building bundle: {e}", err=True)
+        sys.exit(1)
+    click.echo(f"Packed {count} files from {source} into {output_file}")
+
+
+@bundle_group.command("verify")
+@click.argument("bundle_file", type=click.Path(exists=True, dir_okay=False))
+@click.option("--templates-dir", type=click.Path(exists=True, file_okay=False),
+              help="Also check that the bundle matches this directory")
+def bundle_verify_cmd(bundle_file: str, templates_dir: str | None):
+    """
+    Verify a template bundle's checksums.
+
+    Exits with non-zero status if any entry is corrupt or, with
+    --templates-dir, out of date.
+    """
+    problems = verify_bundle(bundle_file, templates_dir)
+    for problem in problems:
+        click.echo(f"  - {problem}")
+    if problems:
+        click.echo(f"Bundle {bundle_file}: {len(problems)} problem(s)", err=True)
+        sys.exit(1)
+    click.echo(f"Bundle {bundle_file}: OK")
 
 
 @main.command("doctor")
-@click.option("--template", "-t", help="Validate only a specific template")
-def doctor_cmd(template: str | None):
+@click.option("--template", "-t", shell_complete=_complete_template,
+              help="Validate only a specific template")
+@click.option("--jobs", "-j", type=click.IntRange(min=0), default=1, show_default=True,
+              help="Run checks in this many processes (0: one per CPU)")
+@click.option("--fail-fast", is_flag=True,
+              help="Stop at the first failed check")
+@click.option("--no-cache", is_flag=True,
+              help="Run every check, even ones whose inputs are unchanged")
+@click.option("--watch", "-w", is_flag=True,
+              help="Keep running and re-check templates as their files change")
+@click.option("--interval", type=click.FloatRange(min=0.05), default=0.5, show_default=True,
+              help="Seconds between scans for changes with --watch")
+def doctor_cmd(
+    template: str | None,
+    jobs: int,
+    fail_fast: bool,
+    no_cache: bool,
+    watch: bool,
+    interval: float,
+):
     """
     Validate templates and run health checks.
 
@@ -297,23 +556,35 @@ def doctor_cmd(template: str | None):
     - Variable coverage (no undeclared variables)
     - Golden tests (output matches expected)
 
+    Results are cached by the content of the files each check reads;
+    checks whose inputs are unchanged since they last ran are replayed
+    and marked "(cached)".
+
+    With --watch, runs every check once and then, until interrupted,
+    re-runs only the checks that read files that changed and prints
+    which checks started or stopped passing.
+
     Exits with non-zero status if any check fails.
     """
+    from pk.doctor import validate_all_templates, validate_templates
+
+    if watch:
+        if fail_fast:
+            raise click.UsageError("--fail-fast cannot be used with --watch")
+        _watch_doctor(template, jobs or None, not no_cache, interval)
+        return
+
     if template:
         # Validate single template
         try:
-            from pk.doctor import validate_template
-            results = validate_template(template)
-            from pk.doctor import DoctorReport
-            report = DoctorReport()
-            for r in results:
-                report.add(r)
+            get_template_dir(template)
+            report = validate_templates([template], jobs or None, fail_fast, not no_cache)
         except TemplateNotFoundError as e:
             click.echo(f"Error: {e}", err=True)
             sys.exit(1)
     else:
         # Validate all templates
-        report = validate_all_templates()
+        report = validate_all_templates(jobs or None, fail_fast, not no_cache)
 
     click.echo(report.format_report())
 
@@ -321,5 +592,31 @@ def doctor_cmd(template: str | None):
         sys.exit(1)
 
 
+def _watch_doctor(template: str | None, jobs: int | None, use_cache: bool, interval: float):
+    """Run the doctor, then re-check changed templates until interrupted."""
+    import time
+
+    from pk.watch import DoctorWatcher
+
+    if template:
+        try:
+            get_template_dir(template)
+        except TemplateNotFoundError as e:
+            click.echo(f"Error: {e}", err=True)
+            sys.exit(1)
+
+    with DoctorWatcher([template] if template else None, jobs, use_cache) as watcher:
+        click.echo(watcher.start().format_report())
+        click.echo(f"Watching for changes every {interval:g}s (Ctrl+C to stop)")
+        try:
+            while True:
+                time.sleep(interval)
+                cycle = watcher.poll()
+                if cycle is not None:
+                    click.echo(cycle.format_cycle())
+        except KeyboardInterrupt:
+            pass
+
+
 if __name__ == "__main__":
     main()
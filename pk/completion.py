@@ -0,0 +1,188 @@
+"""
+Shell completion data for the pk CLI.
+
+Completion runs a fresh ``pk`` process on every keystroke, so template
+names, preset names and schema parameters are served from an index
+stored at ``<cache dir>/completion.json``. The index records a
+fingerprint of the template roots (the stat stamps of each template
+directory, its ``examples`` directory, ``template.md``, ``schema.json``
+and shared schema files) and is only rebuilt when that fingerprint
+changes, so a completion costs a directory listing per root plus a few
+stats per template rather than parsing every schema.
+
+This module must only depend on the standard library.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from typing import Any
+
+from pk.bundle import BundlePath
+from pk.cache import get_cache_dir
+from pk.catalog import get_template_roots, list_presets, list_templates, load_schema
+from pk.errors import TemplateError
+from pk.fsutil import atomic_writer
+
+COMPLETION_INDEX_VERSION = 1
+
+_STAMPED_FILES = ("examples", "template.md", "schema.json")
+
+
+def get_completion_index() -> dict[str, dict[str, Any]]:
+    """
+    Get the completion index, rebuilding it if any template root changed.
+
+    Returns:
+        Mapping of template name to a dict with "description", "presets"
+        and "params" (parameter name -> list of suggested values).
+
+    Raises:
+        TemplateError: If the templates cannot be listed.
+    """
+    fingerprint = _fingerprint()
+    path = get_cache_dir() / "completion.json"
+    try:
+        index = json.loads(path.read_text(encoding="utf-8"))
+        if (
+            index.get("version") == COMPLETION_INDEX_VERSION
+            and index.get("fingerprint") == fingerprint
+        ):
+            return index["templates"]
+    except (OSError, ValueError, AttributeError):
+        pass
+
+    templates = _build_templates()
+    try:
+        with atomic_writer(path) as f:
+            json.dump({
+                "version": COMPLETION_INDEX_VERSION,
+                "fingerprint": fingerprint,
+                "templates": templates,
+            }, f)
+    except OSError:
+        pass  # Completion still works, just without the cache
+    return templates
+
+
+def complete_templates(incomplete: str) -> list[tuple[str, str]]:
+    """
+    Complete a template name.
+
+    Args:
+        incomplete: Text typed so far.
+
+    Returns:
+        (name, description) pairs of matching templates.
+    """
+    return [
+        (name, entry["description"])
+        for name, entry in get_completion_index().items()
+        if name.startswith(incomplete)
+    ]
+
+
+def complete_presets(template_name: str | None, incomplete: str) -> list[str]:
+    """
+    Complete a preset name of a template.
+
+    Args:
+        template_name: Template the preset belongs to, if known.
+        incomplete: Text typed so far.
+
+    Returns:
+        Matching preset names.
+    """
+    entry = get_completion_index().get(template_name or "")
+    if entry is None:
+        return []
+    return [preset for preset in entry["presets"] if preset.startswith(incomplete)]
+
+
+def complete_overrides(template_name: str | None, incomplete: str) -> list[str]:
+    """
+    Complete a ``--set key=value`` override.
+
+    Before the ``=``, parameter names are offered as ``key=``; after it,
+    the parameter's enum values (or true/false for booleans).
+
+    Args:
+        template_name: Template being rendered, if known.
+        incomplete: Text typed so far.
+
+    Returns:
+        Matching completions.
+    """
+    entry = get_completion_index().get(template_name or "")
+    if entry is None:
+        return []
+    params = entry["params"]
+    key, sep, value = incomplete.partition("=")
+    if not sep:
+        return [f"{name}=" for name in params if name.startswith(key)]
+    return [f"{key}={choice}" for choice in params.get(key, []) if choice.startswith(value)]
+
+
+def _build_templates() -> dict[str, dict[str, Any]]:
+    """Collect names, presets and parameters of every template."""
+    templates = {}
+    for info in list_templates():
+        name = info["name"]
+        try:
+            presets = list_presets(name)
+            properties = load_schema(name).get("properties", {})
+        except TemplateError:
+            presets, properties = [], {}
+        templates[name] = {
+            "description": info["description"],
+            "presets": presets,
+            "params": {
+                key: _suggested_values(prop)
+                for key, prop in sorted(properties.items())
+                if isinstance(prop, dict)
+            },
+        }
+    return templates
+
+
+def _suggested_values(prop: dict[str, Any]) -> list[str]:
+    """Values to offer after ``key=``, in --set syntax."""
+    if isinstance(prop.get("enum"), list):
+        return [
+            json.dumps(value) if not isinstance(value, str) else value
+            for value in prop["enum"]
+        ]
+    if prop.get("type") == "boolean":
+        return ["true", "false"]
+    return []
+
+
+def _fingerprint() -> str:
+    """Hash the roots and the stamps of everything the index is built from."""
+    digest = hashlib.sha256()
+    for root in get_template_roots():
+        digest.update(f"root\0{root.path}\0".encode())
+        if isinstance(root.path, BundlePath):
+            digest.update(f"{root.path.bundle.mtime_ns}\0".encode())
+            continue
+        try:
+            with os.scandir(root.path) as it:
+                entries = sorted(it, key=lambda entry: entry.name)
+        except OSError:
+            continue
+        for entry in entries:
+            if entry.is_dir():
+                paths = [entry.path, *(os.path.join(entry.path, f) for f in _STAMPED_FILES)]
+            elif entry.name.endswith(".json"):
+                paths = [entry.path]
+            else:
+                continue
+            for path in paths:
+                try:
+                    st = os.stat(path)
+                    digest.update(f"{path}\0{st.st_mtime_ns}\0{st.st_size}\0".encode())
+                except OSError:
+                    digest.update(f"{path}\0-\0".encode())
+    return digest.hexdigest()
@@ -0,0 +1,103 @@
+"""
+User configuration for promptkit.
+
+Configuration is a TOML file read from:
+
+- ``$PK_CONFIG`` if set
+- otherwise ``$XDG_CONFIG_HOME/promptkit/config.toml``
+- otherwise ``~/.config/promptkit/config.toml``
+
+Example::
+
+    [templates]
+    # Searched in order, before the built-in templates
+    path = ["~/org-templates", "team/templates.pkb"]
+
+This module must only depend on the standard library.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import tomllib
+from pathlib import Path
+from typing import Any
+
+CONFIG_ENV = "PK_CONFIG"
+
+# Parsed config by path, with the (mtime_ns, size) it was read at
+_configs: dict[Path, tuple[tuple[int, int], dict[str, Any]]] = {}
+_lock = threading.Lock()
+
+
+class ConfigError(ValueError):
+    """The configuration file is invalid."""
+
+
+def get_config_path() -> Path:
+    """Get the path of the user configuration file."""
+    override = os.environ.get(CONFIG_ENV)
+    if override:
+        return Path(override).expanduser()
+
+    xdg = os.environ.get("XDG_CONFIG_HOME")
+    base = Path(xdg).expanduser() if xdg else Path.home() / ".config"
+    return base / "promptkit" / "config.toml"
+
+
+def load_config() -> dict[str, Any]:
+    """
+    Load the user configuration.
+
+    The parsed file is cached and re-read when it changes.
+
+    Returns:
+        Configuration dict; empty if the file does not exist.
+
+    Raises:
+        ConfigError: If the file is not valid TOML.
+    """
+    path = get_config_path()
+    try:
+        st = path.stat()
+    except OSError:
+        return {}
+    stamp = (st.st_mtime_ns, st.st_size)
+
+    with _lock:
+        cached = _configs.get(path)
+        if cached is not None and cached[0] == stamp:
+            return cached[1]
+        try:
+            config = tomllib.loads(path.read_text(encoding="utf-8"))
+        except OSError:
+            return {}
+        except tomllib.TOMLDecodeError as e:
+            raise ConfigError(f"Invalid config file {path}: {e}") from e
+        _configs[path] = (stamp, config)
+        return config
+
+
+def get_config_template_path() -> list[Path]:
+    """
+    Get the template search path from the configuration.
+
+    Relative entries are resolved against the configuration file's
+    directory and ``~`` is expanded.
+
+    Returns:
+        Template roots in search order.
+
+    Raises:
+        ConfigError: If the file or its ``templates.path`` is invalid.
+    """
+    entries = load_config().get("templates", {}).get("path", [])
+    if isinstance(entries, str):
+        entries = [entries]
+    if not isinstance(entries, list) or not all(isinstance(e, str) for e in entries):
+        raise ConfigError(
+            f"Invalid config file {get_config_path()}: templates.path must be a list of strings"
+        )
+    base = get_config_path().parent
+    return [base / Path(entry).expanduser() for entry in entries]
@@ -7,30 +7,59 @@ Validates:
 - Template rendering with presets
 - Variable coverage (no undeclared variables)
 - Golden test comparison
+
+Each template is loaded once into a TemplateContext (sources, parsed
+schema and presets, AST and compiled template) that every check reads.
+
+Check results can be cached in ``<cache dir>/doctor``, keyed by the
+content hashes of the files each check reads and of promptkit's own
+source, and the promptkit, Jinja2, jsonschema and PyYAML versions, so
+unchanged checks are replayed instead of run again.
 """
 
 from __future__ import annotations
 
+import functools
+import hashlib
+import importlib.metadata
 import json
-from dataclasses import dataclass, field
-
+import os
+from collections.abc import Callable, Iterable, Mapping
+from concurrent.futures import Executor, ProcessPoolExecutor, as_completed, wait
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any
+
+import jinja2
+import yaml
+from jinja2 import Template, meta, nodes
 from jsonschema import Draft7Validator
 
+from pk import __version__
+from pk.bundle import BundlePath
+from pk.cache import get_cache_dir
+from pk.catalog import _load_shared_schema
+from pk.fsutil import atomic_writer
+from pk.hashing import compute_hash, compute_schema_hash
 from pk.render import (
     TemplateError,
+    get_compiled_template,
+    get_param_checker,
     get_schema_variables,
     get_template_dir,
-    get_template_variables,
-    get_templates_dir,
+    get_template_roots,
     list_presets,
     list_templates,
     load_preset,
-    load_schema,
     load_template,
     merge_params,
+    parse_template,
     render,
+    render_compiled,
     validate_params,
 )
+from pk.schema_codegen import ParamChecker
 
 
 @dataclass
@@ -42,6 +71,8 @@ class ValidationResult:
     passed: bool
     message: str
     details: list[str] = field(default_factory=list)
+    # Replayed from the doctor result cache rather than run
+    cached: bool = False
 
 
 @dataclass
@@ -49,6 +80,8 @@ class DoctorReport:
     """Complete doctor validation report."""
 
     results: list[ValidationResult] = field(default_factory=list)
+    # Checks not run because --fail-fast stopped early
+    skipped: int = 0
 
     @property
     def passed(self) -> bool:
@@ -90,7 +123,8 @@ class DoctorReport:
 
             for result in results:
                 status = "✓" if result.passed else "✗"
-                lines.append(f"  {status} {result.check}: {result.message}")
+                cached = " (cached)" if result.cached else ""
+                lines.append(f"  {status} {result.check}: {result.message}{cached}")
                 for detail in result.details:
                     lines.append(f"      {detail}")
 
@@ -98,7 +132,10 @@ class DoctorReport:
 
         # Summary
         lines.append("=" * 60)
-        lines.append(f"SUMMARY: {self.passed_count} passed, {self.failed_count} failed")
+        summary = f"SUMMARY: {self.passed_count} passed, {self.failed_count} failed"
+        if self.skipped:
+            summary += f", {self.skipped} checks not run (--fail-fast)"
+        lines.append(summary)
         if self.passed:
             lines.append("All checks passed!")
         else:
@@ -108,10 +145,149 @@ class DoctorReport:
         return "\n".join(lines)
 
 
-def validate_schema_json(template_name: str) -> ValidationResult:
-    """Validate that schema.json is valid JSON and valid JSON Schema."""
+@dataclass(frozen=True)
+class TemplateContext:
+    """
+    Everything the checks read about one template, loaded once.
+
+    Load failures are kept rather than raised, so each check can report
+    the ones it cares about. Checks must not mutate the schema or presets.
+    """
+
+    name: str
+    template_dir: Path | BundlePath
+    template_text: str | None
+    template_error: TemplateError | None
+    schema: dict[str, Any] | None
+    schema_error: TemplateError | None
+    # Generated parameter checker for schema, when one could be built
+    checker: ParamChecker | None
+    preset_names: tuple[str, ...]
+    # Parsed params of each preset that loaded, and errors of the others
+    presets: Mapping[str, dict[str, Any]]
+    preset_errors: Mapping[str, TemplateError]
+    ast: nodes.Template | None
+    syntax_error: TemplateError | None
+    compiled: Template | None
+
+    def merged_params(self, preset_name: str | None) -> dict[str, Any]:
+        """
+        Merge a preset over the schema defaults.
+
+        Args:
+            preset_name: Preset to merge, or None for defaults only.
+
+        Returns:
+            The merged parameters.
+
+        Raises:
+            TemplateError: If the schema or the preset failed to load.
+        """
+        if self.schema_error is not None:
+            raise self.schema_error
+        if preset_name is None:
+            return merge_params(self.schema)
+        if preset_name in self.preset_errors:
+            raise self.preset_errors[preset_name]
+        return merge_params(self.schema, preset_params=self.presets[preset_name])
+
+    def validate(self, params: dict[str, Any]) -> None:
+        """Validate params against the schema (see validate_params)."""
+        validate_params(self.schema, params, checker=self.checker)
+
+    def render(self, params: dict[str, Any]) -> str:
+        """
+        Render the template (see render).
+
+        Raises:
+            TemplateError: If the template failed to load or render.
+        """
+        if self.template_error is not None:
+            raise self.template_error
+        if self.compiled is None:
+            # Reports the syntax error exactly as render() always has
+            return render(self.template_text, params, template_name=self.name)
+        return render_compiled(self.compiled, params)
+
+
+def load_template_context(template_name: str) -> TemplateContext:
+    """
+    Load a template's sources and parse them once for all checks.
+
+    Args:
+        template_name: Name of the template.
+
+    Returns:
+        The template's context.
+
+    Raises:
+        TemplateNotFoundError: If the template doesn't exist.
+    """
     template_dir = get_template_dir(template_name)
-    schema_file = template_dir / "schema.json"
+
+    template_text = template_error = None
+    try:
+        template_text = load_template(template_name)
+    except TemplateError as e:
+        template_error = e
+
+    schema = schema_error = checker = None
+    try:
+        schema = _load_shared_schema(template_name)
+    except TemplateError as e:
+        schema_error = e
+    else:
+        try:
+            checker = get_param_checker(schema)
+        except Exception:
+            # validate_params() builds it again and reports the failure
+            checker = None
+
+    preset_names = tuple(list_presets(template_name))
+    presets: dict[str, dict[str, Any]] = {}
+    preset_errors: dict[str, TemplateError] = {}
+    for preset_name in preset_names:
+        try:
+            presets[preset_name] = load_preset(template_name, preset_name)
+        except TemplateError as e:
+            preset_errors[preset_name] = e
+
+    ast = syntax_error = compiled = None
+    if template_text is not None:
+        try:
+            ast = parse_template(template_text)
+        except TemplateError as e:
+            syntax_error = e
+        else:
+            try:
+                compiled = get_compiled_template(template_text, template_name)
+            except Exception:
+                compiled = None
+
+    return TemplateContext(
+        name=template_name,
+        template_dir=template_dir,
+        template_text=template_text,
+        template_error=template_error,
+        schema=schema,
+        schema_error=schema_error,
+        checker=checker,
+        preset_names=preset_names,
+        presets=MappingProxyType(presets),
+        preset_errors=MappingProxyType(preset_errors),
+        ast=ast,
+        syntax_error=syntax_error,
+        compiled=compiled,
+    )
+
+
+def validate_schema_json(
+    template_name: str, context: TemplateContext | None = None
+) -> ValidationResult:
+    """Validate that schema.json is valid JSON and valid JSON Schema."""
+    if context is None:
+        context = load_template_context(template_name)
+    schema_file = context.template_dir / "schema.json"
 
     if not schema_file.exists():
         return ValidationResult(
@@ -121,19 +297,18 @@ def validate_schema_json(template_name: str) -> ValidationResult:
             message="schema.json not found",
         )
 
-    try:
-        schema = json.loads(schema_file.read_text(encoding="utf-8"))
-    except json.JSONDecodeError as e:
+    # Checks the resolved schema, so broken $refs fail here too
+    if context.schema_error is not None:
         return ValidationResult(
             template=template_name,
             check="schema_json",
             passed=False,
-            message=f"Invalid JSON: {e}",
+            message=str(context.schema_error),
         )
 
     # Validate it's a valid JSON Schema
     try:
-        Draft7Validator.check_schema(schema)
+        Draft7Validator.check_schema(context.schema)
     except Exception as e:
         return ValidationResult(
             template=template_name,
@@ -150,22 +325,23 @@ def validate_schema_json(template_name: str) -> ValidationResult:
     )
 
 
-def validate_presets(template_name: str) -> list[ValidationResult]:
+def validate_presets(
+    template_name: str, context: TemplateContext | None = None
+) -> list[ValidationResult]:
     """Validate that all presets conform to the schema."""
+    if context is None:
+        context = load_template_context(template_name)
     results = []
 
-    try:
-        schema = load_schema(template_name)
-    except TemplateError as e:
+    if context.schema_error is not None:
         return [ValidationResult(
             template=template_name,
             check="presets",
             passed=False,
-            message=f"Could not load schema: {e}",
+            message=f"Could not load schema: {context.schema_error}",
         )]
 
-    presets = list_presets(template_name)
-    if not presets:
+    if not context.preset_names:
         return [ValidationResult(
             template=template_name,
             check="presets",
@@ -173,11 +349,9 @@ def validate_presets(template_name: str) -> list[ValidationResult]:
             message="No presets to validate",
         )]
 
-    for preset_name in presets:
+    for preset_name in context.preset_names:
         try:
-            preset_params = load_preset(template_name, preset_name)
-            merged = merge_params(schema, preset_params=preset_params)
-            validate_params(schema, merged)
+            context.validate(context.merged_params(preset_name))
             results.append(ValidationResult(
                 template=template_name,
                 check=f"preset:{preset_name}",
@@ -195,28 +369,29 @@ def validate_presets(template_name: str) -> list[ValidationResult]:
     return results
 
 
-def validate_template_renders(template_name: str) -> list[ValidationResult]:
+def validate_template_renders(
+    template_name: str, context: TemplateContext | None = None
+) -> list[ValidationResult]:
     """Validate that template renders with each preset."""
+    if context is None:
+        context = load_template_context(template_name)
     results = []
 
-    try:
-        template_text = load_template(template_name)
-        schema = load_schema(template_name)
-    except TemplateError as e:
+    load_error = context.template_error or context.schema_error
+    if load_error is not None:
         return [ValidationResult(
             template=template_name,
             check="render",
             passed=False,
-            message=f"Could not load template/schema: {e}",
+            message=f"Could not load template/schema: {load_error}",
         )]
 
-    presets = list_presets(template_name)
-    if not presets:
+    if not context.preset_names:
         # Try with just defaults
         try:
-            merged = merge_params(schema)
-            validate_params(schema, merged)
-            render(template_text, merged)
+            merged = context.merged_params(None)
+            context.validate(merged)
+            context.render(merged)
             results.append(ValidationResult(
                 template=template_name,
                 check="render:defaults",
@@ -232,12 +407,11 @@ def validate_template_renders(template_name: str) -> list[ValidationResult]:
             ))
         return results
 
-    for preset_name in presets:
+    for preset_name in context.preset_names:
         try:
-            preset_params = load_preset(template_name, preset_name)
-            merged = merge_params(schema, preset_params=preset_params)
-            validate_params(schema, merged)
-            render(template_text, merged)
+            merged = context.merged_params(preset_name)
+            context.validate(merged)
+            context.render(merged)
             results.append(ValidationResult(
                 template=template_name,
                 check=f"render:{preset_name}",
@@ -255,7 +429,9 @@ def validate_template_renders(template_name: str) -> list[ValidationResult]:
     return results
 
 
-def validate_variable_coverage(template_name: str) -> ValidationResult:
+def validate_variable_coverage(
+    template_name: str, context: TemplateContext | None = None
+) -> ValidationResult:
     """
     Validate that all template variables are declared in the schema.
 
@@ -264,28 +440,28 @@ def validate_variable_coverage(template_name: str) -> ValidationResult:
     - Variables used but not documented
     - Template-schema drift
     """
-    try:
-        template_text = load_template(template_name)
-        schema = load_schema(template_name)
-    except TemplateError as e:
+    if context is None:
+        context = load_template_context(template_name)
+
+    load_error = context.template_error or context.schema_error
+    if load_error is not None:
         return ValidationResult(
             template=template_name,
             check="variable_coverage",
             passed=False,
-            message=f"Could not load template/schema: {e}",
+            message=f"Could not load template/schema: {load_error}",
         )
 
-    try:
-        template_vars = get_template_variables(template_text)
-    except TemplateError as e:
+    if context.syntax_error is not None:
         return ValidationResult(
             template=template_name,
             check="variable_coverage",
             passed=False,
-            message=f"Template parse error: {e}",
+            message=f"Template parse error: {context.syntax_error}",
         )
 
-    schema_vars = get_schema_variables(schema)
+    template_vars = meta.find_undeclared_variables(context.ast)
+    schema_vars = get_schema_variables(context.schema)
 
     # Find undeclared variables (in template but not in schema)
     undeclared = template_vars - schema_vars
@@ -329,14 +505,17 @@ def normalize_text(text: str) -> str:
     return "\n".join(lines)
 
 
-def validate_golden_test(template_name: str) -> ValidationResult:
+def validate_golden_test(
+    template_name: str, context: TemplateContext | None = None
+) -> ValidationResult:
     """
     Validate that rendering with default preset matches golden file.
 
     Golden file location: templates/<name>/tests/render_golden.md
     """
-    template_dir = get_template_dir(template_name)
-    golden_file = template_dir / "tests" / "render_golden.md"
+    if context is None:
+        context = load_template_context(template_name)
+    golden_file = context.template_dir / "tests" / "render_golden.md"
 
     if not golden_file.exists():
         return ValidationResult(
@@ -348,19 +527,14 @@ def validate_golden_test(template_name: str) -> ValidationResult:
         )
 
     try:
-        template_text = load_template(template_name)
-        schema = load_schema(template_name)
+        if context.template_error is not None:
+            raise context.template_error
 
         # Use default preset if available, otherwise just defaults
-        presets = list_presets(template_name)
-        if "default" in presets:
-            preset_params = load_preset(template_name, "default")
-            merged = merge_params(schema, preset_params=preset_params)
-        else:
-            merged = merge_params(schema)
-
-        validate_params(schema, merged)
-        rendered = render(template_text, merged)
+        preset_name = "default" if "default" in context.preset_names else None
+        merged = context.merged_params(preset_name)
+        context.validate(merged)
+        rendered = context.render(merged)
 
     except TemplateError as e:
         return ValidationResult(
@@ -410,47 +584,427 @@ def validate_golden_test(template_name: str) -> ValidationResult:
     )
 
 
+# Checks run for every template, in report order. Each only reads the
+# template's context, so they can run in any order or process.
+_CHECKS: dict[
+    str, Callable[[str, TemplateContext], ValidationResult | list[ValidationResult]]
+] = {
+    "schema_json": validate_schema_json,
+    "presets": validate_presets,
+    "variable_coverage": validate_variable_coverage,
+    "render": validate_template_renders,
+    "golden_test": validate_golden_test,
+}
+
+# Check names, in report order
+CHECKS: tuple[str, ...] = tuple(_CHECKS)
+
+# What each check reads, as keys of get_input_hashes(). A check's cached
+# results are replayed only while all of these hash the same.
+_CHECK_INPUTS: dict[str, tuple[str, ...]] = {
+    "schema_json": ("schema",),
+    "presets": ("schema", "examples"),
+    "variable_coverage": ("template", "schema"),
+    "render": ("template", "schema", "examples"),
+    "golden_test": ("template", "schema", "examples", "golden"),
+}
+
+DOCTOR_CACHE_VERSION = 1
+
+
 def validate_template(template_name: str) -> list[ValidationResult]:
     """Run all validations for a single template."""
+    context = load_template_context(template_name)
     results = []
+    for check in _CHECKS:
+        results.extend(_run_check(template_name, check, context))
+    return results
+
+
+def validate_templates(
+    template_names: Iterable[str],
+    jobs: int | None = 1,
+    fail_fast: bool = False,
+    use_cache: bool = False,
+) -> DoctorReport:
+    """
+    Run all validations for several templates.
+
+    Args:
+        template_names: Templates to validate.
+        jobs: Number of worker processes (see run_checks).
+        fail_fast: Stop at the first failed check. Checks not yet
+            started are counted in DoctorReport.skipped.
+        use_cache: Replay results of checks whose inputs are unchanged
+            since they last ran (marked cached), and store new results.
+
+    Returns:
+        The report, in the same order whatever the number of jobs.
+
+    Raises:
+        TemplateNotFoundError: If a template doesn't exist.
+        ValueError: If jobs is less than 1.
+    """
+    units = [(name, check) for name in template_names for check in _CHECKS]
+    results = run_checks(units, jobs, fail_fast, use_cache)
 
-    # Schema validation
-    results.append(validate_schema_json(template_name))
+    report = DoctorReport()
+    for unit_results in results:
+        if unit_results is None:
+            report.skipped += 1
+            continue
+        for result in unit_results:
+            report.add(result)
+    return report
 
-    # Preset validation
-    results.extend(validate_presets(template_name))
 
-    # Variable coverage
-    results.append(validate_variable_coverage(template_name))
+def run_checks(
+    units: list[tuple[str, str]],
+    jobs: int | None = 1,
+    fail_fast: bool = False,
+    use_cache: bool = False,
+    executor: Executor | None = None,
+) -> list[list[ValidationResult] | None]:
+    """
+    Run (template, check) pairs.
+
+    With jobs > 1 the templates run in a process pool, one job per
+    template, so a template's context is loaded once for all its checks.
+
+    Args:
+        units: (template name, check name) pairs.
+        jobs: Number of worker processes. 1 runs in-process; None uses
+            os.cpu_count().
+        fail_fast: Stop at the first failed check, cancelling the
+            checks not yet started.
+        use_cache: Replay results of checks whose inputs are unchanged
+            since they last ran (marked cached), and store new results.
+        executor: Process pool to use when jobs > 1 instead of starting
+            a new one. It is left running, so its workers keep their
+            caches warm across calls.
+
+    Returns:
+        The results of each unit, in order; None for units that did not
+        run because of fail_fast.
+
+    Raises:
+        TemplateNotFoundError: If a template doesn't exist.
+        ValueError: If jobs is less than 1.
+    """
+    if jobs is None:
+        jobs = os.cpu_count() or 1
+    if jobs < 1:
+        raise ValueError("jobs must be at least 1")
+
+    results: list[list[ValidationResult] | None] = [None] * len(units)
+    keys = _load_cached_results(units, results) if use_cache else {}
+    pending = [i for i, unit_results in enumerate(results) if unit_results is None]
+
+    if jobs == 1 or len({units[i][0] for i in pending}) <= 1:
+        contexts: dict[str, TemplateContext] = {}
+        for i, (name, check) in enumerate(units):
+            if results[i] is None:
+                if name not in contexts:
+                    contexts[name] = load_template_context(name)
+                results[i] = _run_check(name, check, contexts[name])
+            if fail_fast and not _all_passed(results[i]):
+                break
+    elif not (fail_fast and not all(_all_passed(r) for r in results if r is not None)):
+        _run_parallel(units, pending, results, jobs, fail_fast, executor)
+
+    if use_cache:
+        _store_results(units, results, keys)
+    return results
 
-    # Render tests
-    results.extend(validate_template_renders(template_name))
 
-    # Golden test
-    results.append(validate_golden_test(template_name))
+def checks_reading(inputs: Iterable[str]) -> list[str]:
+    """
+    Find the checks that read any of some inputs.
 
+    Args:
+        inputs: Input names, as returned by get_input_hashes(). "dir"
+            (the template moved) affects every check.
+
+    Returns:
+        Check names, in report order.
+    """
+    inputs = set(inputs)
+    if "dir" in inputs:
+        return list(CHECKS)
+    return [check for check, reads in _CHECK_INPUTS.items() if inputs.intersection(reads)]
+
+
+def _run_check(
+    template_name: str, check: str, context: TemplateContext
+) -> list[ValidationResult]:
+    """Run one check for one template."""
+    result = _CHECKS[check](template_name, context)
+    return result if isinstance(result, list) else [result]
+
+
+def _run_template_checks(
+    template_name: str, checks: list[str], fail_fast: bool
+) -> list[list[ValidationResult]]:
+    """Run checks of one template in a pool worker, sharing one context."""
+    context = load_template_context(template_name)
+    results = []
+    for check in checks:
+        results.append(_run_check(template_name, check, context))
+        if fail_fast and not _all_passed(results[-1]):
+            break
     return results
 
 
-def validate_all_templates() -> DoctorReport:
-    """Run all validations for all templates."""
-    report = DoctorReport()
+def _all_passed(results: list[ValidationResult]) -> bool:
+    return all(r.passed for r in results)
+
+
+def _run_parallel(
+    units: list[tuple[str, str]],
+    pending: list[int],
+    results: list[list[ValidationResult] | None],
+    jobs: int,
+    fail_fast: bool,
+    executor: Executor | None = None,
+) -> None:
+    """Fill results[i] with the results of units[i] for each pending i, across a process pool."""
+    by_template: dict[str, list[int]] = {}
+    for i in pending:
+        by_template.setdefault(units[i][0], []).append(i)
+
+    owned = executor is None
+    if owned:
+        executor = ProcessPoolExecutor(max_workers=min(jobs, len(by_template)))
+    futures = {
+        executor.submit(
+            _run_template_checks, name, [units[i][1] for i in indexes], fail_fast
+        ): indexes
+        for name, indexes in by_template.items()
+    }
+    try:
+        for future in as_completed(futures):
+            template_results = future.result()
+            for i, unit_results in zip(futures[future], template_results, strict=False):
+                results[i] = unit_results
+            if fail_fast and not all(_all_passed(r) for r in template_results):
+                break
+    finally:
+        if owned:
+            executor.shutdown(wait=True, cancel_futures=True)
+        else:
+            for future in futures:
+                future.cancel()
+            wait(futures)
+
+    # Keep templates that were already running when fail-fast stopped
+    for future, indexes in futures.items():
+        if not future.cancelled() and future.exception() is None:
+            for i, unit_results in zip(indexes, future.result(), strict=False):
+                results[i] = unit_results
+
+
+def get_doctor_cache_path(template_name: str, template_dir: str) -> Path:
+    """Get the result cache file for a template in a given directory."""
+    digest = compute_hash(f"{template_name}\0{template_dir}")
+    return get_cache_dir() / "doctor" / f"{digest[:32]}.json"
+
+
+def get_check_keys(template_name: str) -> dict[str, str]:
+    """
+    Compute the result cache key of every check of a template.
+
+    Args:
+        template_name: Name of the template.
+
+    Returns:
+        Cache key by check name.
+
+    Raises:
+        TemplateNotFoundError: If the template doesn't exist.
+    """
+    hashes = get_input_hashes(template_name)
+    base = {
+        "version": DOCTOR_CACHE_VERSION,
+        "libraries": _library_versions(),
+        "template": template_name,
+        "dir": hashes["dir"],
+    }
+    return {
+        check: compute_hash(json.dumps(
+            {**base, "check": check, "inputs": {name: hashes[name] for name in inputs}},
+            sort_keys=True,
+        ))
+        for check, inputs in _CHECK_INPUTS.items()
+    }
+
+
+# Hashed into every cache key, so editing the checks (e.g. in an editable
+# install) invalidates their cached results
+_PACKAGE_DIR = Path(__file__).parent
+
+
+@functools.cache
+def _library_versions() -> dict[str, str]:
+    return {
+        "promptkit": __version__,
+        "promptkit_source": _source_hash(_PACKAGE_DIR),
+        "jinja2": jinja2.__version__,
+        "jsonschema": importlib.metadata.version("jsonschema"),
+        "pyyaml": yaml.__version__,
+    }
+
+
+def _source_hash(package_dir: Path) -> str:
+    """Hash the Python sources of a package."""
+    digest = hashlib.sha256()
+    for path in sorted(package_dir.rglob("*.py")):
+        digest.update(f"{path.relative_to(package_dir).as_posix()}\0".encode())
+        digest.update(hashlib.sha256(path.read_bytes()).digest())
+    return digest.hexdigest()
+
+
+def get_input_hashes(template_name: str) -> dict[str, str]:
+    """
+    Hash everything the checks of a template read.
+
+    Args:
+        template_name: Name of the template.
 
+    Returns:
+        Content hash by input name: "dir" (the template directory itself),
+        "template", "schema" (after $ref resolution), "examples" and
+        "golden".
+
+    Raises:
+        TemplateNotFoundError: If the template doesn't exist.
+    """
+    template_dir = get_template_dir(template_name)
+    # The resolved schema covers files reached through $ref; a schema that
+    # fails to load is identified by its error, which is all checks see
+    try:
+        schema = "schema:" + compute_schema_hash(_load_shared_schema(template_name))
+    except TemplateError as e:
+        schema = "error:" + compute_hash(str(e))
+
+    examples_dir = template_dir / "examples"
+    examples = hashlib.sha256()
+    if examples_dir.is_dir():
+        for path in sorted(examples_dir.iterdir(), key=lambda p: p.name):
+            examples.update(f"{path.name}\0{_file_hash(path)}\0".encode())
+
+    return {
+        "dir": str(template_dir),
+        "template": _file_hash(template_dir / "template.md"),
+        "schema": schema,
+        "examples": examples.hexdigest(),
+        "golden": _file_hash(template_dir / "tests" / "render_golden.md"),
+    }
+
+
+def _file_hash(path: Path | BundlePath) -> str:
+    try:
+        return hashlib.sha256(path.read_bytes()).hexdigest()
+    except OSError:
+        return "missing"
+
+
+def _load_cached_results(
+    units: list[tuple[str, str]],
+    results: list[list[ValidationResult] | None],
+) -> dict[str, dict[str, str]]:
+    """
+    Fill results[i] from the cache for each unit whose inputs are unchanged.
+
+    Returns:
+        The check keys of each template, for _store_results().
+    """
+    keys: dict[str, dict[str, str]] = {}
+    entries: dict[str, dict] = {}
+    for i, (name, check) in enumerate(units):
+        if name not in keys:
+            keys[name] = get_check_keys(name)
+            entries[name] = _read_cache_entry(name)
+        cached = entries[name].get(check)
+        if not isinstance(cached, dict) or cached.get("key") != keys[name][check]:
+            continue
+        try:
+            results[i] = [ValidationResult(**r, cached=True) for r in cached["results"]]
+        except (KeyError, TypeError):
+            continue
+    return keys
+
+
+def _store_results(
+    units: list[tuple[str, str]],
+    results: list[list[ValidationResult] | None],
+    keys: dict[str, dict[str, str]],
+) -> None:
+    """
+    Cache the results of checks that ran; failures to write are ignored.
+
+    Results are stored under the keys computed before the run, so inputs
+    edited while a check ran only cause a cache miss next time.
+    """
+    fresh: dict[str, dict[str, list[ValidationResult]]] = {}
+    for (name, check), unit_results in zip(units, results, strict=True):
+        if unit_results is not None and not any(r.cached for r in unit_results):
+            fresh.setdefault(name, {})[check] = unit_results
+
+    for name, checks in fresh.items():
+        entry = _read_cache_entry(name)
+        for check, unit_results in checks.items():
+            entry[check] = {
+                "key": keys[name][check],
+                "results": [
+                    {k: v for k, v in asdict(r).items() if k != "cached"}
+                    for r in unit_results
+                ],
+            }
+        try:
+            path = get_doctor_cache_path(name, str(get_template_dir(name)))
+            with atomic_writer(path) as f:
+                json.dump({"version": DOCTOR_CACHE_VERSION, "checks": entry}, f)
+        except OSError:
+            pass
+
+
+def _read_cache_entry(template_name: str) -> dict:
+    """Cached results of a template by check, or {} if there are none."""
+    path = get_doctor_cache_path(template_name, str(get_template_dir(template_name)))
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict) or data.get("version") != DOCTOR_CACHE_VERSION:
+        return {}
+    checks = data.get("checks")
+    return checks if isinstance(checks, dict) else {}
+
+
+def validate_all_templates(
+    jobs: int | None = 1, fail_fast: bool = False, use_cache: bool = False
+) -> DoctorReport:
+    """
+    Run all validations for all templates.
+
+    Args:
+        jobs: Number of worker processes (see validate_templates).
+        fail_fast: Stop at the first failed check.
+        use_cache: Replay unchanged checks from the result cache.
+
+    Returns:
+        The report.
+    """
     templates = list_templates()
     if not templates:
+        report = DoctorReport()
         report.add(ValidationResult(
             template="(none)",
             check="templates_exist",
             passed=False,
             message="No templates found",
-            details=[f"Expected templates in: {get_templates_dir()}"],
+            details=[f"Expected templates in: {root.path}" for root in get_template_roots()],
         ))
         return report
 
-    for template_info in templates:
-        template_name = template_info["name"]
-        results = validate_template(template_name)
-        for result in results:
-            report.add(result)
-
-    return report
+    return validate_templates([t["name"] for t in templates], jobs, fail_fast, use_cache)
@@ -0,0 +1,31 @@
+"""
+Exceptions raised by promptkit.
+
+This module must only depend on the standard library.
+"""
+
+from __future__ import annotations
+
+
+class TemplateError(Exception):
+    """Base exception for template-related errors."""
+
+
+class TemplateNotFoundError(TemplateError):
+    """Raised when a template cannot be found."""
+
+
+class PresetNotFoundError(TemplateError):
+    """Raised when a preset cannot be found."""
+
+
+class SchemaValidationError(TemplateError):
+    """Raised when parameters fail schema validation."""
+
+    def __init__(self, message: str, errors: list[str] | None = None):
+        super().__init__(message)
+        self.errors = errors or []
+
+
+class RenderError(TemplateError):
+    """Raised when template rendering fails."""
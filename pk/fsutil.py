@@ -0,0 +1,102 @@
+"""
+Filesystem helpers shared across promptkit modules.
+"""
+
+from __future__ import annotations
+
+import os
+import stat
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import IO
+
+_TEMP_ATTEMPTS = 100
+
+
+def create_temp_file(path: str | Path, suffix: str = ".tmp") -> tuple[int, str]:
+    """
+    Create a uniquely named temporary file next to path.
+
+    Unlike tempfile.mkstemp, which always uses mode 0600, the file gets the
+    permissions open() would give path: those of path if it exists,
+    otherwise 0666 minus the umask. Renaming it over path therefore leaves
+    the permissions unchanged.
+
+    Args:
+        path: File the temporary file will replace.
+        suffix: Suffix of the temporary file name.
+
+    Returns:
+        An open file descriptor and the temporary file name.
+
+    Raises:
+        OSError: If the file cannot be created.
+    """
+    path = Path(path)
+    try:
+        mode = stat.S_IMODE(path.stat().st_mode)
+    except OSError:
+        mode = None
+
+    for _ in range(_TEMP_ATTEMPTS):
+        name = str(path.parent / f".{path.name}.{os.urandom(4).hex()}{suffix}")
+        try:
+            fd = os.open(name, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666)
+        except FileExistsError:
+            continue
+        if mode is not None:
+            try:
+                os.fchmod(fd, mode)
+            except OSError:
+                os.close(fd)
+                os.unlink(name)
+                raise
+        return fd, name
+    raise FileExistsError(f"No usable temporary file name for {path}")
+
+
+@contextmanager
+def atomic_writer(path: str | Path, mode: str = "w") -> Iterator[IO]:
+    """
+    Open a temporary file that atomically replaces path on success.
+
+    The file is created next to path (so the final rename stays on one
+    filesystem) and is removed if the block raises. Readers therefore see
+    either the old content or the complete new content, never a partial
+    write. The replacement keeps the permissions of path (see
+    create_temp_file).
+
+    Only a missing path or a regular file is replaced. Anything else, such
+    as a symlink, a FIFO or /dev/stdout, is opened and written in place.
+
+    Args:
+        path: Destination path. Parent directories are created if needed.
+        mode: "w" for UTF-8 text or "wb" for bytes.
+
+    Yields:
+        Writable file object.
+    """
+    path = Path(path)
+    encoding = None if "b" in mode else "utf-8"
+    try:
+        replaceable = stat.S_ISREG(path.lstat().st_mode)
+    except FileNotFoundError:
+        replaceable = True
+    if not replaceable:
+        with open(path, mode, encoding=encoding) as f:
+            yield f
+        return
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = create_temp_file(path)
+    try:
+        with os.fdopen(fd, mode, encoding=encoding) as f:
+            yield f
+        os.replace(tmp_name, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except OSError:
+            pass
+        raise
@@ -0,0 +1,50 @@
+"""
+Content hashes used to identify templates, schemas, params and prompts.
+
+This module must only depend on the standard library.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from typing import Any
+
+
+def compute_hash(text: str) -> str:
+    """
+    Compute SHA256 hash of text.
+
+    Args:
+        text: Text to hash.
+
+    Returns:
+        Hex-encoded SHA256 hash.
+    """
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def compute_params_hash(params: dict[str, Any]) -> str:
+    """
+    Compute a canonical SHA256 hash of resolved parameters.
+
+    Args:
+        params: Parameters to hash.
+
+    Returns:
+        Hex-encoded SHA256 hash of the params serialized with sorted keys.
+    """
+    return compute_hash(json.dumps(params, sort_keys=True))
+
+
+def compute_schema_hash(schema: dict[str, Any]) -> str:
+    """
+    Compute a canonical SHA256 hash of a schema's content.
+
+    Args:
+        schema: JSON schema dict.
+
+    Returns:
+        Hex-encoded SHA256 hash, independent of key order.
+    """
+    return compute_hash(json.dumps(schema, sort_keys=True))
@@ -0,0 +1,289 @@
+"""
+Template manifest index.
+
+Listing templates used to mean checking every template directory and
+parsing every ``schema.json``. The manifest records, per template, its
+title and description, preset names, and the SHA256, mtime and size of
+``template.md`` and ``schema.json``, and is stored as a single JSON file
+under ``<cache dir>/manifests``.
+
+A manifest is checked against the modification times of the templates
+directory, each template and ``examples`` directory and each template
+file; only templates whose stamps changed are rebuilt. Stamps taken
+within RACY_NS of the build are not trusted (a file could change again
+within the same timestamp tick), so recently edited templates are
+re-read until they settle.
+
+This module must only depend on the standard library.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+from pk.cache import get_cache_dir
+from pk.fsutil import atomic_writer
+
+MANIFEST_VERSION = 1
+
+RACY_NS = 2_000_000_000
+
+_TEMPLATE_FILES = ("template.md", "schema.json")
+_PRESET_SUFFIXES = (".yaml", ".yml")
+
+# Loaded manifests by templates directory
+_manifests: dict[Path, dict[str, Any]] = {}
+_lock = threading.Lock()
+
+
+def get_manifest_path(templates_dir: str | Path) -> Path:
+    """
+    Get the cache path of the manifest for a templates directory.
+
+    Args:
+        templates_dir: Templates directory.
+
+    Returns:
+        Path of the manifest JSON file.
+    """
+    key = hashlib.sha256(str(Path(templates_dir).resolve()).encode("utf-8")).hexdigest()
+    return get_cache_dir() / "manifests" / f"{key[:32]}.json"
+
+
+def load_manifest(templates_dir: str | Path) -> dict[str, Any]:
+    """
+    Get the up-to-date manifest for a templates directory.
+
+    The manifest is read from memory or disk, refreshed for any changed
+    templates, and written back if anything changed.
+
+    Args:
+        templates_dir: Templates directory.
+
+    Returns:
+        Manifest dict with a "templates" mapping of name to entry. Must
+        not be mutated.
+
+    Raises:
+        ValueError: If a changed schema.json is not valid JSON.
+    """
+    templates_dir = Path(templates_dir)
+    with _lock:
+        manifest = _get_loaded(templates_dir)
+        if _refresh(manifest, templates_dir):
+            _save(manifest, templates_dir)
+        return manifest
+
+
+def get_template_entry(templates_dir: str | Path, name: str) -> dict[str, Any] | None:
+    """
+    Get the up-to-date manifest entry of one template.
+
+    Only that template's stamps are checked, so this is cheaper than
+    load_manifest() when a single template is needed.
+
+    Args:
+        templates_dir: Templates directory.
+        name: Template name.
+
+    Returns:
+        Entry dict with "title", "description", "presets" and "files"
+        keys, or None if there is no such template.
+
+    Raises:
+        ValueError: If a changed schema.json is not valid JSON.
+    """
+    templates_dir = Path(templates_dir)
+    with _lock:
+        manifest = _get_loaded(templates_dir)
+        entries = manifest["templates"]
+        entry = entries.get(name)
+        if entry is not None and _entry_is_fresh(entry, templates_dir / name, manifest):
+            return entry
+
+        entry = scan_template(templates_dir / name)
+        entries = {key: value for key, value in entries.items() if key != name}
+        if entry is not None:
+            entries[name] = entry
+        manifest["templates"] = dict(sorted(entries.items()))
+        _save(manifest, templates_dir)
+        return entry
+
+
+def clear_manifest_cache() -> None:
+    """Forget manifests loaded in this process (the disk copies are kept)."""
+    with _lock:
+        _manifests.clear()
+
+
+def _get_loaded(templates_dir: Path) -> dict[str, Any]:
+    """Get the in-memory manifest, reading it from disk on first use."""
+    manifest = _manifests.get(templates_dir)
+    if manifest is None:
+        try:
+            manifest = json.loads(get_manifest_path(templates_dir).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            manifest = None
+        if not isinstance(manifest, dict) or manifest.get("version") != MANIFEST_VERSION:
+            manifest = {
+                "version": MANIFEST_VERSION,
+                "built_ns": 0,
+                "root_mtime_ns": None,
+                "templates": {},
+                "other_dirs": {},
+            }
+        _manifests[templates_dir] = manifest
+    return manifest
+
+
+def _refresh(manifest: dict[str, Any], templates_dir: Path) -> bool:
+    """Bring a manifest up to date. Returns True if it changed."""
+    # Mappings are replaced rather than mutated, so earlier callers can
+    # keep iterating the manifest they got.
+    templates = dict(manifest["templates"])
+    other_dirs = dict(manifest["other_dirs"])
+    changed = False
+
+    root_mtime = _mtime(templates_dir)
+    if root_mtime is None:
+        changed = bool(templates or other_dirs)
+        templates, other_dirs = {}, {}
+    elif _is_stale(manifest["root_mtime_ns"], root_mtime, manifest):
+        names = sorted(item.name for item in templates_dir.iterdir() if item.is_dir())
+        templates = {name: templates[name] for name in names if name in templates}
+        other_dirs = {name: other_dirs.get(name) for name in names if name not in templates}
+        changed = True
+
+    for name, dir_mtime in list(other_dirs.items()):
+        if _is_stale(dir_mtime, _mtime(templates_dir / name), manifest):
+            del other_dirs[name]
+            templates[name] = None
+            changed = True
+
+    for name, entry in list(templates.items()):
+        if entry is not None and _entry_is_fresh(entry, templates_dir / name, manifest):
+            continue
+        entry = scan_template(templates_dir / name)
+        if entry is not None:
+            templates[name] = entry
+        else:
+            del templates[name]
+            mtime = _mtime(templates_dir / name)
+            if mtime is not None:
+                other_dirs[name] = mtime
+        changed = True
+
+    if changed:
+        manifest["templates"] = dict(sorted(templates.items()))
+        manifest["other_dirs"] = other_dirs
+        manifest["root_mtime_ns"] = root_mtime
+        manifest["built_ns"] = time.time_ns()
+    return changed
+
+
+def scan_template(template_dir: Path) -> dict[str, Any] | None:
+    """
+    Scan one template directory into a manifest entry.
+
+    Args:
+        template_dir: Template directory.
+
+    Returns:
+        Entry dict, or None if the directory is not a template.
+
+    Raises:
+        ValueError: If schema.json is not valid JSON.
+    """
+    dir_mtime = _mtime(template_dir)
+    if dir_mtime is None or not (template_dir / "template.md").is_file():
+        return None
+
+    files = {}
+    for filename in _TEMPLATE_FILES:
+        path = template_dir / filename
+        try:
+            st = path.stat()
+            data = path.read_bytes()
+        except OSError:
+            files[filename] = None
+            continue
+        files[filename] = {
+            "sha256": hashlib.sha256(data).hexdigest(),
+            "mtime_ns": st.st_mtime_ns,
+            "size": st.st_size,
+        }
+        if filename == "schema.json":
+            try:
+                schema = json.loads(data.decode("utf-8"))
+            except ValueError as e:
+                raise ValueError(f"Invalid JSON in schema {path}: {e}") from e
+
+    if files["schema.json"] is None or not isinstance(schema, dict):
+        schema = {}
+
+    examples_dir = template_dir / "examples"
+    examples_mtime = _mtime(examples_dir)
+    presets = []
+    if examples_mtime is not None:
+        presets = [
+            item.stem for item in sorted(examples_dir.iterdir())
+            if item.suffix in _PRESET_SUFFIXES and item.is_file()
+        ]
+
+    return {
+        "title": schema.get("title"),
+        "description": schema.get("description", schema.get("title", "No description")),
+        "presets": presets,
+        "dir_mtime_ns": dir_mtime,
+        "examples_mtime_ns": examples_mtime,
+        "files": files,
+    }
+
+
+def _entry_is_fresh(entry: dict[str, Any], template_dir: Path, manifest: dict[str, Any]) -> bool:
+    """Check an entry's stamps against the filesystem."""
+    if _is_stale(entry["dir_mtime_ns"], _mtime(template_dir), manifest):
+        return False
+    if _is_stale(entry["examples_mtime_ns"], _mtime(template_dir / "examples"), manifest):
+        return False
+    for filename, recorded in entry["files"].items():
+        try:
+            st = (template_dir / filename).stat()
+        except OSError:
+            if recorded is not None:
+                return False
+            continue
+        if recorded is None or recorded["size"] != st.st_size:
+            return False
+        if _is_stale(recorded["mtime_ns"], st.st_mtime_ns, manifest):
+            return False
+    return True
+
+
+def _is_stale(recorded: int | None, current: int | None, manifest: dict[str, Any]) -> bool:
+    """A stamp is stale if it changed or is too close to the build time to trust."""
+    if recorded != current:
+        return True
+    return current is not None and current >= manifest["built_ns"] - RACY_NS
+
+
+def _mtime(path: Path) -> int | None:
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+def _save(manifest: dict[str, Any], templates_dir: Path) -> None:
+    """Write a manifest to the cache; failures are ignored."""
+    try:
+        with atomic_writer(get_manifest_path(templates_dir)) as f:
+            json.dump(manifest, f, indent=1)
+    except OSError:
+        pass
@@ -0,0 +1,107 @@
+"""
+Ahead-of-time compilation of templates to Python modules.
+
+The wheel build runs precompile_templates() so installed packages ship
+``pk/_precompiled/<name>.py`` next to the templates. Each module records
+the SHA256 of the template source and the Jinja2 version it was compiled
+with; pk.render only uses a module when both still match and otherwise
+compiles from source.
+
+This module must only depend on Jinja2 and the standard library, since
+the build hook imports it before the package's runtime dependencies are
+installed.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import re
+from pathlib import Path
+
+import jinja2
+from jinja2 import Environment, StrictUndefined
+
+PRECOMPILED_PACKAGE = "pk._precompiled"
+
+_HEADER = '''\
+# Generated by pk.precompile from templates/{name}/template.md. Do not edit.
+SOURCE_HASH = {source_hash!r}
+JINJA2_VERSION = {jinja_version!r}
+'''
+
+
+def module_name(template_name: str) -> str:
+    """
+    Get the module name used for a precompiled template.
+
+    Args:
+        template_name: Name of the template.
+
+    Returns:
+        A valid Python identifier derived from the template name.
+    """
+    name = re.sub(r"\W", "_", template_name)
+    return f"t_{name}"
+
+
+def compile_template_module(
+    template_name: str,
+    source: str,
+    env: Environment | None = None,
+) -> str:
+    """
+    Compile a template to Python module source.
+
+    Args:
+        template_name: Name of the template.
+        source: Jinja2 template content.
+        env: Environment to compile with. Must match the rendering
+            environment's syntax options.
+
+    Returns:
+        Python source for an importable module.
+    """
+    if env is None:
+        env = Environment(undefined=StrictUndefined)
+
+    code = env.compile(source, name=template_name, raw=True, defer_init=True)
+    header = _HEADER.format(
+        name=template_name,
+        source_hash=hashlib.sha256(source.encode("utf-8")).hexdigest(),
+        jinja_version=jinja2.__version__,
+    )
+    return header + code
+
+
+def precompile_templates(templates_dir: str | Path, out_dir: str | Path) -> list[Path]:
+    """
+    Precompile every ``<templates_dir>/*/template.md`` into a package.
+
+    Args:
+        templates_dir: Directory containing template directories.
+        out_dir: Package directory to write modules into. Created if needed.
+
+    Returns:
+        Paths of the generated modules.
+    """
+    templates_dir = Path(templates_dir)
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    (out_dir / "__init__.py").write_text(
+        '"""Precompiled promptkit templates (generated at build time)."""\n',
+        encoding="utf-8",
+    )
+
+    env = Environment(undefined=StrictUndefined)
+    written = []
+    for item in sorted(templates_dir.iterdir()):
+        template_file = item / "template.md"
+        if not item.is_dir() or not template_file.exists():
+            continue
+        source = template_file.read_text(encoding="utf-8")
+        module_file = out_dir / f"{module_name(item.name)}.py"
+        module_file.write_text(
+            compile_template_module(item.name, source, env), encoding="utf-8"
+        )
+        written.append(module_file)
+    return written
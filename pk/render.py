@@ -10,167 +10,316 @@ Provides:
 
 from __future__ import annotations
 
+import asyncio
 import hashlib
+import importlib
 import json
+import shutil
+import sys
+import threading
+from collections import OrderedDict
+from collections.abc import AsyncIterator, Callable, Hashable, Iterable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
 from datetime import UTC, datetime
 from pathlib import Path
-from typing import Any
+from typing import IO, Any
 
+import jinja2
 import yaml
-from jinja2 import Environment, StrictUndefined, TemplateSyntaxError, UndefinedError, meta
+from jinja2 import (
+    Environment,
+    FileSystemBytecodeCache,
+    StrictUndefined,
+    Template,
+    TemplateSyntaxError,
+    UndefinedError,
+    meta,
+    nodes,
+)
 from jsonschema import Draft7Validator
 
-
-class TemplateError(Exception):
-    """Base exception for template-related errors."""
-
-
-class TemplateNotFoundError(TemplateError):
-    """Raised when a template cannot be found."""
-
-
-class PresetNotFoundError(TemplateError):
-    """Raised when a preset cannot be found."""
-
-
-class SchemaValidationError(TemplateError):
-    """Raised when parameters fail schema validation."""
-
-    def __init__(self, message: str, errors: list[str] | None = None):
-        super().__init__(message)
-        self.errors = errors or []
-
-
-class RenderError(TemplateError):
-    """Raised when template rendering fails."""
-
-
-def get_templates_dir() -> Path:
-    """Get the path to the templates directory."""
-    # Templates are bundled with the package
-    pkg_dir = Path(__file__).parent.parent
-    return pkg_dir / "templates"
-
-
-def list_templates() -> list[dict[str, str]]:
-    """
-    List all available templates with their names and descriptions.
-
-    Returns:
-        List of dicts with 'name' and 'description' keys.
-    """
-    templates_dir = get_templates_dir()
-    if not templates_dir.exists():
-        return []
-
-    templates = []
-    for item in sorted(templates_dir.iterdir()):
-        if item.is_dir() and (item / "template.md").exists():
-            schema = load_schema(item.name)
-            description = schema.get("description", schema.get("title", "No description"))
-            templates.append({
-                "name": item.name,
-                "description": description,
-            })
-    return templates
-
-
-def get_template_dir(template_name: str) -> Path:
-    """
-    Get the directory for a specific template.
-
-    Args:
-        template_name: Name of the template.
-
-    Returns:
-        Path to the template directory.
-
-    Raises:
-        TemplateNotFoundError: If template doesn't exist.
-    """
-    template_dir = get_templates_dir() / template_name
-    if not template_dir.exists() or not template_dir.is_dir():
-        available = [t["name"] for t in list_templates()]
-        raise TemplateNotFoundError(
-            f"Template '{template_name}' not found. "
-            f"Available templates: {', '.join(available) if available else 'none'}"
-        )
-    return template_dir
-
-
-def load_template(template_name: str) -> str:
+from pk.cache import env_flag, get_cache_dir
+from pk.catalog import (  # noqa: F401 - re-exported
+    PACKAGED_BUNDLE,
+    TEMPLATE_PATH_ENV,
+    TEMPLATES_BUNDLE_ENV,
+    TemplateRoot,
+    _load_shared_schema,
+    clear_schema_cache,
+    clear_template_index,
+    get_schema_defaults,
+    get_template_dir,
+    get_template_roots,
+    get_templates_dir,
+    list_presets,
+    list_templates,
+    load_schema,
+    load_template,
+    resolve_template_root,
+)
+from pk.errors import (  # noqa: F401 - re-exported
+    PresetNotFoundError,
+    RenderError,
+    SchemaValidationError,
+    TemplateError,
+    TemplateNotFoundError,
+)
+from pk.hashing import compute_hash, compute_params_hash, compute_schema_hash
+from pk.precompile import PRECOMPILED_PACKAGE, module_name
+from pk.schema_codegen import ParamChecker, UnsupportedSchemaError, compile_param_checker
+from pk.specialize import specialize_ast
+from pk.yaml_cache import load_yaml_file
+
+# Set to "0"/"false"/"off" to disable the persistent bytecode cache.
+BYTECODE_CACHE_ENV = "PK_BYTECODE_CACHE"
+
+# Set to "0"/"false"/"off" to validate with Draft7Validator instead of
+# generated param checkers.
+VALIDATOR_CODEGEN_ENV = "PK_VALIDATOR_CODEGEN"
+
+
+@dataclass(frozen=True)
+class CacheStats:
+    """Point-in-time counters for an in-memory cache."""
+
+    hits: int
+    misses: int
+    evictions: int
+    size: int
+    maxsize: int
+    nbytes: int = 0
+    maxbytes: int | None = None
+
+
+class CompiledTemplateCache:
     """
-    Load the template.md content for a template.
-
-    Args:
-        template_name: Name of the template.
-
-    Returns:
-        Template content as string.
-
-    Raises:
-        TemplateNotFoundError: If template file doesn't exist.
-    """
-    template_dir = get_template_dir(template_name)
-    template_file = template_dir / "template.md"
-
-    if not template_file.exists():
-        raise TemplateNotFoundError(
-            f"Template file not found: {template_file}"
-        )
-
-    return template_file.read_text(encoding="utf-8")
-
-
-def load_schema(template_name: str) -> dict[str, Any]:
-    """
-    Load the schema.json for a template.
-
-    Args:
-        template_name: Name of the template.
+    Bounded, thread-safe LRU cache of compiled Jinja2 templates.
 
-    Returns:
-        Schema as dict.
-
-    Raises:
-        TemplateNotFoundError: If schema file doesn't exist.
-        TemplateError: If schema is invalid JSON.
+    Entries are keyed by caller-supplied hashable keys, typically
+    ``(template_name, content_hash)``, so an edited template never
+    reuses stale bytecode.
     """
-    template_dir = get_template_dir(template_name)
-    schema_file = template_dir / "schema.json"
 
-    if not schema_file.exists():
-        raise TemplateNotFoundError(
-            f"Schema file not found: {schema_file}"
-        )
-
-    try:
-        return json.loads(schema_file.read_text(encoding="utf-8"))
-    except json.JSONDecodeError as e:
-        raise TemplateError(f"Invalid JSON in schema {schema_file}: {e}") from e
-
-
-def list_presets(template_name: str) -> list[str]:
+    def __init__(self, maxsize: int = 64):
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        self.maxsize = maxsize
+        self._entries: OrderedDict[Hashable, Template] = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def get(self, key: Hashable) -> Template | None:
+        """
+        Look up a compiled template, counting the hit or miss.
+
+        Args:
+            key: Cache key.
+
+        Returns:
+            The cached template, or None on a miss.
+        """
+        with self._lock:
+            template = self._entries.get(key)
+            if template is None:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return template
+
+    def put(self, key: Hashable, template: Template) -> None:
+        """
+        Store a compiled template, evicting the least recently used entries.
+
+        Args:
+            key: Cache key.
+            template: Compiled template.
+        """
+        with self._lock:
+            self._entries[key] = template
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def get_or_compile(self, key: Hashable, compile_fn: Callable[[], Template]) -> Template:
+        """
+        Return the cached template for key, compiling it on a miss.
+
+        Args:
+            key: Cache key.
+            compile_fn: Zero-argument callable producing the compiled template.
+
+        Returns:
+            The compiled template.
+        """
+        template = self.get(key)
+        if template is None:
+            # Compile outside the lock; a concurrent miss on the same key just
+            # compiles twice and the later result wins.
+            template = compile_fn()
+            self.put(key, template)
+        return template
+
+    def clear(self) -> None:
+        """Drop all entries and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self._hits = 0
+            self._misses = 0
+            self._evictions = 0
+
+    def stats(self) -> CacheStats:
+        """Return the current hit/miss/eviction counters."""
+        with self._lock:
+            return CacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                size=len(self._entries),
+                maxsize=self.maxsize,
+            )
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class RenderCache:
     """
-    List available preset names for a template.
-
-    Args:
-        template_name: Name of the template.
+    Bounded, thread-safe LRU cache of rendered prompts.
 
-    Returns:
-        List of preset names (without extension).
+    Entries are keyed by ``(template_hash, params_hash)`` and store the
+    rendered text with its prompt hash. The cache is bounded both by entry
+    count and by the total in-memory size of the stored strings.
     """
-    template_dir = get_template_dir(template_name)
-    examples_dir = template_dir / "examples"
-
-    if not examples_dir.exists():
-        return []
 
-    presets = []
-    for item in sorted(examples_dir.iterdir()):
-        if item.is_file() and item.suffix in (".yaml", ".yml"):
-            presets.append(item.stem)
-    return presets
+    def __init__(self, maxsize: int = 1024, maxbytes: int = 64 * 1024 * 1024):
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        if maxbytes < 1:
+            raise ValueError("maxbytes must be at least 1")
+        self.maxsize = maxsize
+        self.maxbytes = maxbytes
+        self._entries: OrderedDict[tuple[str, str], tuple[str, str, int]] = OrderedDict()
+        self._nbytes = 0
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def get(self, template_hash: str, params_hash: str) -> tuple[str, str] | None:
+        """
+        Look up a rendered prompt, counting the hit or miss.
+
+        Args:
+            template_hash: compute_hash() of the template source.
+            params_hash: compute_params_hash() of the resolved params.
+
+        Returns:
+            (rendered, prompt_hash), or None on a miss.
+        """
+        key = (template_hash, params_hash)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return entry[0], entry[1]
+
+    def put(self, template_hash: str, params_hash: str, rendered: str, prompt_hash: str) -> None:
+        """
+        Store a rendered prompt, evicting least recently used entries.
+
+        Prompts larger than maxbytes on their own are not stored.
+        """
+        size = sys.getsizeof(rendered)
+        if size > self.maxbytes:
+            return
+
+        key = (template_hash, params_hash)
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._nbytes -= old[2]
+            self._entries[key] = (rendered, prompt_hash, size)
+            self._nbytes += size
+            while len(self._entries) > self.maxsize or self._nbytes > self.maxbytes:
+                _, (_, _, evicted_size) = self._entries.popitem(last=False)
+                self._nbytes -= evicted_size
+                self._evictions += 1
+
+    def invalidate(self, template_hash: str | None = None) -> int:
+        """
+        Drop cached renders.
+
+        Args:
+            template_hash: Only drop entries for this template source.
+                Drops everything when None.
+
+        Returns:
+            Number of entries removed.
+        """
+        with self._lock:
+            if template_hash is None:
+                removed = len(self._entries)
+                self._entries.clear()
+                self._nbytes = 0
+                return removed
+
+            keys = [key for key in self._entries if key[0] == template_hash]
+            for key in keys:
+                self._nbytes -= self._entries.pop(key)[2]
+            return len(keys)
+
+    def clear(self) -> None:
+        """Drop all entries and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self._nbytes = 0
+            self._hits = 0
+            self._misses = 0
+            self._evictions = 0
+
+    def stats(self) -> CacheStats:
+        """Return the current hit/miss/eviction counters and byte usage."""
+        with self._lock:
+            return CacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                size=len(self._entries),
+                maxsize=self.maxsize,
+                nbytes=self._nbytes,
+                maxbytes=self.maxbytes,
+            )
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# Shared rendering environments and compiled-template caches. Environments are
+# safe to share across threads once configured. Async templates compile to
+# different code, so they get their own environment and cache.
+_env = Environment(undefined=StrictUndefined)
+_template_cache = CompiledTemplateCache()
+_async_env = Environment(undefined=StrictUndefined, enable_async=True)
+_async_template_cache = CompiledTemplateCache()
+_bytecode_cache_configured = False
+_render_cache = RenderCache()
+_specialized_cache = CompiledTemplateCache(maxsize=256)
+
+# Compiled JSON Schema validators and generated param checkers, keyed by
+# canonical schema hash, so a schema edited in place never hits a stale
+# entry.
+_validators: dict[str, Draft7Validator] = {}
+_param_checkers: dict[str, ParamChecker] = {}
+_property_checkers: dict[str, dict[str, ParamChecker] | None] = {}
+_validators_lock = threading.Lock()
 
 
 def load_preset(template_name: str, preset_name: str) -> dict[str, Any]:
@@ -194,12 +343,13 @@ def load_preset(template_name: str, preset_name: str) -> dict[str, Any]:
     # Try .yaml first, then .yml
     for ext in (".yaml", ".yml"):
         preset_file = examples_dir / f"{preset_name}{ext}"
-        if preset_file.exists():
-            try:
-                content = yaml.safe_load(preset_file.read_text(encoding="utf-8"))
-                return content if content else {}
-            except yaml.YAMLError as e:
-                raise TemplateError(f"Invalid YAML in preset {preset_file}: {e}") from e
+        try:
+            content = load_yaml_file(preset_file)
+        except FileNotFoundError:
+            continue
+        except yaml.YAMLError as e:
+            raise TemplateError(f"Invalid YAML in preset {preset_file}: {e}") from e
+        return content if content else {}
 
     available = list_presets(template_name)
     raise PresetNotFoundError(
@@ -225,42 +375,20 @@ def load_params_file(path: str | Path) -> dict[str, Any]:
     if not path.exists():
         raise TemplateError(f"Params file not found: {path}")
 
-    content = path.read_text(encoding="utf-8")
-
     if path.suffix == ".json":
         try:
-            return json.loads(content)
+            return json.loads(path.read_text(encoding="utf-8"))
         except json.JSONDecodeError as e:
             raise TemplateError(f"Invalid JSON in params file {path}: {e}") from e
     else:
         # Assume YAML for .yaml, .yml, or anything else
         try:
-            result = yaml.safe_load(content)
+            result = load_yaml_file(path)
             return result if result else {}
         except yaml.YAMLError as e:
             raise TemplateError(f"Invalid YAML in params file {path}: {e}") from e
 
 
-def get_schema_defaults(schema: dict[str, Any]) -> dict[str, Any]:
-    """
-    Extract default values from a JSON schema.
-
-    Args:
-        schema: JSON schema dict.
-
-    Returns:
-        Dict of parameter names to their default values.
-    """
-    defaults = {}
-    properties = schema.get("properties", {})
-
-    for prop_name, prop_schema in properties.items():
-        if "default" in prop_schema:
-            defaults[prop_name] = prop_schema["default"]
-
-    return defaults
-
-
 def merge_params(
     schema: dict[str, Any],
     preset_params: dict[str, Any] | None = None,
@@ -303,50 +431,312 @@ def merge_params(
     return merged
 
 
-def validate_params(schema: dict[str, Any], params: dict[str, Any]) -> None:
+def validate_params(
+    schema: dict[str, Any],
+    params: dict[str, Any],
+    validator: Draft7Validator | None = None,
+    checker: ParamChecker | None = None,
+) -> None:
     """
     Validate parameters against a JSON schema.
 
+    By default this runs the checker generated for the schema by
+    pk.schema_codegen, which reports exactly what Draft7Validator would.
+
     Args:
         schema: JSON schema dict.
         params: Parameters to validate.
+        validator: Optional prebuilt Draft7Validator for schema. When
+            given it is used instead of the generated checker.
+        checker: Optional prebuilt checker from get_param_checker().
 
     Raises:
         SchemaValidationError: If validation fails, with detailed error messages.
     """
-    validator = Draft7Validator(schema)
-    errors = list(validator.iter_errors(params))
+    if validator is not None:
+        errors = _draft7_errors(validator, params)
+    else:
+        if checker is None:
+            checker = get_param_checker(schema)
+        errors = checker(params)
 
     if errors:
-        error_messages = []
-        for error in errors:
-            path = ".".join(str(p) for p in error.absolute_path) if error.absolute_path else "root"
-            error_messages.append(f"  - {path}: {error.message}")
-
-        raise SchemaValidationError(
-            "Parameter validation failed:\n" + "\n".join(error_messages),
-            errors=error_messages,
+        _raise_validation_errors(errors)
+
+
+def _raise_validation_errors(errors: list[tuple[str, str]]) -> None:
+    error_messages = [f"  - {path}: {message}" for path, message in errors]
+    raise SchemaValidationError(
+        "Parameter validation failed:\n" + "\n".join(error_messages),
+        errors=error_messages,
+    )
+
+
+def _draft7_errors(validator: Draft7Validator, params: Any) -> list[tuple[str, str]]:
+    """Collect (path, message) pairs from a Draft7Validator."""
+    return [
+        (
+            ".".join(str(p) for p in error.absolute_path) if error.absolute_path else "root",
+            error.message,
         )
+        for error in validator.iter_errors(params)
+    ]
 
 
-def get_template_variables(template_text: str) -> set[str]:
+def _lookup_schema_entry(
+    schema: dict[str, Any],
+    by_hash: dict[str, Any],
+    build: Callable[[dict[str, Any]], Any],
+) -> Any:
+    """Find or build the registry entry for a schema (see get_validator)."""
+    key = compute_schema_hash(schema)
+    with _validators_lock:
+        value = by_hash.get(key)
+    if value is None:
+        # Built outside the lock so slow builds do not block other lookups.
+        value = build(schema)
+        with _validators_lock:
+            value = by_hash.setdefault(key, value)
+    return value
+
+
+def get_validator(schema: dict[str, Any]) -> Draft7Validator:
     """
-    Extract all variable names used in a Jinja2 template.
+    Get the shared compiled validator for a schema.
+
+    Validators are built once per distinct schema content and reused
+    across calls and threads. A schema edited in place is looked up by
+    its new content.
+
+    Args:
+        schema: JSON schema dict.
+
+    Returns:
+        Draft7Validator for schema.
+    """
+    return _lookup_schema_entry(schema, _validators, Draft7Validator)
+
+
+def get_param_checker(schema: dict[str, Any]) -> ParamChecker:
+    """
+    Get the shared parameter checker for a schema.
+
+    Checkers are generated Python functions (see pk.schema_codegen),
+    cached in memory by schema content like get_validator().
+    Schemas outside the generator's subset, or any schema when
+    ``PK_VALIDATOR_CODEGEN=0``, get a checker backed by Draft7Validator.
+
+    Args:
+        schema: JSON schema dict.
+
+    Returns:
+        Function returning ``(path, message)`` pairs for each violation.
+    """
+    return _lookup_schema_entry(schema, _param_checkers, _build_checker)
+
+
+def _build_checker(schema: dict[str, Any]) -> ParamChecker:
+    if env_flag(VALIDATOR_CODEGEN_ENV):
+        try:
+            return compile_param_checker(schema)
+        except UnsupportedSchemaError:
+            pass
+    validator = get_validator(schema)
+    return lambda params: _draft7_errors(validator, params)
+
+
+def prewarm_validators(template_names: Iterable[str] | None = None) -> int:
+    """
+    Build validators and param checkers for template schemas ahead of time.
+
+    Args:
+        template_names: Templates to prewarm. Defaults to all templates.
+
+    Returns:
+        Number of schemas prewarmed.
+    """
+    if template_names is None:
+        template_names = [t["name"] for t in list_templates()]
+
+    count = 0
+    for name in template_names:
+        schema = _load_shared_schema(name)
+        get_validator(schema)
+        get_param_checker(schema)
+        count += 1
+    return count
+
+
+def clear_validator_cache() -> None:
+    """Drop all compiled validators and param checkers."""
+    with _validators_lock:
+        _validators.clear()
+        _param_checkers.clear()
+        _property_checkers.clear()
+
+
+@dataclass(frozen=True)
+class ValidatedBase:
+    """
+    Pre-validated base parameters for overlay validation.
+
+    Built by prepare_validated_base(); pass to validate_overlay().
+
+    Attributes:
+        schema: JSON schema the base was validated against.
+        params: Merged base parameters (defaults, preset, params file).
+            Must not be mutated.
+        property_errors: Errors of each base value, by property name.
+        property_checkers: Per-property checkers, or None when the schema
+            has root keywords that need full validation.
+    """
+
+    schema: dict[str, Any]
+    params: dict[str, Any]
+    property_errors: dict[str, list[tuple[str, str]]]
+    property_checkers: dict[str, ParamChecker] | None
+
+
+# Root keywords whose result is fully determined by per-property checks
+# plus the required list. Anything else forces full validation.
+_OVERLAY_ROOT_KEYWORDS = {
+    "$schema", "$id", "$comment", "title", "description", "default", "definitions",
+    "type", "properties", "required",
+}
+
+
+def prepare_validated_base(
+    schema: dict[str, Any],
+    preset_params: dict[str, Any] | None = None,
+    file_params: dict[str, Any] | None = None,
+) -> ValidatedBase:
+    """
+    Merge and validate the fixed layers of a parameter set once.
+
+    Each base value is checked against its property sub-schema and the
+    outcome kept, so validate_overlay() only has to check the keys an
+    overlay changes. Invalid base values are not an error here; they are
+    reported by validate_overlay() unless the overlay replaces them.
+
+    Args:
+        schema: JSON schema for the template.
+        preset_params: Parameters from a preset file.
+        file_params: Parameters from a user-provided file.
+
+    Returns:
+        ValidatedBase for use with validate_overlay().
+    """
+    params = merge_params(schema, preset_params=preset_params, file_params=file_params)
+    checkers = _get_property_checkers(schema)
+    errors: dict[str, list[tuple[str, str]]] = {}
+    if checkers is not None:
+        for name, check in checkers.items():
+            if name in params:
+                prop_errors = check({name: params[name]})
+                if prop_errors:
+                    errors[name] = prop_errors
+    return ValidatedBase(schema, params, errors, checkers)
+
+
+def validate_overlay(base: ValidatedBase, overrides: dict[str, Any] | None = None) -> None:
+    """
+    Validate a base with overrides layered on top.
+
+    Equivalent to ``validate_params(base.schema, {**base.params,
+    **overrides})``, including the order and wording of errors, but only
+    overridden properties are checked again. Required properties are
+    checked against the merged keys. Schemas with other root-level
+    constraints are validated in full.
+
+    Args:
+        base: Result of prepare_validated_base().
+        overrides: Parameters layered over the base (e.g. --set values).
+
+    Raises:
+        SchemaValidationError: If the merged parameters are invalid.
+    """
+    overrides = overrides or {}
+    if base.property_checkers is None:
+        validate_params(base.schema, {**base.params, **overrides})
+        return
+
+    errors: list[tuple[str, str]] = []
+    for keyword in base.schema:
+        if keyword == "properties":
+            for name, check in base.property_checkers.items():
+                if name in overrides:
+                    errors.extend(check({name: overrides[name]}))
+                elif name in base.property_errors:
+                    errors.extend(base.property_errors[name])
+        elif keyword == "required":
+            errors.extend(
+                ("root", f"{name!r} is a required property")
+                for name in base.schema["required"]
+                if name not in overrides and name not in base.params
+            )
+
+    if errors:
+        _raise_validation_errors(errors)
+
+
+def _get_property_checkers(schema: dict[str, Any]) -> dict[str, ParamChecker] | None:
+    """Get per-property checkers for a schema, or None if unsupported."""
+    return _lookup_schema_entry(schema, _property_checkers, _build_property_checkers)
+
+
+def _build_property_checkers(schema: dict[str, Any]) -> dict[str, ParamChecker] | None:
+    properties = schema.get("properties", {})
+    if (
+        not set(schema) <= _OVERLAY_ROOT_KEYWORDS
+        or schema.get("type", "object") != "object"
+        or not isinstance(properties, dict)
+        or not isinstance(schema.get("required", []), list)
+    ):
+        return None
+    # Single-property schemas yield the same paths and messages as the
+    # full schema does for that property.
+    return {
+        name: get_param_checker({"properties": {name: subschema}})
+        for name, subschema in properties.items()
+    }
+
+
+def parse_template(template_text: str) -> nodes.Template:
+    """
+    Parse a Jinja2 template into its AST.
 
     Args:
         template_text: Jinja2 template content.
 
     Returns:
-        Set of variable names referenced in the template.
+        The template's root node.
+
+    Raises:
+        TemplateError: If the template has a syntax error.
     """
     env = Environment()
     try:
-        ast = env.parse(template_text)
-        return meta.find_undeclared_variables(ast)
+        return env.parse(template_text)
     except TemplateSyntaxError as e:
         raise TemplateError(f"Template syntax error: {e}") from e
 
 
+def get_template_variables(template_text: str) -> set[str]:
+    """
+    Extract all variable names used in a Jinja2 template.
+
+    Args:
+        template_text: Jinja2 template content.
+
+    Returns:
+        Set of variable names referenced in the template.
+
+    Raises:
+        TemplateError: If the template has a syntax error.
+    """
+    return meta.find_undeclared_variables(parse_template(template_text))
+
+
 def get_schema_variables(schema: dict[str, Any]) -> set[str]:
     """
     Get all variable names defined in a schema.
@@ -360,13 +750,302 @@ def get_schema_variables(schema: dict[str, Any]) -> set[str]:
     return set(schema.get("properties", {}).keys())
 
 
-def render(template_text: str, params: dict[str, Any]) -> str:
+def get_compiled_template(template_text: str, template_name: str | None = None) -> Template:
+    """
+    Get a compiled template, reusing a cached compilation when available.
+
+    Args:
+        template_text: Jinja2 template content.
+        template_name: Optional template name, used in the cache key and
+            in error messages.
+
+    Returns:
+        Compiled Jinja2 template bound to the shared environment.
+
+    Raises:
+        TemplateSyntaxError: If the template cannot be compiled.
+    """
+    source_hash = compute_hash(template_text)
+    return _template_cache.get_or_compile(
+        (template_name, source_hash),
+        lambda: _compile_template(_env, template_text, template_name, source_hash),
+    )
+
+
+async def get_compiled_template_async(
+    template_text: str,
+    template_name: str | None = None,
+) -> Template:
+    """
+    Get a compiled async-enabled template without blocking the event loop.
+
+    Cache hits return immediately; misses compile in a worker thread.
+
+    Args:
+        template_text: Jinja2 template content.
+        template_name: Optional template name, used in the cache key and
+            in error messages.
+
+    Returns:
+        Compiled Jinja2 template bound to the shared async environment.
+
+    Raises:
+        TemplateSyntaxError: If the template cannot be compiled.
+    """
+    source_hash = compute_hash(template_text)
+    key = (template_name, source_hash)
+    template = _async_template_cache.get(key)
+    if template is None:
+        template = await asyncio.to_thread(
+            _compile_template, _async_env, template_text, template_name, source_hash
+        )
+        _async_template_cache.put(key, template)
+    return template
+
+
+def _load_precompiled(template_name: str, source_hash: str) -> Template | None:
+    """Load a template shipped precompiled with the package, if still current."""
+    try:
+        module = importlib.import_module(
+            f"{PRECOMPILED_PACKAGE}.{module_name(template_name)}"
+        )
+    except ImportError:
+        return None
+
+    if (
+        getattr(module, "SOURCE_HASH", None) != source_hash
+        or getattr(module, "JINJA2_VERSION", None) != jinja2.__version__
+    ):
+        return None
+
+    return _env.template_class.from_module_dict(
+        _env, module.__dict__, _env.make_globals(None)
+    )
+
+
+def _compile_template(
+    env: Environment,
+    template_text: str,
+    template_name: str | None,
+    source_hash: str,
+) -> Template:
+    """
+    Compile template source against one of the shared environments.
+
+    Named templates are loaded from the precompiled package when its
+    embedded source hash matches, then from the persistent bytecode cache
+    when it is enabled, and only compiled from source as a last resort.
+    Precompiled modules only exist for the synchronous environment.
+    """
+    if template_name is not None and env is _env:
+        template = _load_precompiled(template_name, source_hash)
+        if template is not None:
+            return template
+
+    if not _bytecode_cache_configured:
+        configure_bytecode_cache()
+
+    bcc = env.bytecode_cache
+    bucket = None
+    code = None
+    if bcc is not None and template_name is not None:
+        # The bucket key covers the filename slot, which keeps sync and
+        # async bytecode for the same template apart.
+        variant = "async" if env.is_async else None
+        bucket = bcc.get_bucket(env, template_name, variant, template_text)
+        code = bucket.code
+
+    if code is None:
+        code = env.compile(template_text, name=template_name)
+        if bucket is not None:
+            bucket.code = code
+            try:
+                bcc.set_bucket(bucket)
+            except OSError:
+                pass  # The cache is best-effort; never fail a render over it
+
+    return env.template_class.from_code(env, code, env.make_globals(None))
+
+
+def get_bytecode_cache_dir() -> Path:
+    """
+    Get the directory used for the persistent bytecode cache.
+
+    The Jinja2 version is part of the path so upgrading Jinja2 never loads
+    bytecode produced by another release. Within a directory, entries are
+    invalidated by a checksum of the template source.
+    """
+    return get_cache_dir() / "bytecode" / f"jinja2-{jinja2.__version__}"
+
+
+def configure_bytecode_cache(
+    enabled: bool | None = None,
+    directory: str | Path | None = None,
+) -> Path | None:
+    """
+    Enable or disable the persistent Jinja2 bytecode cache.
+
+    Args:
+        enabled: Whether to use the cache. Defaults to the
+            PK_BYTECODE_CACHE environment variable (enabled unless falsy).
+        directory: Cache directory. Defaults to get_bytecode_cache_dir().
+
+    Returns:
+        The cache directory in use, or None if the cache is disabled or
+        the directory cannot be created.
+    """
+    global _bytecode_cache_configured
+    _bytecode_cache_configured = True
+
+    if enabled is None:
+        enabled = env_flag(BYTECODE_CACHE_ENV)
+
+    _env.bytecode_cache = _async_env.bytecode_cache = None
+    if not enabled:
+        return None
+
+    cache_dir = Path(directory) if directory is not None else get_bytecode_cache_dir()
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+    except OSError:
+        return None
+
+    bcc = FileSystemBytecodeCache(str(cache_dir), "%s.cache")
+    _env.bytecode_cache = _async_env.bytecode_cache = bcc
+    return cache_dir
+
+
+def specializable_keys(schema: dict[str, Any]) -> list[str]:
+    """
+    List schema properties that are good candidates for specialization.
+
+    Args:
+        schema: JSON schema dict.
+
+    Returns:
+        Names of enum and boolean properties, in schema order.
+    """
+    return [
+        name
+        for name, prop in schema.get("properties", {}).items()
+        if "enum" in prop or prop.get("type") == "boolean"
+    ]
+
+
+def get_specialized_template(
+    template_text: str,
+    fixed_params: dict[str, Any],
+    template_name: str | None = None,
+) -> Template:
+    """
+    Get a template variant compiled for fixed parameter values.
+
+    The fixed parameters are baked in as constants: ``{% if %}`` branches
+    that depend only on them are folded away and the surrounding static
+    text is merged. Variants are cached per (template, fixed-param
+    signature). Renders must still pass the full parameter set, and the
+    fixed values must match the ones used to build the variant.
+
+    Args:
+        template_text: Jinja2 template content.
+        fixed_params: Parameter values that are constant for this variant.
+        template_name: Optional template name, used in the cache key and
+            in error messages.
+
+    Returns:
+        Compiled, specialized Jinja2 template.
+
+    Raises:
+        TemplateSyntaxError: If the template cannot be compiled.
+    """
+    if not fixed_params:
+        return get_compiled_template(template_text, template_name)
+
+    signature = tuple(sorted((name, _value_signature(v)) for name, v in fixed_params.items()))
+    key = (template_name, compute_hash(template_text), signature)
+
+    def compile_variant() -> Template:
+        ast = _env.parse(template_text, name=template_name)
+        ast = specialize_ast(_env, ast, fixed_params, template_name)
+        code = _env.compile(ast, name=template_name)
+        return _env.template_class.from_code(_env, code, _env.make_globals(None))
+
+    return _specialized_cache.get_or_compile(key, compile_variant)
+
+
+def _value_signature(value: Any) -> Hashable:
+    """
+    Hashable stand-in for a parameter value that keeps types apart.
+
+    True, 1 and 1.0 are equal (and hash alike) in Python but render
+    differently, so every value is tagged with its type.
+    """
+    if isinstance(value, dict):
+        return ("dict", tuple((k, _value_signature(v)) for k, v in value.items()))
+    if isinstance(value, list | tuple):
+        return (type(value).__name__, tuple(_value_signature(v) for v in value))
+    try:
+        hash(value)
+    except TypeError:
+        return (type(value).__name__, repr(value))
+    return (type(value).__name__, value)
+
+
+def render_specialized(
+    template_text: str,
+    params: dict[str, Any],
+    fixed_keys: Iterable[str],
+    template_name: str | None = None,
+) -> str:
+    """
+    Render using a variant specialized for the values of fixed_keys.
+
+    Args:
+        template_text: Jinja2 template content.
+        params: Parameters to pass to the template.
+        fixed_keys: Parameter names whose current values select (or
+            build) the specialized variant, e.g. specializable_keys(schema).
+        template_name: Optional template name for the cache key.
+
+    Returns:
+        Rendered template as string, identical to render().
+
+    Raises:
+        RenderError: If rendering fails.
+    """
+    fixed = {key: params[key] for key in fixed_keys if key in params}
+    with _render_errors():
+        template = get_specialized_template(template_text, fixed, template_name)
+        return template.render(**params)
+
+
+def template_cache_stats() -> CacheStats:
+    """Return hit/miss/eviction counters for the compiled-template cache."""
+    return _template_cache.stats()
+
+
+def clear_template_cache() -> None:
+    """Drop all compiled templates from the in-memory caches."""
+    _template_cache.clear()
+    _async_template_cache.clear()
+    _specialized_cache.clear()
+
+
+def render(
+    template_text: str,
+    params: dict[str, Any],
+    template_name: str | None = None,
+) -> str:
     """
     Render a Jinja2 template with strict undefined checking.
 
+    Compiled templates are cached by name and content hash, so repeated
+    renders of the same template skip lexing, parsing and compilation.
+
     Args:
         template_text: Jinja2 template content.
         params: Parameters to pass to the template.
+        template_name: Optional template name for the compile cache key.
 
     Returns:
         Rendered template as string.
@@ -374,11 +1053,130 @@ def render(template_text: str, params: dict[str, Any]) -> str:
     Raises:
         RenderError: If rendering fails (undefined variable, syntax error, etc).
     """
-    env = Environment(undefined=StrictUndefined)
+    with _render_errors():
+        template = get_compiled_template(template_text, template_name)
+        return template.render(**params)
 
+
+def render_cached(
+    template_text: str,
+    schema: dict[str, Any],
+    params: dict[str, Any],
+    template_name: str | None = None,
+) -> tuple[str, str]:
+    """
+    Validate and render, memoizing the result by template and params.
+
+    Repeated calls with the same template source and equal resolved params
+    return the cached prompt without re-validating or re-rendering. The key
+    does not include the schema: call invalidate_render_cache() after
+    changing a schema without changing its template.
+
+    Args:
+        template_text: Jinja2 template content.
+        schema: JSON schema for the template.
+        params: Fully resolved parameters (e.g. from merge_params()).
+        template_name: Optional template name for the compile cache key.
+
+    Returns:
+        Tuple of (rendered prompt, prompt_hash).
+
+    Raises:
+        SchemaValidationError: If params fail validation (not cached).
+        RenderError: If rendering fails (not cached).
+    """
+    template_hash = compute_hash(template_text)
     try:
-        template = env.from_string(template_text)
+        params_hash = compute_params_hash(params)
+    except (TypeError, ValueError):
+        params_hash = None  # Not JSON-serializable; render without caching
+
+    if params_hash is not None:
+        cached = _render_cache.get(template_hash, params_hash)
+        if cached is not None:
+            return cached
+
+    validate_params(schema, params)
+    rendered = render(template_text, params, template_name=template_name)
+    prompt_hash = compute_hash(rendered)
+
+    if params_hash is not None:
+        _render_cache.put(template_hash, params_hash, rendered, prompt_hash)
+    return rendered, prompt_hash
+
+
+def render_cache_stats() -> CacheStats:
+    """Return hit/miss/eviction counters and byte usage for the render cache."""
+    return _render_cache.stats()
+
+
+def invalidate_render_cache(template_text: str | None = None) -> int:
+    """
+    Drop memoized renders.
+
+    Args:
+        template_text: Only drop renders of this template source. Drops
+            everything when None.
+
+    Returns:
+        Number of entries removed.
+    """
+    template_hash = compute_hash(template_text) if template_text is not None else None
+    return _render_cache.invalidate(template_hash)
+
+
+def render_compiled(template: Template, params: dict[str, Any]) -> str:
+    """
+    Render an already compiled template.
+
+    Args:
+        template: Template from get_compiled_template().
+        params: Parameters to pass to the template.
+
+    Returns:
+        Rendered template as string.
+
+    Raises:
+        RenderError: If rendering fails.
+    """
+    with _render_errors():
         return template.render(**params)
+
+
+def render_stream(
+    template_text: str,
+    params: dict[str, Any],
+    template_name: str | None = None,
+) -> Iterator[str]:
+    """
+    Render a Jinja2 template incrementally.
+
+    Yields output chunks as the template produces them, so callers can
+    write large prompts to files or sockets without holding the full text
+    in memory.
+
+    Args:
+        template_text: Jinja2 template content.
+        params: Parameters to pass to the template.
+        template_name: Optional template name for the compile cache key.
+
+    Yields:
+        Successive chunks of rendered text.
+
+    Raises:
+        RenderError: If rendering fails. Errors surface while iterating,
+            possibly after some chunks have already been yielded.
+    """
+    with _render_errors():
+        template = get_compiled_template(template_text, template_name)
+        yield from template.generate(**params)
+
+
+@contextmanager
+def _render_errors() -> Iterator[None]:
+    """Translate Jinja2 failures into RenderError."""
+    try:
+        yield
     except UndefinedError as e:
         raise RenderError(f"Undefined variable in template: {e}") from e
     except TemplateSyntaxError as e:
@@ -387,17 +1185,190 @@ def render(template_text: str, params: dict[str, Any]) -> str:
         raise RenderError(f"Rendering failed: {e}") from e
 
 
-def compute_hash(text: str) -> str:
+def write_stream(chunks: Iterable[str], *sinks: IO[str]) -> str:
     """
-    Compute SHA256 hash of text.
+    Write rendered chunks to every sink while hashing them.
 
     Args:
-        text: Text to hash.
+        chunks: Text chunks, e.g. from render_stream().
+        *sinks: Writable text streams.
 
     Returns:
-        Hex-encoded SHA256 hash.
+        Hex-encoded SHA256 hash of the concatenated chunks, identical to
+        compute_hash() of the full text.
     """
-    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+    hasher = hashlib.sha256()
+    for chunk in chunks:
+        hasher.update(chunk.encode("utf-8"))
+        for sink in sinks:
+            sink.write(chunk)
+    return hasher.hexdigest()
+
+
+async def render_async(
+    template_text: str,
+    params: dict[str, Any],
+    template_name: str | None = None,
+) -> str:
+    """
+    Render a Jinja2 template from a coroutine.
+
+    Uses Jinja2's async rendering and compiles on a worker thread on cache
+    misses, so many renders can share one event loop.
+
+    Args:
+        template_text: Jinja2 template content.
+        params: Parameters to pass to the template.
+        template_name: Optional template name for the compile cache key.
+
+    Returns:
+        Rendered template as string.
+
+    Raises:
+        RenderError: If rendering fails (undefined variable, syntax error, etc).
+    """
+    with _render_errors():
+        template = await get_compiled_template_async(template_text, template_name)
+        return await template.render_async(**params)
+
+
+async def render_stream_async(
+    template_text: str,
+    params: dict[str, Any],
+    template_name: str | None = None,
+) -> AsyncIterator[str]:
+    """
+    Render a Jinja2 template incrementally from a coroutine.
+
+    The async counterpart of render_stream().
+
+    Args:
+        template_text: Jinja2 template content.
+        params: Parameters to pass to the template.
+        template_name: Optional template name for the compile cache key.
+
+    Yields:
+        Successive chunks of rendered text.
+
+    Raises:
+        RenderError: If rendering fails.
+    """
+    with _render_errors():
+        template = await get_compiled_template_async(template_text, template_name)
+        async for chunk in template.generate_async(**params):
+            yield chunk
+
+
+async def load_template_async(template_name: str) -> str:
+    """Load template.md without blocking the event loop. See load_template()."""
+    return await asyncio.to_thread(load_template, template_name)
+
+
+async def load_schema_async(template_name: str) -> dict[str, Any]:
+    """Load schema.json without blocking the event loop. See load_schema()."""
+    return await asyncio.to_thread(load_schema, template_name)
+
+
+async def load_preset_async(template_name: str, preset_name: str) -> dict[str, Any]:
+    """Load a preset without blocking the event loop. See load_preset()."""
+    return await asyncio.to_thread(load_preset, template_name, preset_name)
+
+
+async def load_params_file_async(path: str | Path) -> dict[str, Any]:
+    """Load a params file without blocking the event loop. See load_params_file()."""
+    return await asyncio.to_thread(load_params_file, path)
+
+
+class RunPacketWriter:
+    """
+    Incrementally write a run packet while the prompt is streamed.
+
+    The writer is a text sink for write_stream(); call finish() with the
+    resulting prompt hash to write params.resolved.json and meta.json.
+    Used as a context manager, the packet directory is removed if the
+    block raises before finish().
+    """
+
+    def __init__(
+        self,
+        run_dir: str | Path,
+        template_name: str,
+        resolved_params: dict[str, Any],
+        template_version: str = "0.1.0",
+    ):
+        self.template_name = template_name
+        self.resolved_params = resolved_params
+        self.template_version = template_version
+
+        run_dir = Path(run_dir)
+        run_dir.mkdir(parents=True, exist_ok=True)
+
+        # Create timestamped subdirectory
+        timestamp = datetime.now(UTC).strftime("%Y%m%d_%H%M%S")
+        self.packet_dir = run_dir / f"{timestamp}_{template_name}"
+        self.packet_dir.mkdir(parents=True, exist_ok=True)
+
+        self._prompt_file: IO[str] | None = open(
+            self.packet_dir / "prompt.md", "w", encoding="utf-8"
+        )
+
+    def write(self, chunk: str) -> int:
+        """Append a chunk of the rendered prompt."""
+        return self._prompt_file.write(chunk)
+
+    def finish(self, prompt_hash: str) -> Path:
+        """
+        Close the prompt file and write the packet metadata.
+
+        Args:
+            prompt_hash: SHA256 of the complete rendered prompt.
+
+        Returns:
+            Path to the run packet directory.
+        """
+        self._close()
+
+        # Write resolved params
+        params_file = self.packet_dir / "params.resolved.json"
+        params_file.write_text(
+            json.dumps(self.resolved_params, indent=2, sort_keys=True),
+            encoding="utf-8"
+        )
+
+        # Write metadata
+        meta = {
+            "template": self.template_name,
+            "version": self.template_version,
+            "prompt_hash": prompt_hash,
+            "timestamp": datetime.now(UTC).isoformat(),
+            "params_hash": compute_params_hash(self.resolved_params),
+        }
+        meta_file = self.packet_dir / "meta.json"
+        meta_file.write_text(
+            json.dumps(meta, indent=2, sort_keys=True),
+            encoding="utf-8"
+        )
+
+        return self.packet_dir
+
+    def abort(self) -> None:
+        """Discard a partially written packet."""
+        self._close()
+        shutil.rmtree(self.packet_dir, ignore_errors=True)
+
+    def _close(self) -> None:
+        if self._prompt_file is not None:
+            self._prompt_file.close()
+            self._prompt_file = None
+
+    def __enter__(self) -> RunPacketWriter:
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is not None:
+            self.abort()
+        else:
+            self._close()
 
 
 def emit_run_packet(
@@ -426,40 +1397,9 @@ def emit_run_packet(
     Returns:
         Path to the created run packet directory.
     """
-    run_dir = Path(run_dir)
-    run_dir.mkdir(parents=True, exist_ok=True)
-
-    # Create timestamped subdirectory
-    timestamp = datetime.now(UTC).strftime("%Y%m%d_%H%M%S")
-    packet_dir = run_dir / f"{timestamp}_{template_name}"
-    packet_dir.mkdir(parents=True, exist_ok=True)
-
-    # Write rendered prompt
-    prompt_file = packet_dir / "prompt.md"
-    prompt_file.write_text(rendered_prompt, encoding="utf-8")
-
-    # Write resolved params
-    params_file = packet_dir / "params.resolved.json"
-    params_file.write_text(
-        json.dumps(resolved_params, indent=2, sort_keys=True),
-        encoding="utf-8"
-    )
-
-    # Write metadata
-    meta = {
-        "template": template_name,
-        "version": template_version,
-        "prompt_hash": compute_hash(rendered_prompt),
-        "timestamp": datetime.now(UTC).isoformat(),
-        "params_hash": compute_hash(json.dumps(resolved_params, sort_keys=True)),
-    }
-    meta_file = packet_dir / "meta.json"
-    meta_file.write_text(
-        json.dumps(meta, indent=2, sort_keys=True),
-        encoding="utf-8"
-    )
-
-    return packet_dir
+    with RunPacketWriter(run_dir, template_name, resolved_params, template_version) as packet:
+        prompt_hash = write_stream([rendered_prompt], packet)
+        return packet.finish(prompt_hash)
 
 
 def parse_cli_override(override: str) -> tuple[str, Any]:
@@ -0,0 +1,211 @@
+"""
+Code generation of parameter checkers from JSON schemas.
+
+Template schemas only use a small, flat subset of JSON Schema. For those
+schemas generate_checker_source() emits a plain Python function that
+performs the same checks as ``Draft7Validator`` with straight-line
+``isinstance`` tests and comparisons, and reports the same paths and
+messages in the same order.
+
+Checkers are generated and compiled in memory; callers cache them per
+schema (see pk.render.get_param_checker). Schemas using anything outside
+the supported subset are rejected with UnsupportedSchemaError and callers
+fall back to ``Draft7Validator``.
+
+This module must only depend on the standard library.
+"""
+
+from __future__ import annotations
+
+import math
+import numbers
+from collections.abc import Callable
+from typing import Any
+
+ParamChecker = Callable[[Any], list[tuple[str, str]]]
+"""Function returning ``(path, message)`` for every schema violation."""
+
+# Keywords that carry no validation semantics.
+_ANNOTATIONS = {"$schema", "$id", "$comment", "title", "description", "default", "examples"}
+
+_KEYWORDS = {"type", "enum", "minimum", "maximum", "items", "properties", "required"}
+
+_TYPE_TESTS = {
+    "string": "isinstance({v}, str)",
+    "integer": (
+        "(isinstance({v}, int) and not isinstance({v}, bool)"
+        " or isinstance({v}, float) and {v}.is_integer())"
+    ),
+    "number": "(isinstance({v}, _Number) and not isinstance({v}, bool))",
+    "boolean": "isinstance({v}, bool)",
+    "array": "isinstance({v}, list)",
+    "object": "isinstance({v}, dict)",
+    "null": "{v} is None",
+}
+
+
+class UnsupportedSchemaError(Exception):
+    """The schema uses keywords the code generator does not handle."""
+
+
+def generate_checker_source(schema: dict[str, Any], func_name: str = "check") -> str:
+    """
+    Generate Python source for a checker function.
+
+    The function takes the parameters to validate and returns a list of
+    ``(path, message)`` tuples, where path is the dotted instance path
+    (``"root"`` for the top level) and message matches
+    ``ValidationError.message`` from ``Draft7Validator``.
+
+    Args:
+        schema: JSON schema dict.
+        func_name: Name of the generated function.
+
+    Returns:
+        Python source defining func_name.
+
+    Raises:
+        UnsupportedSchemaError: If the schema uses unsupported keywords.
+    """
+    gen = _Generator()
+    gen.emit_schema(schema, "params", (), 1)
+    body = gen.lines or ["    pass"]
+    return "\n".join(
+        [
+            f"def {func_name}(params):",
+            "    errors = []",
+            "    append = errors.append",
+            *body,
+            "    return errors",
+            "",
+        ]
+    )
+
+
+def compile_param_checker(schema: dict[str, Any]) -> ParamChecker:
+    """
+    Generate and compile a checker for a schema.
+
+    Args:
+        schema: JSON schema dict.
+
+    Returns:
+        The checker function.
+
+    Raises:
+        UnsupportedSchemaError: If the schema uses unsupported keywords.
+    """
+    namespace: dict[str, Any] = {"_Number": numbers.Number}
+    exec(compile(generate_checker_source(schema), "<pk param checker>", "exec"), namespace)
+    return namespace["check"]
+
+
+class _Generator:
+    """Emit checks for a schema and its subschemas, in keyword order."""
+
+    def __init__(self):
+        self.lines: list[str] = []
+        self.counter = 0
+
+    def line(self, depth: int, text: str) -> None:
+        self.lines.append("    " * depth + text)
+
+    def fail(self, depth: int, path: tuple[str, ...], message: str) -> None:
+        self.line(depth, f"append(({_path_expr(path)}, {message}))")
+
+    def emit_schema(self, schema: Any, v: str, path: tuple[str, ...], depth: int) -> None:
+        if not isinstance(schema, dict):
+            raise UnsupportedSchemaError(f"non-object schema: {schema!r}")
+
+        for keyword, value in schema.items():
+            if keyword in _ANNOTATIONS:
+                continue
+            if keyword not in _KEYWORDS:
+                raise UnsupportedSchemaError(f"unsupported keyword: {keyword!r}")
+            getattr(self, f"emit_{keyword}")(value, v, path, depth)
+
+    def emit_type(self, types: Any, v: str, path: tuple[str, ...], depth: int) -> None:
+        types = [types] if isinstance(types, str) else types
+        if not isinstance(types, list) or not all(t in _TYPE_TESTS for t in types):
+            raise UnsupportedSchemaError(f"unsupported type: {types!r}")
+        test = " or ".join(_TYPE_TESTS[t].format(v=v) for t in types)
+        reprs = ", ".join(repr(t) for t in types)
+        self.line(depth, f"if not ({test}):")
+        self.fail(depth + 1, path, f"repr({v}) + {f' is not of type {reprs}'!r}")
+
+    def emit_enum(self, enums: Any, v: str, path: tuple[str, ...], depth: int) -> None:
+        # Non-string members need jsonschema's bool/int-aware equality.
+        if not isinstance(enums, list) or not all(isinstance(e, str) for e in enums):
+            raise UnsupportedSchemaError(f"unsupported enum: {enums!r}")
+        members = "{" + ", ".join(repr(e) for e in enums) + "}" if enums else "()"
+        self.line(depth, f"if not (isinstance({v}, str) and {v} in {members}):")
+        self.fail(depth + 1, path, f"repr({v}) + {f' is not one of {enums!r}'!r}")
+
+    def emit_minimum(self, minimum: Any, v: str, path: tuple[str, ...], depth: int) -> None:
+        self._emit_bound(minimum, "<", "less than the minimum", v, path, depth)
+
+    def emit_maximum(self, maximum: Any, v: str, path: tuple[str, ...], depth: int) -> None:
+        self._emit_bound(maximum, ">", "greater than the maximum", v, path, depth)
+
+    def _emit_bound(
+        self, bound: Any, op: str, text: str, v: str, path: tuple[str, ...], depth: int
+    ) -> None:
+        if not isinstance(bound, (int, float)) or isinstance(bound, bool) or not math.isfinite(bound):
+            raise UnsupportedSchemaError(f"unsupported bound: {bound!r}")
+        number = _TYPE_TESTS["number"].format(v=v)
+        self.line(depth, f"if {number} and {v} {op} {bound!r}:")
+        self.fail(depth + 1, path, f"repr({v}) + {f' is {text} of {bound!r}'!r}")
+
+    def emit_items(self, items: Any, v: str, path: tuple[str, ...], depth: int) -> None:
+        # Tuple-form items validate positionally; not supported.
+        if not isinstance(items, dict):
+            raise UnsupportedSchemaError(f"unsupported items: {items!r}")
+        self.counter += 1
+        index, item = f"i{self.counter}", f"v{self.counter}"
+        self.line(depth, f"if isinstance({v}, list):")
+        self.line(depth + 1, f"for {index}, {item} in enumerate({v}):")
+        start = len(self.lines)
+        self.emit_schema(items, item, (*path, _Index(index)), depth + 2)
+        if len(self.lines) == start:
+            self.line(depth + 2, "pass")
+
+    def emit_properties(self, properties: Any, v: str, path: tuple[str, ...], depth: int) -> None:
+        if not isinstance(properties, dict):
+            raise UnsupportedSchemaError(f"unsupported properties: {properties!r}")
+        self.line(depth, f"if isinstance({v}, dict):")
+        start = len(self.lines)
+        for name, subschema in properties.items():
+            self.counter += 1
+            value = f"v{self.counter}"
+            self.line(depth + 1, f"if {name!r} in {v}:")
+            self.line(depth + 2, f"{value} = {v}[{name!r}]")
+            self.emit_schema(subschema, value, (*path, name), depth + 2)
+        if len(self.lines) == start:
+            self.line(depth + 1, "pass")
+
+    def emit_required(self, required: Any, v: str, path: tuple[str, ...], depth: int) -> None:
+        if not isinstance(required, list) or not all(isinstance(r, str) for r in required):
+            raise UnsupportedSchemaError(f"unsupported required: {required!r}")
+        if not required:
+            return
+        self.line(depth, f"if isinstance({v}, dict):")
+        for name in required:
+            self.line(depth + 1, f"if {name!r} not in {v}:")
+            self.fail(depth + 2, path, repr(f"{name!r} is a required property"))
+
+
+class _Index(str):
+    """Path part naming a loop variable rather than a property."""
+
+
+def _path_expr(path: tuple[str, ...]) -> str:
+    """Build the expression for a dotted instance path."""
+    if not path:
+        return "'root'"
+    if not any(isinstance(part, _Index) for part in path):
+        return repr(".".join(path))
+    escaped = (
+        f"{{{part}}}" if isinstance(part, _Index) else part.replace("{", "{{").replace("}", "}}")
+        for part in path
+    )
+    return "f" + repr(".".join(escaped))
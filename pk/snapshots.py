@@ -0,0 +1,190 @@
+"""
+Pre-rendered preset snapshots.
+
+Most renders use a shipped preset with no overrides. The wheel build
+renders every (template, preset) pair into
+``pk/_snapshots/<template>/<preset>.json``, recording the prompt, the
+resolved params, their prompt_hash and params_hash, and the hashes of
+the template source, resolved schema and preset file it was built from.
+
+``pk render <template> --preset <name>`` without --params, --set or
+--format serves the snapshot instead of loading, validating and
+rendering, as long as it was built by this promptkit version and the
+template, schema and preset still hash to the recorded values. Set
+``PK_SNAPSHOTS=0`` to always render.
+
+Serving only depends on the standard library; building imports
+pk.render.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import importlib.resources
+import json
+from importlib.resources.abc import Traversable
+from pathlib import Path
+from typing import Any, NamedTuple
+
+from pk import __version__
+from pk.cache import env_flag
+from pk.catalog import _load_shared_schema, get_template_dir, load_schema_file, load_template
+from pk.errors import TemplateError
+from pk.hashing import compute_hash, compute_params_hash, compute_schema_hash
+
+SNAPSHOT_VERSION = 1
+
+# Set to "0"/"false"/"off" to never serve snapshots.
+SNAPSHOTS_ENV = "PK_SNAPSHOTS"
+SNAPSHOTS_DIR = "_snapshots"
+
+_PRESET_SUFFIXES = (".yaml", ".yml")
+
+
+class Snapshot(NamedTuple):
+    """A pre-rendered prompt for one template preset."""
+
+    template: str
+    preset: str
+    prompt: str
+    prompt_hash: str
+    params: dict[str, Any]
+    params_hash: str
+
+
+def get_snapshot_dir() -> Traversable:
+    """Get the directory of snapshots shipped with the package."""
+    return importlib.resources.files("pk").joinpath(SNAPSHOTS_DIR)
+
+
+def load_snapshot(template_name: str, preset_name: str) -> Snapshot | None:
+    """
+    Get the snapshot of a template preset if it is still current.
+
+    Args:
+        template_name: Name of the template.
+        preset_name: Name of the preset.
+
+    Returns:
+        The Snapshot, or None if snapshots are disabled, there is none,
+        or the template, schema or preset changed since it was built.
+    """
+    if not env_flag(SNAPSHOTS_ENV):
+        return None
+    try:
+        # Resolving the template first also rejects names like "../x"
+        template_dir = get_template_dir(template_name)
+        entry_file = get_snapshot_dir().joinpath(template_name, f"{preset_name}.json")
+        entry = json.loads(entry_file.read_text(encoding="utf-8"))
+        if not _is_current(entry, template_name, preset_name, template_dir / "examples"):
+            return None
+        return Snapshot(
+            template_name,
+            preset_name,
+            entry["prompt"],
+            entry["prompt_hash"],
+            entry["params"],
+            entry["params_hash"],
+        )
+    except (TemplateError, OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def build_snapshots(templates_dir: str | Path, out_dir: str | Path) -> list[Path]:
+    """
+    Render every ``<templates_dir>/*/examples/*.yaml`` preset into snapshots.
+
+    Presets that fail to load, validate or render are skipped; rendering
+    them at runtime reports the error as usual.
+
+    Args:
+        templates_dir: Directory containing template directories.
+        out_dir: Directory to write snapshots into. Created if needed.
+
+    Returns:
+        Paths of the written snapshot files.
+    """
+    import yaml
+
+    from pk.render import merge_params, render_stream, validate_params
+    from pk.yaml_cache import load_yaml_file
+
+    templates_dir = Path(templates_dir)
+    out_dir = Path(out_dir)
+    written = []
+    for item in sorted(templates_dir.iterdir()):
+        template_file = item / "template.md"
+        if not item.is_dir() or not template_file.exists():
+            continue
+        try:
+            template_text = template_file.read_text(encoding="utf-8")
+            schema = load_schema_file(item / "schema.json")
+        except TemplateError:
+            continue
+
+        for preset_name, preset_file in _preset_files(item / "examples"):
+            try:
+                preset_params = load_yaml_file(preset_file)
+                params = merge_params(schema, preset_params=preset_params or {})
+                validate_params(schema, params)
+                prompt = "".join(render_stream(template_text, params))
+                entry = {
+                    "version": SNAPSHOT_VERSION,
+                    "pk_version": __version__,
+                    "template": item.name,
+                    "preset": preset_name,
+                    "preset_file": preset_file.name,
+                    "template_hash": compute_hash(template_text),
+                    "schema_hash": compute_schema_hash(schema),
+                    "preset_hash": hashlib.sha256(preset_file.read_bytes()).hexdigest(),
+                    "params": params,
+                    "params_hash": compute_params_hash(params),
+                    "prompt_hash": compute_hash(prompt),
+                    "prompt": prompt,
+                }
+                data = json.dumps(entry, indent=1, sort_keys=True)
+            except (TemplateError, yaml.YAMLError, TypeError, ValueError):
+                continue
+
+            path = out_dir / item.name / f"{preset_name}.json"
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(data, encoding="utf-8")
+            written.append(path)
+    return written
+
+
+def _preset_files(examples_dir: Path) -> list[tuple[str, Path]]:
+    """The file load_preset() reads for each preset, by preset name."""
+    if not examples_dir.is_dir():
+        return []
+    files: dict[str, Path] = {}
+    for suffix in _PRESET_SUFFIXES:
+        for path in sorted(examples_dir.glob(f"*{suffix}")):
+            if path.is_file():
+                files.setdefault(path.stem, path)
+    return sorted(files.items())
+
+
+def _is_current(
+    entry: dict[str, Any], template_name: str, preset_name: str, examples_dir: Any
+) -> bool:
+    """Check a snapshot against this version and the current sources."""
+    if entry["version"] != SNAPSHOT_VERSION or entry["pk_version"] != __version__:
+        return False
+
+    # The preset file load_preset() would read now
+    for suffix in _PRESET_SUFFIXES:
+        preset_file = examples_dir / f"{preset_name}{suffix}"
+        if preset_file.exists():
+            break
+    else:
+        return False
+    if preset_file.name != entry["preset_file"]:
+        return False
+    if hashlib.sha256(preset_file.read_bytes()).hexdigest() != entry["preset_hash"]:
+        return False
+
+    return (
+        compute_hash(load_template(template_name)) == entry["template_hash"]
+        and compute_schema_hash(_load_shared_schema(template_name)) == entry["schema_hash"]
+    )
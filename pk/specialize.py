@@ -0,0 +1,129 @@
+"""
+Template specialization for fixed parameter values.
+
+Given values for parameters that stay constant across many renders (enum
+choices like ``output_format`` or ``depth``, booleans like
+``include_toc``), specialize_ast() rewrites a parsed template so those
+parameters become constants, folds every ``{% if %}`` whose test is now
+constant, and merges the resulting static text. The compiled variant
+only evaluates the slots that still depend on per-render parameters.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+from jinja2 import Environment, nodes
+from jinja2.visitor import NodeTransformer
+
+
+def specialize_ast(
+    env: Environment,
+    ast: nodes.Template,
+    fixed_params: dict[str, Any],
+    template_name: str | None = None,
+) -> nodes.Template:
+    """
+    Specialize a parsed template for fixed parameter values.
+
+    Parameters the template assigns to (``{% set %}``, loop targets,
+    macro arguments) are never substituted, and values without a safe
+    literal representation are ignored, so the result always renders
+    identically to the original for matching parameters.
+
+    Args:
+        env: Environment the template was parsed with.
+        ast: Parsed template; it is modified in place.
+        fixed_params: Parameter values to bake into the template.
+        template_name: Optional template name for the evaluation context.
+
+    Returns:
+        The specialized template AST.
+    """
+    assigned = {
+        node.name for node in ast.find_all(nodes.Name) if node.ctx != "load"
+    }
+    constants = {}
+    for name, value in fixed_params.items():
+        if name in assigned:
+            continue
+        try:
+            nodes.Const.from_untrusted(value, environment=env)
+        except nodes.Impossible:
+            continue
+        constants[name] = value
+
+    ast = _Specializer(env, template_name, constants).visit(ast)
+    _merge_output(ast)
+    return ast
+
+
+class _Specializer(NodeTransformer):
+    """Substitute constants for fixed names and fold constant branches."""
+
+    def __init__(self, env: Environment, name: str | None, constants: dict[str, Any]):
+        self.constants = constants
+        self.eval_ctx = nodes.EvalContext(env, name)
+
+    def visit_Name(self, node: nodes.Name) -> nodes.Node:
+        if node.ctx == "load" and node.name in self.constants:
+            return nodes.Const(self.constants[node.name], lineno=node.lineno)
+        return node
+
+    def visit_If(self, node: nodes.If) -> nodes.Node | list[nodes.Node]:
+        # Visit branch contents by hand: generic_visit would route each
+        # elif through visit_If, which may replace it with a list.
+        branches = [(node.test, node.body)] + [(e.test, e.body) for e in node.elif_]
+        kept: list[tuple[nodes.Expr, list[nodes.Node]]] = []
+        else_ = None
+
+        for test, body in branches:
+            test = self.visit(test)
+            try:
+                value = test.as_const(self.eval_ctx)
+            except nodes.Impossible:
+                kept.append((test, self.visit_list(body)))
+                continue
+            if value:
+                # Always taken: later branches are unreachable
+                else_ = self.visit_list(body)
+                break
+            # Never taken: drop the branch
+        else:
+            else_ = self.visit_list(node.else_)
+
+        if not kept:
+            return else_
+        first_test, first_body = kept[0]
+        elifs = [nodes.If(t, b, [], [], lineno=t.lineno) for t, b in kept[1:]]
+        return nodes.If(first_test, first_body, elifs, else_, lineno=node.lineno)
+
+    def visit_list(self, body: list[nodes.Node]) -> list[nodes.Node]:
+        result: list[nodes.Node] = []
+        for child in body:
+            visited = self.visit(child)
+            if isinstance(visited, list):
+                result.extend(visited)
+            elif visited is not None:
+                result.append(visited)
+        return result
+
+
+def _merge_output(ast: nodes.Template) -> None:
+    """Merge runs of adjacent Output statements left behind by folding."""
+    for node in [ast, *ast.find_all(nodes.Node)]:
+        for field in node.fields:
+            value = getattr(node, field)
+            if not isinstance(value, list) or not any(
+                isinstance(child, nodes.Output) for child in value
+            ):
+                continue
+            merged: list[nodes.Node] = []
+            for child in value:
+                if isinstance(child, nodes.Output) and merged and isinstance(merged[-1], nodes.Output):
+                    merged[-1] = nodes.Output(
+                        merged[-1].nodes + child.nodes, lineno=merged[-1].lineno
+                    )
+                else:
+                    merged.append(child)
+            setattr(node, field, merged)
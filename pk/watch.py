@@ -0,0 +1,324 @@
+"""
+Watch mode for pk doctor.
+
+``pk doctor --watch`` validates every template once, then polls the
+template search path and re-checks templates as they are edited, in the
+same process so the schema, YAML and compiled-template caches stay warm.
+With several jobs, one worker pool is kept for the whole session, so the
+workers' caches stay warm too.
+
+Each poll compares (mtime_ns, size) stamps of every file under the
+directory roots (bundles cannot change while open and are not watched).
+When something changed, the input hashes of the affected templates (see
+pk.doctor.get_input_hashes) are compared with the previous cycle's and
+only the checks reading a changed input run again. A file outside any
+template directory may be a $ref target, so it makes every template's
+inputs be re-hashed; only those whose resolved schema changed re-run.
+"""
+
+from __future__ import annotations
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from pk.catalog import get_template_roots, list_templates
+from pk.doctor import (
+    CHECKS,
+    DoctorReport,
+    ValidationResult,
+    checks_reading,
+    get_input_hashes,
+    run_checks,
+)
+from pk.errors import TemplateNotFoundError
+
+DEFAULT_INTERVAL = 0.5
+
+_SKIP_DIRS = {"__pycache__"}
+
+
+@dataclass
+class StatusChange:
+    """A check result that appeared, disappeared or changed pass/fail."""
+
+    before: ValidationResult | None
+    after: ValidationResult | None
+
+
+@dataclass
+class WatchCycle:
+    """What one poll found and re-ran."""
+
+    changed: list[str]
+    units: list[tuple[str, str]]
+    changes: list[StatusChange]
+    report: DoctorReport
+    seconds: float
+    timestamp: float = field(default_factory=time.time)
+
+    def format_cycle(self) -> str:
+        """Format the cycle as a short human-readable summary."""
+        when = time.strftime("%H:%M:%S", time.localtime(self.timestamp))
+        shown = ", ".join(self.changed[:3])
+        if len(self.changed) > 3:
+            shown += f" and {len(self.changed) - 3} more"
+        lines = [f"[{when}] changed: {shown}"]
+
+        templates = sorted({name for name, _ in self.units})
+        if templates:
+            count = len(self.units)
+            lines.append(
+                f"  re-ran {count} check{'' if count == 1 else 's'} for "
+                f"{', '.join(templates)} in {self.seconds * 1000:.0f} ms"
+            )
+        else:
+            lines.append("  no checks affected")
+
+        for change in self.changes:
+            lines.append(f"  {_format_change(change)}")
+        if templates and not self.changes:
+            lines.append("  no pass/fail changes")
+
+        report = self.report
+        lines.append(f"  now: {report.passed_count} passed, {report.failed_count} failed")
+        return "\n".join(lines)
+
+
+class DoctorWatcher:
+    """
+    Keeps the doctor results of a set of templates up to date.
+
+    Call start() once, then poll() periodically, and close() when done
+    (or use the watcher as a context manager).
+
+    Args:
+        template_names: Templates to watch, or None for all of them
+            (including ones added later).
+        jobs: Number of worker processes (see pk.doctor.run_checks).
+        use_cache: Use the doctor result cache.
+    """
+
+    def __init__(
+        self,
+        template_names: list[str] | None = None,
+        jobs: int | None = 1,
+        use_cache: bool = True,
+    ):
+        self.template_names = template_names
+        self.jobs = jobs
+        self.use_cache = use_cache
+        self._stamps: dict[str, tuple[int, int]] = {}
+        self._hashes: dict[str, dict[str, str]] = {}
+        # Results of each (template, check), in report order
+        self._results: dict[tuple[str, str], list[ValidationResult]] = {}
+        self._executor: ProcessPoolExecutor | None = None
+
+    def start(self) -> DoctorReport:
+        """
+        Validate every watched template.
+
+        Returns:
+            The full report.
+        """
+        self._stamps = _scan_roots()
+        units = []
+        for name in self._watched_templates():
+            self._hashes[name] = get_input_hashes(name)
+            units.extend((name, check) for check in CHECKS)
+        self._run(units)
+        return self.report
+
+    def poll(self) -> WatchCycle | None:
+        """
+        Re-check templates affected by changes since the last call.
+
+        Returns:
+            The cycle, or None if no file changed.
+        """
+        stamps = _scan_roots()
+        changed = sorted(
+            path for path in stamps.keys() | self._stamps.keys()
+            if stamps.get(path) != self._stamps.get(path)
+        )
+        if not changed:
+            return None
+        self._stamps = stamps
+
+        started = time.perf_counter()
+        before = dict(self._results)
+        units = self._affected_units(changed)
+        self._run(units)
+        after = self._results
+
+        changes = []
+        for key in [*before, *(key for key in after if key not in before)]:
+            changes.extend(_diff(before.get(key, []), after.get(key, [])))
+        return WatchCycle(
+            changed=[_display_path(path) for path in changed],
+            units=units,
+            changes=changes,
+            report=self.report,
+            seconds=time.perf_counter() - started,
+        )
+
+    @property
+    def report(self) -> DoctorReport:
+        """The current results of every watched template."""
+        report = DoctorReport()
+        for unit_results in self._results.values():
+            for result in unit_results:
+                report.add(result)
+        return report
+
+    def _watched_templates(self) -> list[str]:
+        names = [t["name"] for t in list_templates()]
+        if self.template_names is None:
+            return names
+        return [name for name in names if name in self.template_names]
+
+    def _affected_units(self, changed: list[str]) -> list[tuple[str, str]]:
+        """Update the input hashes and find the checks that must run again."""
+        names = self._watched_templates()
+        for name in set(self._hashes) - set(names):
+            self._forget(name)
+
+        # Files inside a template directory only affect that template
+        touched: set[str] = set()
+        for path in changed:
+            owner = _owning_template(path)
+            if owner is None:
+                touched = set(names)
+                break
+            touched.add(owner)
+
+        units = []
+        for name in names:
+            if name not in touched and name in self._hashes:
+                continue
+            try:
+                hashes = get_input_hashes(name)
+            except TemplateNotFoundError:
+                self._forget(name)
+                continue
+            old = self._hashes.get(name, {})
+            self._hashes[name] = hashes
+            inputs = [key for key, value in hashes.items() if old.get(key) != value]
+            units.extend((name, check) for check in checks_reading(inputs))
+        return units
+
+    def _run(self, units: list[tuple[str, str]]) -> None:
+        """Run units and merge their results, keeping report order."""
+        if not units:
+            return
+        if self.jobs != 1 and self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.jobs)
+        results = run_checks(
+            units, self.jobs, use_cache=self.use_cache, executor=self._executor
+        )
+        for unit, unit_results in zip(units, results, strict=True):
+            self._results[unit] = unit_results or []
+        order = {name: i for i, name in enumerate(self._watched_templates())}
+        checks = {check: i for i, check in enumerate(CHECKS)}
+        self._results = dict(sorted(
+            self._results.items(),
+            key=lambda item: (order.get(item[0][0], len(order)), checks[item[0][1]]),
+        ))
+
+    def close(self) -> None:
+        """Shut down the worker processes, if any."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+    def __enter__(self) -> DoctorWatcher:
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def _forget(self, template_name: str) -> None:
+        self._hashes.pop(template_name, None)
+        for key in [key for key in self._results if key[0] == template_name]:
+            del self._results[key]
+
+
+def _scan_roots() -> dict[str, tuple[int, int]]:
+    """Stamp every file under the directory roots of the search path."""
+    stamps: dict[str, tuple[int, int]] = {}
+    for root in get_template_roots():
+        if isinstance(root.path, Path) and root.path.is_dir():
+            _scan_dir(str(root.path), stamps)
+    return stamps
+
+
+def _scan_dir(directory: str, stamps: dict[str, tuple[int, int]]) -> None:
+    try:
+        entries = list(os.scandir(directory))
+    except OSError:
+        return
+    for entry in entries:
+        if entry.name.startswith(".") or entry.name in _SKIP_DIRS:
+            continue
+        try:
+            if entry.is_dir():
+                _scan_dir(entry.path, stamps)
+            else:
+                st = entry.stat()
+                stamps[entry.path] = (st.st_mtime_ns, st.st_size)
+        except OSError:
+            continue
+
+
+def _owning_template(path: str) -> str | None:
+    """The template whose directory holds path, if any."""
+    for root in get_template_roots():
+        if not isinstance(root.path, Path):
+            continue
+        try:
+            parts = Path(path).relative_to(root.path).parts
+        except ValueError:
+            continue
+        if len(parts) > 1 and (root.path / parts[0] / "template.md").exists():
+            return parts[0]
+        return None
+    return None
+
+
+def _display_path(path: str) -> str:
+    """Show path relative to its root."""
+    for root in get_template_roots():
+        if isinstance(root.path, Path):
+            try:
+                return Path(path).relative_to(root.path).as_posix()
+            except ValueError:
+                continue
+    return path
+
+
+def _diff(
+    before: list[ValidationResult], after: list[ValidationResult]
+) -> list[StatusChange]:
+    """Results of one unit that appeared, disappeared or flipped."""
+    old = {r.check: r for r in before}
+    new = {r.check: r for r in after}
+    changes = []
+    for check in [*old, *(check for check in new if check not in old)]:
+        a, b = old.get(check), new.get(check)
+        if a is None or b is None or a.passed != b.passed:
+            changes.append(StatusChange(a, b))
+    return changes
+
+
+def _format_change(change: StatusChange) -> str:
+    if change.after is None:
+        before = change.before
+        return f"- {before.template} {before.check}: removed"
+    after = change.after
+    status = "✓" if after.passed else "✗"
+    line = f"{status} {after.template} {after.check}: {after.message}"
+    if change.before is None:
+        return f"+ {line}"
+    return f"{line} (was {'✓' if change.before.passed else '✗'})"
@@ -0,0 +1,173 @@
+"""
+Parsed-YAML cache for presets and params files.
+
+Pure-Python YAML parsing is one of the slowest steps of a render, and
+the doctor loads each preset several times. Files are parsed once with
+libyaml's CSafeLoader when PyYAML was built with it (falling back to
+SafeLoader, which gives identical results; invalid files are parsed again
+with SafeLoader for its more helpful error messages), and the result is
+kept:
+
+- in memory, keyed by path and (mtime_ns, size)
+- on disk as JSON under ``<cache dir>/yaml``, with the same key, so
+  later processes skip parsing too
+
+Files modified within RACY_NS of now are not cached (they could change
+again within the same timestamp tick), and documents that do not survive
+a JSON round trip unchanged (dates, non-string keys, ...) are only
+cached in memory. Callers always get a private copy.
+"""
+
+from __future__ import annotations
+
+import copy
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+import yaml
+
+from pk.bundle import BundlePath
+from pk.cache import get_cache_dir
+from pk.fsutil import atomic_writer
+from pk.manifest import RACY_NS
+
+YAML_CACHE_VERSION = 1
+
+YAML_LOADER: type[yaml.SafeLoader] = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+_MISSING = object()
+
+# Parsed documents by absolute path: (stamp, data, json_safe)
+_parsed: dict[str, tuple[tuple[int, int], Any, bool]] = {}
+_lock = threading.Lock()
+
+
+def load_yaml_file(path: Path | BundlePath) -> Any:
+    """
+    Parse a YAML file, reusing an earlier parse if the file is unchanged.
+
+    Args:
+        path: File to parse.
+
+    Returns:
+        The parsed document (a private copy the caller may mutate).
+
+    Raises:
+        OSError: If the file cannot be read (FileNotFoundError if it does
+            not exist).
+        yaml.YAMLError: If the file is not valid YAML.
+    """
+    key = str(path) if isinstance(path, BundlePath) else os.path.abspath(path)
+    st = path.stat()
+    stamp = (st.st_mtime_ns, st.st_size)
+
+    with _lock:
+        cached = _parsed.get(key)
+    if cached is not None and cached[0] == stamp:
+        return _copy(cached[1], cached[2])
+
+    trusted = time.time_ns() - st.st_mtime_ns > RACY_NS
+    data = _read_disk(key, stamp) if trusted else _MISSING
+    json_safe = True
+    if data is _MISSING:
+        data = _parse(path.read_text(encoding="utf-8"))
+        json_safe = _is_json_safe(data)
+        if trusted and json_safe:
+            _write_disk(key, stamp, data)
+
+    if trusted:
+        with _lock:
+            _parsed[key] = (stamp, data, json_safe)
+    return _copy(data, json_safe)
+
+
+def _parse(text: str) -> Any:
+    try:
+        return yaml.load(text, Loader=YAML_LOADER)
+    except yaml.YAMLError:
+        if YAML_LOADER is yaml.SafeLoader:
+            raise
+    # libyaml's errors lack the source snippet and caret; report SafeLoader's
+    return yaml.load(text, Loader=yaml.SafeLoader)
+
+
+def clear_yaml_cache() -> None:
+    """Forget documents parsed in this process (the disk copies are kept)."""
+    with _lock:
+        _parsed.clear()
+
+
+def get_yaml_cache_path(key: str) -> Path:
+    """Get the disk cache file for an absolute source path."""
+    digest = hashlib.sha256(key.encode("utf-8")).hexdigest()
+    return get_cache_dir() / "yaml" / f"{digest[:32]}.json"
+
+
+def _read_disk(key: str, stamp: tuple[int, int]) -> Any:
+    """Load a cached parse, or return _MISSING if absent or out of date."""
+    try:
+        entry = json.loads(get_yaml_cache_path(key).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return _MISSING
+    if (
+        not isinstance(entry, dict)
+        or entry.get("version") != YAML_CACHE_VERSION
+        or entry.get("pyyaml") != yaml.__version__
+        or entry.get("path") != key
+        or entry.get("stamp") != list(stamp)
+    ):
+        return _MISSING
+    return entry.get("data")
+
+
+def _write_disk(key: str, stamp: tuple[int, int], data: Any) -> None:
+    """Persist a parse; failures are ignored."""
+    try:
+        with atomic_writer(get_yaml_cache_path(key)) as f:
+            json.dump({
+                "version": YAML_CACHE_VERSION,
+                "pyyaml": yaml.__version__,
+                "path": key,
+                "stamp": list(stamp),
+                "data": data,
+            }, f)
+    except OSError:
+        pass
+
+
+def _is_json_safe(data: Any) -> bool:
+    """Check that JSON stores the document exactly, types included."""
+    try:
+        return _json_types_equal(json.loads(json.dumps(data)), data)
+    except (TypeError, ValueError):
+        return False
+
+
+def _json_types_equal(restored: Any, original: Any) -> bool:
+    # == alone treats True == 1 == 1.0 and cannot see tuples becoming lists
+    if type(restored) is not type(original):
+        return False
+    if isinstance(original, dict):
+        return list(restored) == list(original) and all(
+            _json_types_equal(restored[k], v) for k, v in original.items()
+        )
+    if isinstance(original, list):
+        return len(restored) == len(original) and all(
+            _json_types_equal(r, o) for r, o in zip(restored, original, strict=True)
+        )
+    return restored == original
+
+
+def _copy(data: Any, json_safe: bool) -> Any:
+    if not json_safe:
+        return copy.deepcopy(data)
+    if isinstance(data, dict):
+        return {key: _copy(value, True) for key, value in data.items()}
+    if isinstance(data, list):
+        return [_copy(item, True) for item in data]
+    return data
@@ -0,0 +1,81 @@
+"""Shared pytest configuration."""
+
+import json
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+import pytest
+
+# Keep persistent caches out of the user's real cache directory.
+os.environ.setdefault("PK_CACHE_DIR", tempfile.mkdtemp(prefix="pk-test-cache-"))
+os.environ.pop("PK_RENDER_CACHE_DIR", None)
+
+# Ignore the user's config file and extra template roots.
+os.environ["PK_CONFIG"] = os.path.join(tempfile.mkdtemp(prefix="pk-test-config-"), "config.toml")
+os.environ.pop("PK_TEMPLATE_PATH", None)
+
+
+@pytest.fixture
+def template_root(tmp_path, monkeypatch):
+    """
+    Build a template search root from copies of the audit template.
+
+    The fixture is a function taking the names of the copies to make
+    (default: "audit") and ``edits``, a mapping of paths relative to the
+    root to new file contents. It puts the root on PK_TEMPLATE_PATH and
+    returns it.
+    """
+    from pk.catalog import get_templates_dir
+
+    def make(*names: str, edits: dict[str, str] | None = None) -> Path:
+        root = tmp_path / "templates"
+        for name in names or ("audit",):
+            shutil.copytree(get_templates_dir() / "audit", root / name)
+        shutil.copy(get_templates_dir() / "base.schema.json", root)
+        for path, text in (edits or {}).items():
+            (root / path).write_text(text)
+        monkeypatch.setenv("PK_TEMPLATE_PATH", str(root))
+        return root
+
+    return make
+
+
+@pytest.fixture
+def make_template():
+    """
+    Create minimal template directories.
+
+    Returns:
+        A function make(root, name, description="A template",
+        presets=("default",)) writing a template whose body starts with
+        the description and returning its directory.
+    """
+    def make(root: Path, name: str, description: str = "A template",
+             presets: tuple[str, ...] = ("default",)) -> Path:
+        template_dir = root / name
+        (template_dir / "examples").mkdir(parents=True)
+        (template_dir / "template.md").write_text(f"{description} {{{{ x }}}}")
+        (template_dir / "schema.json").write_text(json.dumps({"description": description}))
+        for preset in presets:
+            (template_dir / "examples" / f"{preset}.yaml").write_text("x: 1\n")
+        return template_dir
+    return make
+
+
+@pytest.fixture
+def forbid_rebuild(monkeypatch):
+    """
+    Make a cache rebuild fail the test.
+
+    Returns:
+        A function forbid(module, name) replacing module.name with a
+        function that raises AssertionError when called.
+    """
+    def forbid(module, name: str) -> None:
+        def fail(*args, **kwargs):
+            raise AssertionError(f"{name} called")
+
+        monkeypatch.setattr(module, name, fail)
+    return forbid
@@ -0,0 +1,118 @@
+"""Tests for the batch module."""
+
+import pytest
+
+from pk.batch import BatchRenderer, RenderResult, render_many
+from pk.render import (
+    PresetNotFoundError,
+    SchemaValidationError,
+    TemplateNotFoundError,
+    compute_hash,
+    load_preset,
+    load_schema,
+    load_template,
+    merge_params,
+    render,
+)
+
+
+class TestRenderMany:
+    """Tests for render_many function."""
+
+    def test_matches_single_renders(self):
+        """Batch output should match rendering each item individually."""
+        items = [{"repo_path": f"/repo/{i}", "scope": [f"src{i}/"]} for i in range(5)]
+        results = list(render_many("audit", "fast", items))
+
+        text = load_template("audit")
+        schema = load_schema("audit")
+        preset = load_preset("audit", "fast")
+        for item, result in zip(items, results, strict=True):
+            expected = render(text, merge_params(schema, preset, cli_overrides=item))
+            assert result.ok
+            assert result.rendered == expected
+            assert result.prompt_hash == compute_hash(expected)
+            assert result.params["repo_path"] == item["repo_path"]
+
+    def test_unpacks_as_tuple(self):
+        """Results should unpack as (params, rendered, prompt_hash, error)."""
+        params, rendered, prompt_hash, error = next(render_many("audit", None, [{}]))
+        assert error is None
+        assert "Role & Mission" in rendered
+        assert prompt_hash == compute_hash(rendered)
+
+    def test_reports_failures_per_item(self):
+        """Invalid items should not abort the rest of the batch."""
+        items = [
+            {"time_budget_minutes": 30},
+            {"time_budget_minutes": "soon"},
+            {"time_budget_minutes": 45},
+        ]
+        results = list(render_many("audit", "default", items))
+
+        assert [r.ok for r in results] == [True, False, True]
+        failed = results[1]
+        assert isinstance(failed.error, SchemaValidationError)
+        assert failed.rendered is None
+        assert any("time_budget_minutes" in e for e in failed.error.errors)
+
+    def test_is_lazy(self):
+        """Items should be rendered as the iterator is consumed."""
+        def items():
+            yield {"notes": "first"}
+            raise AssertionError("consumed too eagerly")
+
+        results = render_many("audit", None, items())
+        assert next(results).ok
+
+    def test_raises_for_missing_template(self):
+        """Missing templates should raise before iteration starts."""
+        with pytest.raises(TemplateNotFoundError):
+            render_many("nonexistent_template_xyz", None, [])
+
+    def test_raises_for_missing_preset(self):
+        """Missing presets should raise before iteration starts."""
+        with pytest.raises(PresetNotFoundError):
+            render_many("audit", "nonexistent_preset_xyz", [])
+
+    def test_specialized_matches_plain(self):
+        """Specialized batch output should match the plain batch output."""
+        items = [{"threat_model": model} for model in ("web_app", "api", "cli", "web_app")]
+        plain = list(render_many("security", "default", items))
+        specialized = list(render_many("security", "default", items, specialize=True))
+        assert [r.rendered for r in specialized] == [r.rendered for r in plain]
+
+
+class TestBatchRenderer:
+    """Tests for BatchRenderer class."""
+
+    def test_render_one_without_overrides(self):
+        """Rendering with no overrides should use the preset as-is."""
+        renderer = BatchRenderer("security", "deep")
+        result = renderer.render_one()
+        assert isinstance(result, RenderResult)
+        assert result.ok
+        assert result.params["depth"] == "deep"
+
+
+class TestParallelRenderMany:
+    """Tests for render_many with a process pool."""
+
+    def test_matches_serial_order(self):
+        """Parallel results should match serial results in input order."""
+        items = [{"time_budget_minutes": 5 + i} for i in range(25)]
+        items[7] = {"time_budget_minutes": "invalid"}
+
+        serial = list(render_many("audit", "default", items))
+        parallel = list(render_many("audit", "default", items, jobs=2, chunksize=4))
+
+        assert [r.params for r in parallel] == [r.params for r in serial]
+        assert [r.rendered for r in parallel] == [r.rendered for r in serial]
+        assert not parallel[7].ok
+        assert isinstance(parallel[7].error, SchemaValidationError)
+        assert parallel[7].error.errors == serial[7].error.errors
+
+    def test_rejects_invalid_jobs(self):
+        """jobs must be positive."""
+        with pytest.raises(ValueError):
+            render_many("audit", None, [], jobs=0)
@@ -0,0 +1,142 @@
+"""Tests for pk.bundle module."""
+
+import pytest
+
+from pk.bundle import Bundle, BundleError, build_bundle, open_bundle, verify_bundle
+from pk.render import (
+    get_templates_dir,
+    list_presets,
+    list_templates,
+    load_preset,
+    load_schema,
+    load_template,
+    merge_params,
+    render,
+)
+
+
+@pytest.fixture(scope="module")
+def bundle_file(tmp_path_factory):
+    """A bundle of the repository's templates."""
+    path = tmp_path_factory.mktemp("bundle") / "templates.pkb"
+    build_bundle(get_templates_dir(), path)
+    return path
+
+
+@pytest.fixture
+def use_bundle(bundle_file, monkeypatch):
+    """Serve templates from the bundle."""
+    source = get_templates_dir()
+    monkeypatch.setenv("PK_TEMPLATES_BUNDLE", str(bundle_file))
+    return source
+
+
+class TestBundlePath:
+    """Tests for the path-like view of a bundle."""
+
+    def test_mirrors_directory(self, bundle_file):
+        """Listing and reading should match the source directory."""
+        source = get_templates_dir()
+        root = open_bundle(bundle_file).root
+
+        assert [p.name for p in (root / "audit").iterdir()] == sorted(
+            p.name for p in (source / "audit").iterdir()
+        )
+        schema = root / "audit" / "schema.json"
+        assert schema.is_file() and not schema.is_dir()
+        assert (root / "audit").is_dir() and (root / "audit").exists()
+        assert not (root / "missing").exists()
+        assert schema.read_text() == (source / "audit" / "schema.json").read_text()
+        assert schema.stat().st_size == (source / "audit" / "schema.json").stat().st_size
+
+    def test_joins_relative_paths(self, bundle_file):
+        """Joining should normalize . and .. like a filesystem path."""
+        root = open_bundle(bundle_file).root
+        base = root / "audit" / "./../base.schema.json"
+        assert base == root / "base.schema.json"
+        assert base.parent == root
+        assert base.suffix == ".json" and base.stem == "base.schema"
+
+    def test_missing_file_raises(self, bundle_file):
+        """Reading a missing entry should raise FileNotFoundError."""
+        with pytest.raises(FileNotFoundError):
+            (open_bundle(bundle_file).root / "nope.md").read_text()
+
+
+class TestBundleTemplates:
+    """Tests for serving templates from a bundle via pk.render."""
+
+    def test_templates_dir_is_bundle(self, use_bundle, bundle_file):
+        """PK_TEMPLATES_BUNDLE should replace the templates directory."""
+        assert str(get_templates_dir()) == str(bundle_file)
+
+    def test_same_listing_and_content(self, use_bundle, monkeypatch):
+        """Templates, presets, schemas and renders should match the directory."""
+        bundled = {
+            t["name"]: (t, list_presets(t["name"]), load_schema(t["name"]))
+            for t in list_templates()
+        }
+        renders = {
+            name: render(load_template(name), merge_params(schema, load_preset(name, presets[0])))
+            for name, (_, presets, schema) in bundled.items()
+        }
+
+        monkeypatch.delenv("PK_TEMPLATES_BUNDLE")
+        for t in list_templates():
+            name = t["name"]
+            info, presets, schema = bundled.pop(name)
+            assert info == t
+            assert presets == list_presets(name)
+            assert schema == load_schema(name)
+            expected = render(load_template(name), merge_params(schema, load_preset(name, presets[0])))
+            assert renders[name] == expected
+        assert bundled == {}
+
+    def test_from_bytes(self, bundle_file):
+        """Bundles not on a real filesystem can be loaded from memory."""
+        bundle = Bundle.from_bytes(bundle_file.read_bytes())
+        assert (bundle.root / "audit" / "template.md").exists()
+
+
+class TestVerifyBundle:
+    """Tests for verify_bundle function."""
+
+    def test_sound_bundle(self, bundle_file):
+        """A fresh bundle should verify against its source."""
+        assert verify_bundle(bundle_file, get_templates_dir()) == []
+
+    def test_detects_corruption(self, bundle_file, tmp_path):
+        """Flipped bytes should fail the checksum."""
+        data = bytearray(bundle_file.read_bytes())
+        data[40] ^= 0xFF
+        corrupt = tmp_path / "corrupt.pkb"
+        corrupt.write_bytes(bytes(data))
+        problems = verify_bundle(corrupt)
+        assert len(problems) == 1
+        assert "checksum mismatch" in problems[0]
+
+    def test_detects_source_changes(self, tmp_path):
+        """Added, removed and changed source files should be reported."""
+        source = tmp_path / "templates"
+        (source / "t").mkdir(parents=True)
+        (source / "t" / "template.md").write_text("a")
+        (source / "t" / "old.md").write_text("a")
+        build_bundle(source, tmp_path / "b.pkb")
+
+        (source / "t" / "template.md").write_text("b")
+        (source / "t" / "old.md").unlink()
+        (source / "t" / "new.md").write_text("c")
+        problems = verify_bundle(tmp_path / "b.pkb", source)
+        assert problems == [
+            "t/new.md: missing from bundle",
+            f"t/old.md: not in {source}",
+            f"t/template.md: differs from {source / 't' / 'template.md'}",
+        ]
+
+    def test_not_a_bundle(self, tmp_path):
+        """Arbitrary files should be rejected."""
+        path = tmp_path / "x.pkb"
+        path.write_bytes(b"hello world, this is not a bundle at all")
+        assert verify_bundle(path)[0].startswith("cannot read bundle")
+        with pytest.raises(BundleError):
+            Bundle.open(path)
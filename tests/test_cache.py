@@ -0,0 +1,145 @@
+"""Tests for the cache module."""
+
+import os
+
+import pytest
+
+from pk.cache import DiskRenderCache, env_flag, get_cache_dir, get_render_cache_dir
+
+
+class TestGetCacheDir:
+    """Tests for get_cache_dir function."""
+
+    def test_env_override(self, monkeypatch, tmp_path):
+        """PK_CACHE_DIR should take precedence."""
+        monkeypatch.setenv("PK_CACHE_DIR", str(tmp_path))
+        assert get_cache_dir() == tmp_path
+
+    def test_xdg_fallback(self, monkeypatch, tmp_path):
+        """XDG_CACHE_HOME should be used when PK_CACHE_DIR is unset."""
+        monkeypatch.delenv("PK_CACHE_DIR", raising=False)
+        monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+        assert get_cache_dir() == tmp_path / "promptkit"
+
+
+class TestGetRenderCacheDir:
+    """Tests for get_render_cache_dir function."""
+
+    def test_default(self, monkeypatch, tmp_path):
+        """Without an override the render cache lives in the cache directory."""
+        monkeypatch.setenv("PK_CACHE_DIR", str(tmp_path))
+        monkeypatch.delenv("PK_RENDER_CACHE_DIR", raising=False)
+        assert get_render_cache_dir() == tmp_path / "renders"
+        assert DiskRenderCache().directory == tmp_path / "renders"
+
+    def test_env_override(self, monkeypatch, tmp_path):
+        """PK_RENDER_CACHE_DIR moves only the render cache."""
+        monkeypatch.setenv("PK_CACHE_DIR", str(tmp_path / "cache"))
+        monkeypatch.setenv("PK_RENDER_CACHE_DIR", str(tmp_path / "shared"))
+        assert DiskRenderCache().directory == tmp_path / "shared"
+        assert get_cache_dir() == tmp_path / "cache"
+
+
+class TestEnvFlag:
+    """Tests for env_flag function."""
+
+    @pytest.mark.parametrize("value", ["0", "false", "OFF", "no"])
+    def test_falsy_values(self, monkeypatch, value):
+        """Falsy strings should disable the flag."""
+        monkeypatch.setenv("PK_TEST_FLAG", value)
+        assert env_flag("PK_TEST_FLAG") is False
+
+    def test_default_when_unset(self, monkeypatch):
+        """Unset variables should return the default."""
+        monkeypatch.delenv("PK_TEST_FLAG", raising=False)
+        assert env_flag("PK_TEST_FLAG", default=False) is False
+
+
+class TestDiskRenderCache:
+    """Tests for DiskRenderCache class."""
+
+    @pytest.fixture
+    def cache(self, tmp_path):
+        """Create a cache in a temporary directory."""
+        return DiskRenderCache(tmp_path / "renders")
+
+    def test_key_depends_on_all_inputs(self):
+        """Changing any input should change the key."""
+        base = DiskRenderCache.make_key("t", "s", "p")
+        assert base != DiskRenderCache.make_key("t2", "s", "p")
+        assert base != DiskRenderCache.make_key("t", "s2", "p")
+        assert base != DiskRenderCache.make_key("t", "s", "p2")
+        assert base == DiskRenderCache.make_key("t", "s", "p")
+
+    def test_miss_returns_none(self, cache):
+        """Unknown keys should miss."""
+        assert cache.read_chunks("ab" * 32) is None
+        assert cache.get("ab" * 32) is None
+
+    def test_round_trip(self, cache):
+        """Written entries should read back byte for byte."""
+        key = DiskRenderCache.make_key("t", "s", "p")
+        with cache.writer(key) as writer:
+            writer.write("line one\r\n")
+            writer.write("línea dos\n")
+        assert cache.get(key) == "line one\r\nlínea dos\n"
+
+    def test_entries_follow_umask(self, cache):
+        """Entries should be readable by other users of a shared cache."""
+        import stat
+
+        key = DiskRenderCache.make_key("t", "s", "p")
+        old = os.umask(0o022)
+        try:
+            with cache.writer(key) as writer:
+                writer.write("x")
+        finally:
+            os.umask(old)
+        assert stat.S_IMODE(cache.path_for(key).stat().st_mode) == 0o644
+
+    def test_failed_write_is_not_published(self, cache):
+        """An exception while writing should leave no entry or temp file."""
+        key = DiskRenderCache.make_key("t", "s", "p")
+        with pytest.raises(RuntimeError):
+            with cache.writer(key) as writer:
+                writer.write("partial")
+                raise RuntimeError("render failed")
+        assert cache.get(key) is None
+        assert list(cache.directory.rglob("*")) == [cache.path_for(key).parent]
+
+    def test_gc_by_age(self, cache):
+        """Entries older than max_age_seconds should be removed."""
+        old, new = "aa" + "0" * 62, "bb" + "0" * 62
+        for key in (old, new):
+            with cache.writer(key) as writer:
+                writer.write("x" * 10)
+        os.utime(cache.path_for(old), (1000, 1000))
+
+        result = cache.gc(max_age_seconds=3600)
+        assert result.removed == 1
+        assert cache.get(old) is None
+        assert cache.get(new) == "x" * 10
+
+    def test_gc_by_size_removes_oldest(self, cache):
+        """Size-based eviction should remove the oldest entries first."""
+        keys = [f"{i:02d}" + "0" * 62 for i in range(4)]
+        for i, key in enumerate(keys):
+            with cache.writer(key) as writer:
+                writer.write("x" * 100)
+            os.utime(cache.path_for(key), (1000 + i, 1000 + i))
+
+        result = cache.gc(max_bytes=250)
+        assert result.removed == 2
+        assert result.kept_bytes == 200
+        assert [cache.get(k) is not None for k in keys] == [False, False, True, True]
+
+    def test_gc_removes_stale_temp_files(self, cache):
+        """Abandoned temp files should be cleaned up."""
+        shard = cache.directory / "ab"
+        shard.mkdir(parents=True)
+        stale = shard / ".abc.md.x.tmp"
+        stale.write_text("partial")
+        os.utime(stale, (1000, 1000))
+
+        cache.gc()
+        assert not stale.exists()
@@ -1,5 +1,7 @@
 """Tests for the CLI module."""
 
+import hashlib
+import json
 import tempfile
 from pathlib import Path
 
@@ -7,6 +9,7 @@ import pytest
 from click.testing import CliRunner
 
 from pk.cli import main
+from pk.render import get_templates_dir
 
 
 @pytest.fixture
@@ -46,6 +49,21 @@ class TestShowCommand:
         assert "Schema:" in result.output
         assert "Parameters:" in result.output
 
+    def test_shows_winning_root(self, runner, tmp_path, monkeypatch):
+        """Should report which search root provides the template."""
+        result = runner.invoke(main, ["show", "audit"])
+        assert f"Root: {get_templates_dir()} (built-in)" in result.output
+
+        override = tmp_path / "audit"
+        override.mkdir()
+        (override / "template.md").write_text("Hi")
+        (override / "schema.json").write_text("{}")
+        monkeypatch.setenv("PK_TEMPLATE_PATH", str(tmp_path))
+        result = runner.invoke(main, ["show", "audit"])
+        assert result.exit_code == 0
+        assert f"Path: {override}" in result.output
+        assert f"Root: {tmp_path} (PK_TEMPLATE_PATH)" in result.output
+
     def test_shows_presets(self, runner):
         """Should show available presets."""
         result = runner.invoke(main, ["show", "audit"])
@@ -131,6 +149,147 @@ class TestRenderCommand:
             assert (packet_dir / "params.resolved.json").exists()
             assert (packet_dir / "meta.json").exists()
 
+    def test_run_packet_hash_matches_output(self, runner, tmp_path):
+        """Streamed output and run packet should carry the same prompt hash."""
+        outfile = tmp_path / "out.md"
+        result = runner.invoke(main, [
+            "render", "audit",
+            "--preset", "default",
+            "--out", str(outfile),
+            "--run-dir", str(tmp_path / "runs"),
+        ])
+        assert result.exit_code == 0
+
+        packet_dir = next((tmp_path / "runs").iterdir())
+        meta = json.loads((packet_dir / "meta.json").read_text())
+        content = outfile.read_bytes()
+        assert (packet_dir / "prompt.md").read_bytes() == content
+        assert meta["prompt_hash"] == hashlib.sha256(content).hexdigest()
+
+    def test_failed_render_leaves_no_output(self, runner, tmp_path, monkeypatch):
+        """A render failure mid-stream should not leave partial files."""
+        import pk.render
+        from pk.render import RenderError
+
+        def failing_stream(*args, **kwargs):
+            yield "partial"
+            raise RenderError("boom")
+
+        monkeypatch.setattr(pk.render, "render_stream", failing_stream)
+        outfile = tmp_path / "out.md"
+        result = runner.invoke(main, [
+            "render", "audit",
+            "--out", str(outfile),
+            "--run-dir", str(tmp_path / "runs"),
+        ])
+        assert result.exit_code != 0
+        assert "boom" in result.output
+        assert not outfile.exists()
+        assert list((tmp_path / "runs").iterdir()) == []
+        assert list(tmp_path.iterdir()) == [tmp_path / "runs"]
+
+    def test_unserializable_params_only_warn(self, runner, tmp_path, monkeypatch, make_template):
+        """A run packet failure should warn and still write the output."""
+        make_template(tmp_path / "templates", "dated", "Dated")
+        monkeypatch.setenv("PK_TEMPLATE_PATH", str(tmp_path / "templates"))
+        params = tmp_path / "params.yaml"
+        params.write_text("x: 1\nwhen: 2024-01-02\n")
+        outfile = tmp_path / "out.md"
+        result = runner.invoke(main, [
+            "render", "dated",
+            "--params", str(params),
+            "--out", str(outfile),
+            "--run-dir", str(tmp_path / "runs"),
+        ])
+        assert result.exit_code == 0, result.output
+        assert "Warning: Failed to create run packet" in result.output
+        assert outfile.read_text().startswith("Dated")
+        assert list((tmp_path / "runs").iterdir()) == []
+
+    def test_output_file_mode(self, runner, tmp_path):
+        """--out should create files with the umask-derived mode."""
+        import os
+        import stat
+
+        outfile = tmp_path / "out.md"
+        old = os.umask(0o022)
+        try:
+            result = runner.invoke(main, ["render", "audit", "--out", str(outfile)])
+        finally:
+            os.umask(old)
+        assert result.exit_code == 0
+        assert stat.S_IMODE(outfile.stat().st_mode) == 0o644
+
+    def test_output_through_symlink(self, runner, tmp_path):
+        """--out pointing at a symlink should write its target."""
+        target = tmp_path / "target.md"
+        target.write_text("old")
+        link = tmp_path / "link.md"
+        link.symlink_to(target)
+        result = runner.invoke(main, ["render", "audit", "--preset", "fast", "--out", str(link)])
+        assert result.exit_code == 0
+        assert link.is_symlink()
+        assert "audit" in target.read_text().lower()
+
+    def test_output_to_fifo(self, runner, tmp_path):
+        """--out pointing at a FIFO should write into it, not replace it."""
+        import os
+        import threading
+
+        fifo = tmp_path / "out.fifo"
+        os.mkfifo(fifo)
+        received = []
+        reader = threading.Thread(
+            target=lambda: received.append(fifo.read_text()), daemon=True
+        )
+        reader.start()
+        result = runner.invoke(main, ["render", "audit", "--preset", "fast", "--out", str(fifo)])
+        reader.join(timeout=10)
+        assert result.exit_code == 0
+        assert fifo.is_fifo()
+        assert received and "audit" in received[0].lower()
+
+    def test_render_cache_serves_repeat_renders(self, runner, tmp_path, monkeypatch):
+        """A second identical render should be read from the disk cache."""
+        import pk.render
+
+        monkeypatch.setenv("PK_CACHE_DIR", str(tmp_path / "cache"))
+        args = ["render", "audit", "--preset", "fast", "--render-cache"]
+        first = runner.invoke(main, args + ["--out", str(tmp_path / "a.md")])
+        assert first.exit_code == 0
+
+        def fail(*args, **kwargs):
+            raise AssertionError("rendered instead of using the cache")
+
+        monkeypatch.setattr(pk.render, "render_stream", fail)
+        monkeypatch.setattr(pk.render, "validate_params", fail)
+        second = runner.invoke(main, args + ["--out", str(tmp_path / "b.md")])
+        assert second.exit_code == 0
+        assert (tmp_path / "a.md").read_bytes() == (tmp_path / "b.md").read_bytes()
+
+    def test_render_cache_dir(self, runner, tmp_path, monkeypatch):
+        """--render-cache-dir should hold the render cache apart from other caches."""
+        monkeypatch.setenv("PK_CACHE_DIR", str(tmp_path / "cache"))
+        shared = tmp_path / "shared"
+        result = runner.invoke(main, [
+            "render", "audit", "--render-cache", "--render-cache-dir", str(shared),
+        ])
+        assert result.exit_code == 0, result.output
+        assert len(list(shared.rglob("*.md"))) == 1
+        assert not (tmp_path / "cache" / "renders").exists()
+
+        gc = runner.invoke(main, ["cache", "gc", "--render-cache-dir", str(shared)])
+        assert f"Cache: {shared}" in gc.output
+        assert "Kept 1 entries" in gc.output
+
+    def test_render_cache_is_opt_in(self, runner, tmp_path, monkeypatch):
+        """Without --render-cache nothing should be written to the cache."""
+        monkeypatch.setenv("PK_CACHE_DIR", str(tmp_path / "cache"))
+        monkeypatch.delenv("PK_RENDER_CACHE", raising=False)
+        result = runner.invoke(main, ["render", "audit"])
+        assert result.exit_code == 0
+        assert not (tmp_path / "cache" / "renders").exists()
+
     def test_fails_for_missing_template(self, runner):
         """Should fail for missing template."""
         result = runner.invoke(main, ["render", "nonexistent_xyz"])
@@ -155,6 +314,49 @@ class TestRenderCommand:
         assert "json" in result.output.lower()
 
 
+class TestCacheCommand:
+    """Tests for the cache command group."""
+
+    def test_gc(self, runner, tmp_path, monkeypatch):
+        """cache gc should report what it removed and kept."""
+        monkeypatch.setenv("PK_CACHE_DIR", str(tmp_path))
+        runner.invoke(main, ["render", "audit", "--render-cache"])
+        result = runner.invoke(main, ["cache", "gc", "--max-size-mb", "0"])
+        assert result.exit_code == 0
+        assert "Removed 1 entries" in result.output
+        assert "Kept 0 entries" in result.output
+
+
+class TestBundleCommand:
+    """Tests for the bundle command group."""
+
+    def test_build_and_verify(self, runner, tmp_path, monkeypatch):
+        """A built bundle should verify and be usable for rendering."""
+        bundle = tmp_path / "t.pkb"
+        result = runner.invoke(main, ["bundle", "build", "-o", str(bundle)])
+        assert result.exit_code == 0
+        assert "Packed" in result.output
+
+        source = str(get_templates_dir())
+        result = runner.invoke(main, ["bundle", "verify", str(bundle), "--templates-dir", source])
+        assert result.exit_code == 0
+        assert "OK" in result.output
+
+        expected = runner.invoke(main, ["render", "audit", "--preset", "fast"]).output
+        monkeypatch.setenv("PK_TEMPLATES_BUNDLE", str(bundle))
+        result = runner.invoke(main, ["render", "audit", "--preset", "fast"])
+        assert result.exit_code == 0
+        assert result.output == expected
+
+    def test_verify_fails_for_corrupt_bundle(self, runner, tmp_path):
+        """verify should exit non-zero and list problems."""
+        bundle = tmp_path / "t.pkb"
+        bundle.write_bytes(b"PKBUNDLE" + b"\0" * 40)
+        result = runner.invoke(main, ["bundle", "verify", str(bundle)])
+        assert result.exit_code != 0
+        assert "cannot read bundle" in result.output
+
+
 class TestDoctorCommand:
     """Tests for the doctor command."""
 
@@ -180,6 +382,24 @@ class TestDoctorCommand:
         result = runner.invoke(main, ["doctor", "--template", "nonexistent_xyz"])
         assert result.exit_code != 0
 
+    def test_parallel_jobs(self, runner):
+        """--jobs should produce the same report as a serial run."""
+        serial = runner.invoke(main, ["doctor"])
+        parallel = runner.invoke(main, ["doctor", "--jobs", "2", "--fail-fast"])
+        assert parallel.exit_code == 0
+        assert parallel.output == serial.output
+
+    def test_no_cache(self, runner):
+        """Repeat runs replay cached checks unless --no-cache is given."""
+        runner.invoke(main, ["doctor", "--template", "audit"])
+        cached = runner.invoke(main, ["doctor", "--template", "audit"])
+        assert cached.exit_code == 0
+        assert "(cached)" in cached.output
+
+        fresh = runner.invoke(main, ["doctor", "--template", "audit", "--no-cache"])
+        assert fresh.exit_code == 0
+        assert "(cached)" not in fresh.output
+
 
 class TestVersionFlag:
     """Tests for the --version flag."""
@@ -0,0 +1,116 @@
+"""Tests for shell completion."""
+
+import json
+import os
+
+import pytest
+from click.shell_completion import ShellComplete
+
+import pk.completion as completion_module
+from pk.cli import main
+from pk.completion import (
+    complete_overrides,
+    complete_presets,
+    complete_templates,
+    get_completion_index,
+)
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    """Private cache directory, so the index starts cold."""
+    monkeypatch.setenv("PK_CACHE_DIR", str(tmp_path / "cache"))
+    return tmp_path / "cache"
+
+
+@pytest.fixture
+def templates_root(tmp_path, monkeypatch, cache_dir):
+    """A template root placed first on the search path."""
+    root = tmp_path / "templates"
+    (root / "greet" / "examples").mkdir(parents=True)
+    (root / "greet" / "template.md").write_text("{{ tone }}")
+    (root / "greet" / "schema.json").write_text(json.dumps({
+        "description": "Greeting",
+        "properties": {
+            "tone": {"type": "string", "enum": ["warm", "formal"]},
+            "loud": {"type": "boolean"},
+            "count": {"type": "integer"},
+        },
+    }))
+    (root / "greet" / "examples" / "default.yaml").write_text("tone: warm\n")
+    monkeypatch.setenv("PK_TEMPLATE_PATH", str(root))
+    return root
+
+
+def completions(args, incomplete):
+    """Get completion values for a partial pk command line."""
+    comp = ShellComplete(main, {}, "pk", "_PK_COMPLETE")
+    return [item.value for item in comp.get_completions(args, incomplete)]
+
+
+class TestCompletionIndex:
+    """Tests for the cached completion index."""
+
+    def test_indexes_templates(self, templates_root):
+        """Templates, presets and parameter values should be indexed."""
+        entry = get_completion_index()["greet"]
+        assert entry["description"] == "Greeting"
+        assert entry["presets"] == ["default"]
+        assert entry["params"] == {
+            "count": [], "loud": ["true", "false"], "tone": ["warm", "formal"],
+        }
+        assert "audit" in get_completion_index()
+
+    def test_reused_while_unchanged(self, templates_root, cache_dir, forbid_rebuild):
+        """An unchanged tree should be served from the index file."""
+        get_completion_index()
+        assert (cache_dir / "completion.json").exists()
+        forbid_rebuild(completion_module, "_build_templates")
+        assert complete_presets("greet", "") == ["default"]
+
+    @pytest.mark.parametrize("change", ["preset", "schema", "template"])
+    def test_rebuilt_on_change(self, change, templates_root):
+        """Added presets, edited schemas and new templates should be picked up."""
+        get_completion_index()
+        greet = templates_root / "greet"
+        if change == "preset":
+            (greet / "examples" / "fast.yaml").write_text("tone: formal\n")
+            assert complete_presets("greet", "") == ["default", "fast"]
+        elif change == "schema":
+            schema = json.loads((greet / "schema.json").read_text())
+            schema["properties"]["tone"]["enum"].append("terse")
+            (greet / "schema.json").write_text(json.dumps(schema))
+            os.utime(greet / "schema.json", ns=(0, 0))
+            assert complete_overrides("greet", "tone=t") == ["tone=terse"]
+        else:
+            (templates_root / "greet2").mkdir()
+            (templates_root / "greet2" / "template.md").write_text("hi")
+            assert [name for name, _ in complete_templates("greet")] == ["greet", "greet2"]
+
+    def test_overrides(self, templates_root):
+        """Keys complete to key= and values complete from the enum."""
+        assert complete_overrides("greet", "to") == ["tone="]
+        assert complete_overrides("greet", "tone=") == ["tone=warm", "tone=formal"]
+        assert complete_overrides("greet", "count=") == []
+        assert complete_overrides("missing", "") == []
+
+
+class TestCliCompletion:
+    """Tests for the completers wired into pk.cli."""
+
+    def test_template_argument(self, templates_root):
+        """Template arguments and -t complete template names."""
+        assert completions(["render"], "gr") == ["greet"]
+        assert completions(["show"], "gr") == ["greet"]
+        assert completions(["doctor", "-t"], "gr") == ["greet"]
+
+    def test_preset_option(self, templates_root):
+        """--preset completes the presets of the template being rendered."""
+        assert completions(["render", "greet", "--preset"], "") == ["default"]
+
+    def test_set_option(self, templates_root):
+        """--set completes parameter names and enum values."""
+        assert completions(["render", "greet", "--set"], "lo") == ["loud="]
+        assert completions(["render", "greet", "-s", "a=1", "-s"], "loud=") == [
+            "loud=true", "loud=false",
+        ]
@@ -0,0 +1,68 @@
+"""Tests for pk.config module."""
+
+import pytest
+
+from pk.config import ConfigError, get_config_path, get_config_template_path, load_config
+
+
+@pytest.fixture
+def config_file(tmp_path, monkeypatch):
+    """Point PK_CONFIG at a file in a temporary directory."""
+    path = tmp_path / "config.toml"
+    monkeypatch.setenv("PK_CONFIG", str(path))
+    return path
+
+
+class TestGetConfigPath:
+    """Tests for get_config_path function."""
+
+    def test_env_override(self, config_file):
+        """PK_CONFIG should take precedence."""
+        assert get_config_path() == config_file
+
+    def test_xdg_config_home(self, tmp_path, monkeypatch):
+        """Without PK_CONFIG, the XDG config directory should be used."""
+        monkeypatch.delenv("PK_CONFIG")
+        monkeypatch.setenv("XDG_CONFIG_HOME", str(tmp_path))
+        assert get_config_path() == tmp_path / "promptkit" / "config.toml"
+
+
+class TestLoadConfig:
+    """Tests for load_config function."""
+
+    def test_missing_file(self, config_file):
+        """A missing file should give an empty config."""
+        assert load_config() == {}
+
+    def test_rereads_changed_file(self, config_file):
+        """Edits should be picked up."""
+        config_file.write_text('[templates]\npath = ["a"]\n')
+        assert load_config() == {"templates": {"path": ["a"]}}
+        config_file.write_text('[templates]\npath = ["a", "bb"]\n')
+        assert load_config() == {"templates": {"path": ["a", "bb"]}}
+
+    def test_invalid_toml(self, config_file):
+        """Invalid TOML should raise ConfigError naming the file."""
+        config_file.write_text("[templates\n")
+        with pytest.raises(ConfigError, match="config.toml"):
+            load_config()
+
+
+class TestGetConfigTemplatePath:
+    """Tests for get_config_template_path function."""
+
+    def test_resolves_relative_entries(self, config_file, tmp_path):
+        """Relative entries are relative to the config file's directory."""
+        config_file.write_text(f'[templates]\npath = ["local", "{tmp_path / "abs"}"]\n')
+        assert get_config_template_path() == [tmp_path / "local", tmp_path / "abs"]
+
+    def test_no_templates_section(self, config_file):
+        """A config without templates.path gives no roots."""
+        config_file.write_text("[other]\nx = 1\n")
+        assert get_config_template_path() == []
+
+    def test_rejects_non_strings(self, config_file):
+        """templates.path must hold strings."""
+        config_file.write_text("[templates]\npath = [1]\n")
+        with pytest.raises(ConfigError, match="templates.path"):
+            get_config_template_path()
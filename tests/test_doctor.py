@@ -1,9 +1,18 @@
 """Tests for the doctor module."""
 
+import dataclasses
+import json
+import shutil
 
+import pytest
+
+import pk.doctor as doctor_module
 from pk.doctor import (
+    CHECKS,
     DoctorReport,
+    TemplateContext,
     ValidationResult,
+    load_template_context,
     normalize_text,
     validate_all_templates,
     validate_golden_test,
@@ -11,6 +20,7 @@ from pk.doctor import (
     validate_schema_json,
     validate_template,
     validate_template_renders,
+    validate_templates,
     validate_variable_coverage,
 )
 
@@ -222,3 +232,200 @@ class TestValidateAllTemplates:
 
         expected = {"audit", "security", "readme"}
         assert expected.issubset(templates)
+
+
+@pytest.fixture
+def broken_root(template_root):
+    """A search root with two copies of audit, one with a broken golden file."""
+    return template_root(
+        "a_broken", "b_ok", edits={"a_broken/tests/render_golden.md": "nope\n"}
+    )
+
+
+class TestValidateTemplates:
+    """Tests for validate_templates function."""
+
+    def test_parallel_matches_serial(self):
+        """A process pool should give the same report, in the same order."""
+        names = ["audit", "security", "readme"]
+        serial = validate_templates(names)
+        parallel = validate_templates(names, jobs=3)
+        assert parallel.results == serial.results
+        assert parallel.format_report() == serial.format_report()
+
+    def test_parallel_job_per_template(self, monkeypatch):
+        """Each template's checks should run as one pool job."""
+        from concurrent.futures import ThreadPoolExecutor
+
+        submitted = []
+
+        class RecordingExecutor(ThreadPoolExecutor):
+            def submit(self, fn, *args, **kwargs):
+                submitted.append(args[:2])
+                return super().submit(fn, *args, **kwargs)
+
+        monkeypatch.setattr(doctor_module, "ProcessPoolExecutor", RecordingExecutor)
+        names = ["audit", "security", "readme"]
+        report = validate_templates(names, jobs=3)
+        assert sorted(submitted) == sorted((name, list(CHECKS)) for name in names)
+        assert report.results == validate_templates(names).results
+
+    def test_fail_fast_serial(self, broken_root):
+        """Serial fail-fast should stop right after the first failure."""
+        report = validate_templates(["a_broken", "b_ok"], fail_fast=True)
+        assert not report.passed
+        assert report.results[-1].check == "golden_test"
+        assert not report.results[-1].passed
+        assert report.skipped == 5
+        assert "5 checks not run" in report.format_report()
+
+    def test_fail_fast_parallel(self, broken_root):
+        """Parallel fail-fast should report the failure in serial order."""
+        full = validate_templates(["a_broken", "b_ok"])
+        report = validate_templates(["a_broken", "b_ok"], jobs=2, fail_fast=True)
+        assert not report.passed
+        order = [(r.template, r.check) for r in full.results]
+        got = [(r.template, r.check) for r in report.results]
+        assert got == [key for key in order if key in got]
+
+    def test_rejects_invalid_jobs(self):
+        """jobs must be positive."""
+        with pytest.raises(ValueError):
+            validate_templates(["audit"], jobs=0)
+
+
+class TestTemplateContext:
+    """Tests for load_template_context and the checks sharing it."""
+
+    def test_loads_each_source_once(self, monkeypatch):
+        """All checks of a template should share one load of each file."""
+        presets = len(load_template_context("audit").preset_names)
+        calls = []
+        for name in ("load_template", "_load_shared_schema", "load_preset", "parse_template"):
+            original = getattr(doctor_module, name)
+
+            def counted(*args, _name=name, _original=original):
+                calls.append(_name)
+                return _original(*args)
+
+            monkeypatch.setattr(doctor_module, name, counted)
+
+        validate_template("audit")
+        assert sorted(calls) == sorted(
+            ["load_template", "_load_shared_schema", "parse_template"] + ["load_preset"] * presets
+        )
+
+    def test_is_immutable(self):
+        """Contexts are frozen and their preset mappings read-only."""
+        context = load_template_context("audit")
+        assert isinstance(context, TemplateContext)
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            context.schema = {}
+        with pytest.raises(TypeError):
+            context.presets["new"] = {}
+
+    def test_keeps_load_errors(self, broken_root):
+        """Broken sources should be recorded for the checks to report."""
+        template_dir = broken_root / "a_broken"
+        (template_dir / "template.md").write_text("{{ unclosed ")
+        (template_dir / "examples" / "default.yaml").write_text("a: [1\n")
+
+        context = load_template_context("a_broken")
+        assert context.syntax_error is not None
+        assert context.ast is None and context.compiled is None
+        assert "default" in context.preset_errors
+
+        coverage = validate_variable_coverage("a_broken", context)
+        assert coverage.message.startswith("Template parse error")
+        renders = {r.check: r for r in validate_template_renders("a_broken", context)}
+        assert "Invalid YAML" in renders["render:default"].message
+
+
+@pytest.fixture
+def cached_root(broken_root, tmp_path, monkeypatch):
+    """broken_root's passing template with a private doctor result cache."""
+    monkeypatch.setenv("PK_CACHE_DIR", str(tmp_path / "cache"))
+    return broken_root
+
+
+def rerun_checks(report):
+    """Checks of a report that ran rather than being replayed."""
+    units = {"preset": "presets", "render": "render"}
+    return {units.get(r.check.split(":")[0], r.check) for r in report.results if not r.cached}
+
+
+class TestResultCache:
+    """Tests for the doctor result cache."""
+
+    def test_replays_unchanged_checks(self, cached_root):
+        """A second run should replay every check with the same results."""
+        first = validate_templates(["b_ok"], use_cache=True)
+        second = validate_templates(["b_ok"], use_cache=True)
+        assert not rerun_checks(second)
+        assert [dataclasses.replace(r, cached=False) for r in second.results] == first.results
+        assert "Golden test passed (cached)" in second.format_report()
+
+    def test_hashes_inputs_once(self, cached_root, monkeypatch):
+        """A cached run should hash each template's inputs only once."""
+        calls = []
+        original = doctor_module.get_input_hashes
+
+        def counted(name):
+            calls.append(name)
+            return original(name)
+
+        monkeypatch.setattr(doctor_module, "get_input_hashes", counted)
+        validate_templates(["a_broken", "b_ok"], use_cache=True)
+        assert sorted(calls) == ["a_broken", "b_ok"]
+
+    def test_parallel_uses_cache(self, cached_root):
+        """Cached checks should be replayed by parallel runs too."""
+        validate_templates(["b_ok"], use_cache=True)
+        (cached_root / "b_ok" / "tests" / "render_golden.md").write_text("nope\n")
+        report = validate_templates(["b_ok"], jobs=2, use_cache=True)
+        assert rerun_checks(report) == {"golden_test"}
+        assert not report.passed
+
+    @pytest.mark.parametrize(("edit", "rerun"), [
+        ("tests/render_golden.md", {"golden_test"}),
+        ("template.md", {"variable_coverage", "render", "golden_test"}),
+        ("examples/default.yaml", {"presets", "render", "golden_test"}),
+        ("../base.schema.json", {"schema_json", "presets", "variable_coverage", "render", "golden_test"}),
+    ])
+    def test_reruns_checks_reading_changed_files(self, edit, rerun, cached_root):
+        """Only checks that read an edited file should run again."""
+        validate_templates(["b_ok"], use_cache=True)
+        path = cached_root / "b_ok" / edit
+        if path.suffix == ".json":
+            schema = json.loads(path.read_text())
+            schema["definitions"]["repo_path"]["description"] = "Changed"
+            path.write_text(json.dumps(schema))
+        else:
+            path.write_text(path.read_text() + "# changed\n")
+
+        report = validate_templates(["b_ok"], use_cache=True)
+        assert rerun_checks(report) == rerun
+
+    def test_changed_checks_miss(self, cached_root, tmp_path, monkeypatch):
+        """Editing promptkit's own code should invalidate cached results."""
+        package = tmp_path / "pk_copy"
+        shutil.copytree(doctor_module._PACKAGE_DIR, package)
+        monkeypatch.setattr(doctor_module, "_PACKAGE_DIR", package)
+        doctor_module._library_versions.cache_clear()
+        validate_templates(["b_ok"], use_cache=True)
+        assert all(r.cached for r in validate_templates(["b_ok"], use_cache=True).results)
+
+        doctor_file = package / "doctor.py"
+        doctor_file.write_text(doctor_file.read_text() + "\n# changed check\n")
+        doctor_module._library_versions.cache_clear()
+        try:
+            report = validate_templates(["b_ok"], use_cache=True)
+        finally:
+            doctor_module._library_versions.cache_clear()
+        assert not any(r.cached for r in report.results)
+
+    def test_disabled_by_default(self, cached_root):
+        """Library callers get fresh results unless they ask for the cache."""
+        validate_templates(["b_ok"], use_cache=True)
+        report = validate_templates(["b_ok"])
+        assert not any(r.cached for r in report.results)
@@ -0,0 +1,65 @@
+"""Tests for pk.fsutil module."""
+
+import os
+import stat
+
+import pytest
+
+from pk.fsutil import atomic_writer
+
+
+@pytest.fixture
+def umask_022():
+    """Run the test with umask 022."""
+    old = os.umask(0o022)
+    yield
+    os.umask(old)
+
+
+def file_mode(path):
+    """Permission bits of path."""
+    return stat.S_IMODE(os.stat(path).st_mode)
+
+
+class TestAtomicWriter:
+    """Tests for atomic_writer function."""
+
+    def test_new_file_follows_umask(self, tmp_path, umask_022):
+        """A new file should get the mode open() would give it."""
+        path = tmp_path / "out.md"
+        with atomic_writer(path) as f:
+            f.write("x")
+        assert path.read_text() == "x"
+        assert file_mode(path) == 0o644
+
+    def test_keeps_mode_of_replaced_file(self, tmp_path, umask_022):
+        """Replacing a file should keep its permissions."""
+        path = tmp_path / "out.md"
+        path.write_text("old")
+        path.chmod(0o640)
+        with atomic_writer(path) as f:
+            f.write("new")
+        assert path.read_text() == "new"
+        assert file_mode(path) == 0o640
+
+    def test_writes_through_symlink(self, tmp_path):
+        """A symlink should be kept and its target written."""
+        target = tmp_path / "target.md"
+        target.write_text("old")
+        link = tmp_path / "link.md"
+        link.symlink_to(target)
+        with atomic_writer(link) as f:
+            f.write("new")
+        assert link.is_symlink()
+        assert target.read_text() == "new"
+
+    def test_failure_leaves_no_temp_file(self, tmp_path):
+        """A failed write should keep the old content and remove the temp file."""
+        path = tmp_path / "out.md"
+        path.write_text("old")
+        with pytest.raises(RuntimeError):
+            with atomic_writer(path) as f:
+                f.write("partial")
+                raise RuntimeError("boom")
+        assert path.read_text() == "old"
+        assert list(tmp_path.iterdir()) == [path]
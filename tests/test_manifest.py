@@ -0,0 +1,125 @@
+"""Tests for pk.manifest module."""
+
+import json
+import os
+
+import pytest
+
+import pk.manifest as manifest_module
+from pk.manifest import (
+    clear_manifest_cache,
+    get_manifest_path,
+    get_template_entry,
+    load_manifest,
+)
+
+OLD_NS = 1_000_000_000_000_000_000
+
+
+def settle(path):
+    """Backdate a file tree so its stamps are outside the racy window."""
+    for root, dirs, files in os.walk(path):
+        for name in dirs + files:
+            os.utime(os.path.join(root, name), ns=(OLD_NS, OLD_NS))
+    os.utime(path, ns=(OLD_NS, OLD_NS))
+
+
+@pytest.fixture
+def templates_dir(tmp_path, monkeypatch, make_template):
+    """Templates directory with a private cache directory."""
+    monkeypatch.setenv("PK_CACHE_DIR", str(tmp_path / "cache"))
+    clear_manifest_cache()
+    root = tmp_path / "templates"
+    root.mkdir()
+    make_template(root, "alpha", "First")
+    make_template(root, "beta", "Second", presets=("b", "a"))
+    (root / "not_a_template").mkdir()
+    (root / "base.schema.json").write_text("{}")
+    settle(root)
+    yield root
+    clear_manifest_cache()
+
+
+class TestLoadManifest:
+    """Tests for load_manifest function."""
+
+    def test_indexes_templates(self, templates_dir):
+        """Should record descriptions, presets and file hashes of templates only."""
+        templates = load_manifest(templates_dir)["templates"]
+        assert list(templates) == ["alpha", "beta"]
+        assert templates["alpha"]["description"] == "First"
+        assert templates["beta"]["presets"] == ["a", "b"]
+        assert len(templates["alpha"]["files"]["template.md"]["sha256"]) == 64
+
+    def test_fresh_manifest_is_not_rebuilt(self, templates_dir, forbid_rebuild):
+        """Unchanged templates should be served from memory and from disk."""
+        load_manifest(templates_dir)
+        forbid_rebuild(manifest_module, "scan_template")
+        load_manifest(templates_dir)
+
+        clear_manifest_cache()
+        assert get_manifest_path(templates_dir).exists()
+        assert list(load_manifest(templates_dir)["templates"]) == ["alpha", "beta"]
+
+    def test_detects_changes(self, templates_dir, make_template):
+        """Edited schemas, new presets and added or removed templates are picked up."""
+        load_manifest(templates_dir)
+
+        (templates_dir / "alpha" / "schema.json").write_text(json.dumps({"description": "New"}))
+        (templates_dir / "beta" / "examples" / "c.yml").write_text("name: y\n")
+        make_template(templates_dir, "gamma")
+        (templates_dir / "not_a_template" / "template.md").write_text("")
+        os.rename(templates_dir / "alpha", templates_dir / "alpha2")
+
+        templates = load_manifest(templates_dir)["templates"]
+        assert list(templates) == ["alpha2", "beta", "gamma", "not_a_template"]
+        assert templates["alpha2"]["description"] == "New"
+        assert templates["beta"]["presets"] == ["a", "b", "c"]
+
+    def test_rereads_racy_entries(self, templates_dir):
+        """An edit in the same mtime tick as the build should still be seen."""
+        load_manifest(templates_dir)
+        schema = templates_dir / "alpha" / "schema.json"
+        schema.write_text(json.dumps({"description": "RacyA"}))
+        load_manifest(templates_dir)
+
+        stat = schema.stat()
+        schema.write_text(json.dumps({"description": "RacyB"}))
+        os.utime(schema, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        assert load_manifest(templates_dir)["templates"]["alpha"]["description"] == "RacyB"
+
+    def test_ignores_corrupt_manifest_file(self, templates_dir):
+        """A damaged manifest file should be rebuilt."""
+        path = get_manifest_path(templates_dir)
+        path.parent.mkdir(parents=True)
+        path.write_text("{not json")
+        assert list(load_manifest(templates_dir)["templates"]) == ["alpha", "beta"]
+        assert json.loads(path.read_text())["version"] == manifest_module.MANIFEST_VERSION
+
+    def test_invalid_schema_json(self, templates_dir):
+        """Invalid schema JSON should raise ValueError naming the file."""
+        (templates_dir / "alpha" / "schema.json").write_text("{")
+        with pytest.raises(ValueError, match="schema.json"):
+            load_manifest(templates_dir)
+
+
+class TestGetTemplateEntry:
+    """Tests for get_template_entry function."""
+
+    def test_checks_only_one_template(self, templates_dir, forbid_rebuild):
+        """Changes to other templates should not trigger a rescan."""
+        load_manifest(templates_dir)
+        (templates_dir / "beta" / "examples" / "c.yaml").write_text("name: y\n")
+        forbid_rebuild(manifest_module, "scan_template")
+        assert get_template_entry(templates_dir, "alpha")["presets"] == ["default"]
+
+    def test_refreshes_stale_entry(self, templates_dir):
+        """A changed template should be rescanned on lookup."""
+        load_manifest(templates_dir)
+        (templates_dir / "beta" / "examples" / "a.yaml").unlink()
+        assert get_template_entry(templates_dir, "beta")["presets"] == ["b"]
+
+    def test_missing_template(self, templates_dir):
+        """Unknown names and non-template directories have no entry."""
+        assert get_template_entry(templates_dir, "nope") is None
+        assert get_template_entry(templates_dir, "not_a_template") is None
@@ -0,0 +1,84 @@
+"""Tests for the precompile module."""
+
+import sys
+
+import pytest
+
+import pk.render as render_module
+from pk.precompile import compile_template_module, module_name, precompile_templates
+from pk.render import (
+    clear_template_cache,
+    get_templates_dir,
+    list_templates,
+    load_preset,
+    load_schema,
+    load_template,
+    merge_params,
+    render,
+)
+
+
+@pytest.fixture
+def precompiled_package(tmp_path, monkeypatch):
+    """Precompile all templates into a temporary importable package."""
+    package = "pk_precompiled_test"
+    precompile_templates(get_templates_dir(), tmp_path / package)
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.setattr(render_module, "PRECOMPILED_PACKAGE", package)
+    clear_template_cache()
+    yield package
+    for name in [m for m in sys.modules if m.startswith(package)]:
+        del sys.modules[name]
+    clear_template_cache()
+
+
+def _no_compile(*args, **kwargs):
+    raise AssertionError("template was compiled from source")
+
+
+class TestModuleName:
+    """Tests for module_name function."""
+
+    def test_produces_identifier(self):
+        """Module names should be valid identifiers."""
+        assert module_name("ci_cd").isidentifier()
+        assert module_name("my-template").isidentifier()
+
+
+class TestCompileTemplateModule:
+    """Tests for compile_template_module function."""
+
+    def test_embeds_source_hash(self):
+        """Generated module should record the source hash."""
+        source = compile_template_module("t", "Hello {{ name }}")
+        assert "SOURCE_HASH = " in source
+        assert "def root(" in source
+
+
+class TestPrecompiledLoading:
+    """Tests for loading precompiled templates at render time."""
+
+    def test_writes_module_per_template(self, tmp_path):
+        """Should write one module per template plus the package init."""
+        written = precompile_templates(get_templates_dir(), tmp_path / "out")
+        assert len(written) == len(list_templates())
+        assert (tmp_path / "out" / "__init__.py").exists()
+
+    def test_renders_without_compiling(self, precompiled_package, monkeypatch):
+        """Matching precompiled modules should be used instead of compiling."""
+        monkeypatch.setattr(render_module._env, "compile", _no_compile)
+        for template_info in list_templates():
+            name = template_info["name"]
+            text = load_template(name)
+            schema = load_schema(name)
+            params = merge_params(schema, preset_params=load_preset(name, "default"))
+            rendered = render(text, params, template_name=name)
+            golden = get_templates_dir() / name / "tests" / "render_golden.md"
+            assert rendered.strip() == golden.read_text(encoding="utf-8").strip()
+
+    def test_falls_back_when_source_changed(self, precompiled_package):
+        """A stale precompiled module should be ignored."""
+        text = load_template("audit") + "\nEDITED {{ repo_path }}"
+        params = merge_params(load_schema("audit"))
+        rendered = render(text, params, template_name="audit")
+        assert rendered.endswith("EDITED .")
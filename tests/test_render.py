@@ -1,5 +1,6 @@
 """Tests for the render module."""
 
+import asyncio
 import json
 import tempfile
 
@@ -7,24 +8,53 @@ import pytest
 import yaml
 
 from pk.render import (
+    CompiledTemplateCache,
+    RenderCache,
     RenderError,
+    RunPacketWriter,
     SchemaValidationError,
     TemplateError,
     TemplateNotFoundError,
+    clear_template_cache,
+    clear_validator_cache,
     compute_hash,
+    compute_schema_hash,
+    configure_bytecode_cache,
+    emit_run_packet,
+    get_compiled_template,
+    get_compiled_template_async,
+    get_param_checker,
     get_schema_defaults,
     get_schema_variables,
+    get_template_dir,
+    get_template_roots,
     get_template_variables,
+    get_validator,
+    invalidate_render_cache,
     list_presets,
     list_templates,
     load_params_file,
     load_preset,
+    load_preset_async,
     load_schema,
+    load_schema_async,
     load_template,
+    load_template_async,
     merge_params,
     parse_cli_override,
+    prepare_validated_base,
+    prewarm_validators,
     render,
+    render_async,
+    render_cache_stats,
+    render_cached,
+    render_stream,
+    render_stream_async,
+    resolve_template_root,
+    template_cache_stats,
+    validate_overlay,
     validate_params,
+    write_stream,
 )
 
 
@@ -54,6 +84,104 @@ class TestListTemplates:
             assert len(t["description"]) > 0
 
 
+class TestTemplateRoots:
+    """Tests for the template search path."""
+
+    @pytest.fixture
+    def roots(self, tmp_path, monkeypatch, make_template):
+        """Two extra roots on PK_TEMPLATE_PATH and one from the config file."""
+        import os
+
+        first, second, configured = tmp_path / "first", tmp_path / "second", tmp_path / "conf"
+        make_template(first, "audit", "First audit")
+        make_template(second, "audit", "Second audit")
+        make_template(second, "extra", "Extra")
+        (second / "extra" / "examples" / "second.yaml").write_text("x: 2\n")
+        make_template(configured, "extra", "Configured extra")
+        make_template(configured, "configured", "Configured only")
+
+        config = tmp_path / "config.toml"
+        config.write_text('[templates]\npath = ["conf"]\n')
+        monkeypatch.setenv("PK_CONFIG", str(config))
+        monkeypatch.setenv("PK_TEMPLATE_PATH", os.pathsep.join([str(first), str(second)]))
+        return first, second, configured
+
+    def test_search_order(self, roots):
+        """Env roots come first, then config roots, then the built-in templates."""
+        first, second, configured = roots
+        found = get_template_roots()
+        assert [(r.path, r.source) for r in found[:3]] == [
+            (first, "PK_TEMPLATE_PATH"),
+            (second, "PK_TEMPLATE_PATH"),
+            (configured, "config"),
+        ]
+        assert found[3].source == "built-in"
+
+    def test_first_root_wins(self, roots):
+        """A template is served from the first root that has it."""
+        first, second, configured = roots
+        assert get_template_dir("audit") == first / "audit"
+        assert resolve_template_root("extra").path == second
+        assert resolve_template_root("configured").source == "config"
+        assert resolve_template_root("readme").source == "built-in"
+        assert load_template("audit").startswith("First audit")
+        assert list_presets("extra") == ["default", "second"]
+
+    def test_lists_union_of_roots(self, roots):
+        """Listing should merge all roots, with shadowed templates listed once."""
+        templates = {t["name"]: t["description"] for t in list_templates()}
+        assert templates["audit"] == "First audit"
+        assert templates["extra"] == "Extra"
+        assert templates["configured"] == "Configured only"
+        assert "readme" in templates
+        assert list(templates) == sorted(templates)
+
+    def test_lookups_use_index(self, roots, monkeypatch):
+        """Repeated lookups should not list the roots again."""
+        import pk.catalog as catalog_module
+
+        resolve_template_root("audit")
+        calls = []
+        list_dirs = catalog_module._list_template_dirs
+        monkeypatch.setattr(
+            catalog_module, "_list_template_dirs", lambda path: calls.append(path) or list_dirs(path)
+        )
+        for name in ("audit", "extra", "configured", "readme"):
+            resolve_template_root(name)
+        assert calls == []
+
+    def test_new_template_is_found(self, roots, make_template):
+        """Templates added after the index was built should still resolve."""
+        first, _, _ = roots
+        resolve_template_root("audit")
+        make_template(first, "late", "Late")
+        assert get_template_dir("late") == first / "late"
+
+    def test_removed_template_falls_through(self, roots):
+        """Removing a template should expose the next root's copy."""
+        import shutil
+
+        first, second, _ = roots
+        assert get_template_dir("audit") == first / "audit"
+        shutil.rmtree(first / "audit")
+        assert get_template_dir("audit") == second / "audit"
+
+    def test_missing_root_is_ignored(self, roots, tmp_path, monkeypatch):
+        """Roots that do not exist should be skipped."""
+        monkeypatch.setenv("PK_TEMPLATE_PATH", str(tmp_path / "nope"))
+        assert resolve_template_root("audit").source == "built-in"
+        with pytest.raises(TemplateNotFoundError):
+            get_template_dir("nonexistent_xyz")
+
+    def test_invalid_config(self, tmp_path, monkeypatch):
+        """A broken config file should raise TemplateError."""
+        config = tmp_path / "config.toml"
+        config.write_text("[templates\n")
+        monkeypatch.setenv("PK_CONFIG", str(config))
+        with pytest.raises(TemplateError, match="config"):
+            get_template_roots()
+
+
 class TestLoadTemplate:
     """Tests for load_template function."""
 
@@ -86,6 +214,76 @@ class TestLoadSchema:
         assert "title" in schema or "description" in schema
         assert schema.get("type") == "object"
 
+    def test_resolves_base_refs(self):
+        """Base $refs should be resolved, with local keywords taking precedence."""
+        schema = load_schema("security")
+        assert "$ref" not in json.dumps(schema)
+        budget = schema["properties"]["time_budget_minutes"]
+        assert budget["type"] == "integer"
+        assert budget["default"] == 90
+        assert budget["minimum"] == 15
+
+    def test_returns_independent_copies(self):
+        """Editing a loaded schema should not affect other loads or templates."""
+        from pk.catalog import _load_shared_schema
+
+        assert _load_shared_schema("audit") is _load_shared_schema("audit")
+        audit = load_schema("audit")
+        assert audit is not load_schema("audit")
+
+        audit["properties"]["repo_path"]["default"] = "/elsewhere"
+        audit["required"].append("repo_path")
+        assert load_schema("audit")["properties"]["repo_path"]["default"] == "."
+        assert load_schema("ci_cd")["properties"]["repo_path"]["default"] == "."
+        assert load_schema("audit")["required"] == []
+
+    def test_base_definitions_are_not_shared(self):
+        """Each cached schema should own its copy of a base definition."""
+        from pk.catalog import _load_shared_schema
+
+        audit = _load_shared_schema("audit")["properties"]["repo_path"]
+        ci_cd = _load_shared_schema("ci_cd")["properties"]["repo_path"]
+        assert audit == ci_cd
+        assert audit is not ci_cd
+
+    def test_reloads_when_referenced_file_changes(self, tmp_path, monkeypatch):
+        """Editing the base schema should invalidate dependent schemas."""
+        import os
+
+        import pk.catalog as catalog_module
+
+        (tmp_path / "t").mkdir()
+        (tmp_path / "t" / "schema.json").write_text(json.dumps({
+            "type": "object",
+            "properties": {"x": {"$ref": "../base.schema.json#/definitions/x"}},
+        }))
+        base = tmp_path / "base.schema.json"
+        base.write_text(json.dumps({"definitions": {"x": {"type": "string", "default": "a"}}}))
+        monkeypatch.setattr(catalog_module, "get_templates_dir", lambda: tmp_path)
+
+        assert get_schema_defaults(load_schema("t")) == {"x": "a"}
+        base.write_text(json.dumps({"definitions": {"x": {"type": "string", "default": "bb"}}}))
+        os.utime(base, ns=(0, 0))
+        assert get_schema_defaults(load_schema("t")) == {"x": "bb"}
+
+    @pytest.mark.parametrize("ref", [
+        "../missing.json#/definitions/x",
+        "../base.schema.json#/definitions/nope",
+        "#/properties/x",
+    ])
+    def test_bad_refs_raise(self, ref, tmp_path, monkeypatch):
+        """Missing targets and circular references should raise TemplateError."""
+        import pk.catalog as catalog_module
+
+        (tmp_path / "t").mkdir()
+        (tmp_path / "t" / "schema.json").write_text(
+            json.dumps({"properties": {"x": {"$ref": ref}}})
+        )
+        (tmp_path / "base.schema.json").write_text(json.dumps({"definitions": {}}))
+        monkeypatch.setattr(catalog_module, "get_templates_dir", lambda: tmp_path)
+        with pytest.raises(TemplateError, match="\\$ref"):
+            load_schema("t")
+
 
 class TestListPresets:
     """Tests for list_presets function."""
@@ -168,6 +366,13 @@ class TestGetSchemaDefaults:
         assert defaults["count"] == 10
         assert "no_default" not in defaults
 
+    def test_returns_copies(self):
+        """Mutating returned defaults should not leak into later calls."""
+        schema = load_schema("audit")
+        get_schema_defaults(schema)["scope"].append("mutated")
+        assert get_schema_defaults(schema)["scope"] == ["."]
+        assert schema["properties"]["scope"]["default"] == ["."]
+
 
 class TestMergeParams:
     """Tests for merge_params function."""
@@ -253,6 +458,147 @@ class TestValidateParams:
             validate_params(schema, params)
 
 
+class TestValidatorRegistry:
+    """Tests for the shared validator registry."""
+
+    def test_reuses_validator_for_same_schema(self):
+        """The same schema object should map to one validator."""
+        schema = load_schema("audit")
+        assert get_validator(schema) is get_validator(schema)
+
+    def test_keyed_by_content(self):
+        """Equal schema content should share a validator across dicts."""
+        clear_validator_cache()
+        first = get_validator(load_schema("audit"))
+        assert get_validator(load_schema("audit")) is first
+        assert get_validator(load_schema("security")) is not first
+
+    def test_schema_edited_in_place(self):
+        """Editing a schema dict should change how params validate."""
+        schema = {"properties": {"a": {"type": "string"}}}
+        validate_params(schema, {"a": "x"})
+        schema["properties"]["a"]["type"] = "integer"
+        with pytest.raises(SchemaValidationError):
+            validate_params(schema, {"a": "x"})
+        assert not get_validator(schema).is_valid({"a": "x"})
+
+    def test_validate_params_uses_registry(self, monkeypatch):
+        """validate_params should reuse the warmed checker for equal schemas."""
+        import pk.render as render_module
+
+        schema = load_schema("audit")
+        checker = get_param_checker(schema)
+        assert get_param_checker(load_schema("audit")) is checker
+
+        calls = []
+
+        def counted(params):
+            calls.append(params)
+            return checker(params)
+
+        def fail(*args, **kwargs):
+            raise AssertionError("checker rebuilt")
+
+        monkeypatch.setitem(render_module._param_checkers, compute_schema_hash(schema), counted)
+        monkeypatch.setattr(render_module, "compile_param_checker", fail)
+        monkeypatch.setattr(render_module, "Draft7Validator", fail)
+        params = merge_params(schema)
+        validate_params(schema, params)
+        validate_params(load_schema("audit"), params)
+        assert len(calls) == 2
+
+    def test_prewarm_all_templates(self, monkeypatch):
+        """Prewarming should build a validator for every template."""
+        import pk.render as render_module
+
+        clear_validator_cache()
+        assert prewarm_validators() == len(list_templates())
+
+        monkeypatch.setattr(render_module, "Draft7Validator", None)
+        for template_info in list_templates():
+            get_validator(load_schema(template_info["name"]))
+
+    def test_thread_safe(self):
+        """Concurrent lookups should all get the same validator."""
+        from concurrent.futures import ThreadPoolExecutor
+
+        clear_validator_cache()
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            validators = list(pool.map(lambda _: get_validator(load_schema("readme")), range(32)))
+        assert all(v is validators[0] for v in validators)
+
+
+def _validation_errors(fn, *args):
+    """Return the SchemaValidationError messages raised by fn, or []."""
+    try:
+        fn(*args)
+    except SchemaValidationError as e:
+        return e.errors
+    return []
+
+
+class TestValidateOverlay:
+    """Tests for prepare_validated_base and validate_overlay."""
+
+    OVERRIDES = [
+        {},
+        {"depth": "deep"},
+        {"depth": "bogus", "time_budget_minutes": 1},
+        {"scope": ["src", 3], "notes": None},
+        {"time_budget_minutes": True, "unknown_key": 1},
+    ]
+
+    def test_matches_full_validation(self):
+        """Errors should equal full validation for every template and preset."""
+        for template_info in list_templates():
+            name = template_info["name"]
+            schema = load_schema(name)
+            for preset in [None, *list_presets(name)]:
+                preset_params = load_preset(name, preset) if preset else None
+                base = prepare_validated_base(schema, preset_params)
+                for overrides in self.OVERRIDES:
+                    merged = merge_params(schema, preset_params, cli_overrides=overrides)
+                    assert _validation_errors(validate_overlay, base, overrides) == (
+                        _validation_errors(validate_params, schema, merged)
+                    ), (name, preset, overrides)
+
+    def test_invalid_base_reported_until_overridden(self):
+        """Base errors should be cached and cleared by a valid override."""
+        schema = load_schema("audit")
+        base = prepare_validated_base(schema, {"depth": "bogus"})
+        errors = _validation_errors(validate_overlay, base, {})
+        assert errors == ["  - depth: 'bogus' is not one of ['fast', 'normal', 'deep']"]
+        validate_overlay(base, {"depth": "fast"})
+
+    def test_required_checked_against_merged_keys(self):
+        """Required keys may come from the base or the overlay."""
+        schema = {
+            "type": "object",
+            "properties": {"a": {"type": "string"}, "b": {"type": "integer"}},
+            "required": ["a", "b"],
+        }
+        base = prepare_validated_base(schema, {"a": "x"})
+        validate_overlay(base, {"b": 1})
+        errors = _validation_errors(validate_overlay, base, {"a": 1})
+        assert errors == [
+            "  - a: 1 is not of type 'string'",
+            "  - root: 'b' is a required property",
+        ]
+
+    def test_falls_back_for_other_root_keywords(self):
+        """Root-level constraints like dependencies need full validation."""
+        schema = {
+            "type": "object",
+            "properties": {"a": {"type": "string"}, "b": {"type": "string"}},
+            "dependencies": {"a": ["b"]},
+        }
+        base = prepare_validated_base(schema)
+        assert base.property_checkers is None
+        validate_overlay(base, {})
+        with pytest.raises(SchemaValidationError, match="'b' is a dependency of 'a'"):
+            validate_overlay(base, {"a": "x"})
+
+
 class TestGetTemplateVariables:
     """Tests for get_template_variables function."""
 
@@ -314,6 +660,263 @@ class TestRender:
         assert render(template, {"show": False}) == "hidden"
 
 
+class TestCompiledTemplateCache:
+    """Tests for the compiled-template cache."""
+
+    def test_reuses_compiled_template(self):
+        """Same name and content should hit the cache."""
+        clear_template_cache()
+        first = get_compiled_template("Hi {{ name }}", "greeting")
+        second = get_compiled_template("Hi {{ name }}", "greeting")
+        assert first is second
+
+        stats = template_cache_stats()
+        assert stats.misses == 1
+        assert stats.hits == 1
+
+    def test_content_change_recompiles(self):
+        """Editing the template text should produce a new compilation."""
+        clear_template_cache()
+        first = get_compiled_template("Hi {{ name }}", "greeting")
+        second = get_compiled_template("Bye {{ name }}", "greeting")
+        assert first is not second
+        assert second.render(name="x") == "Bye x"
+
+    def test_render_uses_cache(self):
+        """Repeated renders should compile only once."""
+        clear_template_cache()
+        for _ in range(3):
+            assert render("{{ n }}", {"n": 1}, template_name="t") == "1"
+        stats = template_cache_stats()
+        assert stats.misses == 1
+        assert stats.hits == 2
+
+    def test_evicts_least_recently_used(self):
+        """Cache should stay bounded and count evictions."""
+        cache = CompiledTemplateCache(maxsize=2)
+        for key in ("a", "b", "a", "c"):
+            cache.get_or_compile(key, lambda k=key: k)
+        stats = cache.stats()
+        assert stats.size == 2
+        assert stats.evictions == 1
+        assert stats.hits == 1
+        # "b" was least recently used and should have been evicted
+        cache.get_or_compile("b", lambda: "b2")
+        assert cache.stats().misses == 4
+
+    def test_syntax_error_not_cached(self):
+        """Compilation failures should surface as RenderError."""
+        clear_template_cache()
+        with pytest.raises(RenderError):
+            render("{% if %}", {})
+        assert template_cache_stats().size == 0
+
+
+class TestBytecodeCache:
+    """Tests for the persistent bytecode cache."""
+
+    @pytest.fixture
+    def bytecode_dir(self, tmp_path):
+        """Point the bytecode cache at a temporary directory."""
+        cache_dir = configure_bytecode_cache(enabled=True, directory=tmp_path / "bc")
+        clear_template_cache()
+        yield cache_dir
+        configure_bytecode_cache()
+        clear_template_cache()
+
+    def test_writes_bytecode_for_named_templates(self, bytecode_dir):
+        """Compiling a named template should persist its bytecode."""
+        render("Hi {{ name }}", {"name": "a"}, template_name="greeting")
+        assert len(list(bytecode_dir.iterdir())) == 1
+
+    def test_loads_bytecode_without_compiling(self, bytecode_dir, monkeypatch):
+        """A fresh in-memory cache should load bytecode instead of compiling."""
+        import pk.render as render_module
+
+        render("Hi {{ name }}", {"name": "a"}, template_name="greeting")
+        clear_template_cache()
+
+        def fail_compile(*args, **kwargs):
+            raise AssertionError("template was recompiled")
+
+        monkeypatch.setattr(render_module._env, "compile", fail_compile)
+        assert render("Hi {{ name }}", {"name": "b"}, template_name="greeting") == "Hi b"
+
+    def test_source_change_invalidates(self, bytecode_dir):
+        """Changed template content must not reuse stale bytecode."""
+        render("Hi {{ name }}", {"name": "a"}, template_name="greeting")
+        clear_template_cache()
+        assert render("Bye {{ name }}", {"name": "a"}, template_name="greeting") == "Bye a"
+
+    def test_env_var_disables(self, monkeypatch):
+        """PK_BYTECODE_CACHE=0 should disable the cache."""
+        monkeypatch.setenv("PK_BYTECODE_CACHE", "0")
+        try:
+            assert configure_bytecode_cache() is None
+            clear_template_cache()
+            assert render("Hi", {}, template_name="greeting") == "Hi"
+        finally:
+            monkeypatch.delenv("PK_BYTECODE_CACHE")
+            configure_bytecode_cache()
+
+
+class TestRenderCached:
+    """Tests for render memoization."""
+
+    def test_returns_cached_render(self, monkeypatch):
+        """Equal params should be served without validating or rendering."""
+        import pk.render as render_module
+
+        invalidate_render_cache()
+        schema = {"type": "object", "properties": {"n": {"type": "integer"}}}
+        first = render_cached("n={{ n }}", schema, {"n": 1})
+        assert first == ("n=1", compute_hash("n=1"))
+
+        def fail(*args, **kwargs):
+            raise AssertionError("cache miss")
+
+        monkeypatch.setattr(render_module, "validate_params", fail)
+        monkeypatch.setattr(render_module, "render", fail)
+        hits = render_cache_stats().hits
+        assert render_cached("n={{ n }}", schema, {"n": 1}) == first
+        assert render_cache_stats().hits == hits + 1
+
+    def test_different_params_miss(self):
+        """Different params should render separately."""
+        invalidate_render_cache()
+        schema = {"type": "object"}
+        assert render_cached("{{ a }}", schema, {"a": 1})[0] == "1"
+        assert render_cached("{{ a }}", schema, {"a": 2})[0] == "2"
+
+    def test_invalid_params_not_cached(self):
+        """Validation failures should raise and not be cached."""
+        invalidate_render_cache()
+        schema = {"type": "object", "properties": {"n": {"type": "integer"}}}
+        with pytest.raises(SchemaValidationError):
+            render_cached("{{ n }}", schema, {"n": "x"})
+        assert render_cache_stats().size == 0
+
+    def test_invalidate_by_template(self):
+        """Invalidation can target a single template source."""
+        invalidate_render_cache()
+        render_cached("a{{ n }}", {}, {"n": 1})
+        render_cached("b{{ n }}", {}, {"n": 1})
+        assert invalidate_render_cache("a{{ n }}") == 1
+        assert render_cache_stats().size == 1
+
+    def test_bounded_by_bytes(self):
+        """Total stored size should stay under maxbytes."""
+        cache = RenderCache(maxsize=100, maxbytes=1000)
+        for i in range(10):
+            cache.put("t", str(i), "x" * 300, "h")
+        stats = cache.stats()
+        assert stats.nbytes <= 1000
+        assert stats.evictions > 0
+        assert cache.get("t", "9") == ("x" * 300, "h")
+        assert cache.get("t", "0") is None
+
+
+class TestRenderStream:
+    """Tests for render_stream and write_stream functions."""
+
+    def test_matches_render(self):
+        """Streamed chunks should join to the same text as render()."""
+        text = load_template("audit")
+        params = merge_params(load_schema("audit"), preset_params=load_preset("audit", "default"))
+        chunks = list(render_stream(text, params, template_name="audit"))
+        assert len(chunks) > 1
+        assert "".join(chunks) == render(text, params, template_name="audit")
+
+    def test_raises_render_error_lazily(self):
+        """Undefined variables should raise RenderError while iterating."""
+        stream = render_stream("ok {{ missing }}", {})
+        with pytest.raises(RenderError):
+            list(stream)
+
+    def test_write_stream_hashes_incrementally(self):
+        """write_stream should fan out chunks and return the full-text hash."""
+        import io
+
+        first, second = io.StringIO(), io.StringIO()
+        digest = write_stream(["Hello ", "Wörld"], first, second)
+        assert first.getvalue() == second.getvalue() == "Hello Wörld"
+        assert digest == compute_hash("Hello Wörld")
+
+
+class TestAsyncRendering:
+    """Tests for the async rendering API."""
+
+    def test_render_async_matches_render(self):
+        """Async rendering should produce the same output as render()."""
+        async def run():
+            text, schema, preset = await asyncio.gather(
+                load_template_async("audit"),
+                load_schema_async("audit"),
+                load_preset_async("audit", "default"),
+            )
+            params = merge_params(schema, preset_params=preset)
+            return params, await render_async(text, params, template_name="audit")
+
+        params, rendered = asyncio.run(run())
+        assert rendered == render(load_template("audit"), params, template_name="audit")
+
+    def test_concurrent_renders(self):
+        """Many concurrent renders should share one compiled template."""
+        clear_template_cache()
+
+        async def run():
+            return await asyncio.gather(*(
+                render_async("n={{ n }}", {"n": i}, template_name="counter")
+                for i in range(20)
+            ))
+
+        assert asyncio.run(run()) == [f"n={i}" for i in range(20)]
+
+    def test_stream_async(self):
+        """Async streaming should yield the full output in chunks."""
+        async def run():
+            return [chunk async for chunk in render_stream_async(
+                "{% for i in items %}{{ i }},{% endfor %}", {"items": [1, 2, 3]}
+            )]
+
+        assert "".join(asyncio.run(run())) == "1,2,3,"
+
+    def test_async_templates_are_separate(self):
+        """Async and sync compilations of one template must not be mixed."""
+        sync_template = get_compiled_template("x", "shared")
+        async_template = asyncio.run(get_compiled_template_async("x", "shared"))
+        assert sync_template is not async_template
+        assert async_template.environment.is_async
+
+    def test_raises_render_error(self):
+        """Undefined variables should raise RenderError."""
+        with pytest.raises(RenderError):
+            asyncio.run(render_async("{{ missing }}", {}))
+
+
+class TestRunPacket:
+    """Tests for run packet emission."""
+
+    def test_emit_run_packet(self, tmp_path):
+        """emit_run_packet should write prompt, params and meta."""
+        packet_dir = emit_run_packet(tmp_path, "audit", "prompt text", {"b": 1, "a": 2})
+        meta = json.loads((packet_dir / "meta.json").read_text())
+        assert (packet_dir / "prompt.md").read_text() == "prompt text"
+        assert meta["prompt_hash"] == compute_hash("prompt text")
+        assert meta["params_hash"] == compute_hash(json.dumps({"a": 2, "b": 1}, sort_keys=True))
+
+    def test_writer_aborts_on_error(self, tmp_path):
+        """A failed stream should not leave a partial packet behind."""
+        def failing_chunks():
+            yield "partial"
+            raise RenderError("boom")
+
+        with pytest.raises(RenderError):
+            with RunPacketWriter(tmp_path, "audit", {}) as packet:
+                write_stream(failing_chunks(), packet)
+        assert list(tmp_path.iterdir()) == []
+
+
 class TestComputeHash:
     """Tests for compute_hash function."""
 
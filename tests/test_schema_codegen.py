@@ -0,0 +1,158 @@
+"""Tests for pk.schema_codegen module."""
+
+import pytest
+from jsonschema import Draft7Validator
+
+from pk.render import (
+    SchemaValidationError,
+    clear_validator_cache,
+    get_param_checker,
+    list_templates,
+    load_schema,
+    merge_params,
+    validate_params,
+)
+from pk.schema_codegen import (
+    UnsupportedSchemaError,
+    compile_param_checker,
+    generate_checker_source,
+)
+
+# Values covering every type, bool/int and float/int corner cases, and
+# values on both sides of the templates' minimum/maximum bounds.
+_PROBES = [
+    None, True, False, 0, 1, -1, 3, 15, 100, 1000, 10**6, 2.0, 2.5, -0.5, float("inf"),
+    "", "markdown", "deep", "x", [], ["a", "b"], ["a", 1, None, ["b"]], {}, {"k": "v"},
+]
+
+_TYPED_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "n": {"type": ["integer", "null"], "minimum": 0, "maximum": 9.5},
+        "x": {"type": "number", "maximum": 1},
+        "flag": {"type": "boolean"},
+        "tags": {"type": "array", "items": {"type": "string", "enum": ["a", "b"]}},
+        "obj": {"type": "object", "properties": {"deep": {"items": {"type": "integer"}}}},
+        "any": {},
+    },
+    "required": ["n", "flag"],
+}
+
+
+def draft7_errors(schema, params):
+    """Format Draft7Validator errors the way validate_params does."""
+    return [
+        (".".join(str(p) for p in e.absolute_path) if e.absolute_path else "root", e.message)
+        for e in Draft7Validator(schema).iter_errors(params)
+    ]
+
+
+class TestGeneratedChecker:
+    """Differential tests against Draft7Validator."""
+
+    @pytest.mark.parametrize("template", [t["name"] for t in list_templates()])
+    def test_matches_draft7_for_template_schemas(self, template):
+        """Every probe value for every property should give identical errors."""
+        schema = load_schema(template)
+        check = compile_param_checker(schema)
+        base = merge_params(schema)
+
+        assert check(base) == []
+        for key in schema["properties"]:
+            for probe in _PROBES:
+                params = {**base, key: probe}
+                assert check(params) == draft7_errors(schema, params), (key, probe)
+
+    def test_matches_draft7_for_all_bad_values_at_once(self):
+        """Error order should follow the schema when many fields are wrong."""
+        schema = load_schema("audit")
+        params = {key: [None, 2.5] for key in schema["properties"]}
+        assert len(compile_param_checker(schema)(params)) > 1
+        assert compile_param_checker(schema)(params) == draft7_errors(schema, params)
+
+    @pytest.mark.parametrize("params", [
+        {},
+        {"n": True, "flag": 1},
+        {"n": 10.0, "x": 2, "flag": False},
+        {"n": None, "x": True, "flag": True, "tags": ["a", "c", 3]},
+        {"n": -1, "flag": None, "obj": {"deep": [1, 2.0, 2.5, "3"]}},
+        {"n": 5, "flag": True, "obj": {"deep": "nope"}, "any": object()},
+        [],
+        "params",
+    ])
+    def test_matches_draft7_for_nested_schema(self, params):
+        """Type lists, nested items/properties and required should match."""
+        assert compile_param_checker(_TYPED_SCHEMA)(params) == draft7_errors(_TYPED_SCHEMA, params)
+
+    def test_escapes_property_names(self):
+        """Property names are emitted as literals, never as code."""
+        schema = {"properties": {"a'}{b\"": {"items": {"type": "string"}}}}
+        params = {"a'}{b\"": [1]}
+        assert compile_param_checker(schema)(params) == draft7_errors(schema, params)
+
+    @pytest.mark.parametrize("schema", [
+        {"$ref": "#/definitions/x"},
+        {"properties": {"a": {"pattern": "^x"}}},
+        {"properties": {"a": {"enum": [1, 2]}}},
+        {"properties": {"a": {"type": "decimal"}}},
+        {"properties": {"a": {"items": [{"type": "string"}]}}},
+        {"additionalProperties": False},
+        {"properties": {"a": True}},
+    ])
+    def test_rejects_unsupported_schemas(self, schema):
+        """Keywords outside the supported subset should be rejected."""
+        with pytest.raises(UnsupportedSchemaError):
+            generate_checker_source(schema)
+
+
+class TestCompileParamChecker:
+    """Tests for compile_param_checker function."""
+
+    def test_stays_in_memory(self, tmp_path, monkeypatch):
+        """Compiling a checker should not write anything to the cache directory."""
+        monkeypatch.setenv("PK_CACHE_DIR", str(tmp_path / "cache"))
+        schema = load_schema("audit")
+        assert compile_param_checker(schema)(merge_params(schema)) == []
+        assert not (tmp_path / "cache").exists()
+
+    def test_rejects_unsupported_schema(self):
+        """Unsupported schemas should raise before anything is compiled."""
+        with pytest.raises(UnsupportedSchemaError):
+            compile_param_checker({"properties": {"a": {"pattern": "^x"}}})
+
+
+class TestValidateParamsCodegen:
+    """Tests for generated checkers in validate_params."""
+
+    def test_same_messages_as_draft7(self):
+        """Generated and Draft7Validator paths should raise identical errors."""
+        schema = load_schema("audit")
+        params = {**merge_params(schema), "depth": "extreme", "time_budget_minutes": True}
+        errors = []
+        for validator in (None, Draft7Validator(schema)):
+            with pytest.raises(SchemaValidationError) as exc_info:
+                validate_params(schema, params, validator=validator)
+            errors.append(exc_info.value.errors)
+        assert errors[0] == errors[1]
+        assert len(errors[0]) == 2
+
+    def test_falls_back_for_unsupported_schema(self):
+        """Schemas outside the subset should still validate via Draft7Validator."""
+        schema = {"properties": {"name": {"type": "string", "pattern": "^[a-z]+$"}}}
+        validate_params(schema, {"name": "abc"})
+        with pytest.raises(SchemaValidationError, match="does not match"):
+            validate_params(schema, {"name": "ABC"})
+
+    def test_env_var_disables_codegen(self, monkeypatch):
+        """PK_VALIDATOR_CODEGEN=0 should use Draft7Validator-backed checkers."""
+        import pk.render as render_module
+
+        def fail(*args, **kwargs):
+            raise AssertionError("codegen used")
+
+        clear_validator_cache()
+        monkeypatch.setenv("PK_VALIDATOR_CODEGEN", "0")
+        monkeypatch.setattr(render_module, "compile_param_checker", fail)
+        schema = load_schema("audit")
+        get_param_checker(schema)(merge_params(schema))
+        clear_validator_cache()
@@ -0,0 +1,160 @@
+"""Tests for pk.snapshots module."""
+
+import json
+
+import pytest
+from click.testing import CliRunner
+
+import pk.snapshots as snapshots_module
+from pk.cli import main
+from pk.render import get_templates_dir, list_presets, list_templates
+from pk.snapshots import build_snapshots, load_snapshot
+
+
+@pytest.fixture(scope="module")
+def snapshot_dir(tmp_path_factory):
+    """Snapshots of the repository's templates."""
+    out = tmp_path_factory.mktemp("snapshots")
+    build_snapshots(get_templates_dir(), out)
+    return out
+
+
+@pytest.fixture
+def use_snapshots(snapshot_dir, monkeypatch):
+    """Serve snapshots from the built directory."""
+    monkeypatch.setattr(snapshots_module, "get_snapshot_dir", lambda: snapshot_dir)
+    return snapshot_dir
+
+
+@pytest.fixture
+def runner():
+    """Create a CLI runner."""
+    return CliRunner()
+
+
+def forbid_render(monkeypatch):
+    """Make any real render fail the test."""
+    import pk.render
+
+    def fail(*args, **kwargs):
+        raise AssertionError("rendered instead of serving the snapshot")
+
+    monkeypatch.setattr(pk.render, "render_stream", fail)
+
+
+class TestBuildSnapshots:
+    """Tests for build_snapshots function."""
+
+    def test_covers_every_preset(self, snapshot_dir):
+        """Every (template, preset) pair should be snapshotted."""
+        expected = sorted(
+            f"{t['name']}/{preset}.json"
+            for t in list_templates()
+            for preset in list_presets(t["name"])
+        )
+        found = sorted(p.relative_to(snapshot_dir).as_posix() for p in snapshot_dir.rglob("*.json"))
+        assert found == expected
+
+    def test_records_hashes(self, snapshot_dir):
+        """Snapshots should carry the prompt and params hashes."""
+        entry = json.loads((snapshot_dir / "audit" / "default.json").read_text())
+        assert len(entry["prompt_hash"]) == 64
+        assert len(entry["params_hash"]) == 64
+        assert entry["params"]["output_format"] in ("markdown", "json")
+
+
+class TestLoadSnapshot:
+    """Tests for load_snapshot function."""
+
+    def test_serves_current_snapshot(self, use_snapshots):
+        """An unchanged template should have a snapshot."""
+        snapshot = load_snapshot("audit", "default")
+        assert snapshot is not None
+        assert snapshot.template == "audit" and snapshot.preset == "default"
+
+    def test_missing_snapshot(self, use_snapshots):
+        """Unknown templates and presets have no snapshot."""
+        assert load_snapshot("audit", "nope") is None
+        assert load_snapshot("nonexistent_xyz", "default") is None
+        assert load_snapshot("../audit", "default") is None
+
+    def test_disabled(self, use_snapshots, monkeypatch):
+        """PK_SNAPSHOTS=0 should turn snapshots off."""
+        monkeypatch.setenv("PK_SNAPSHOTS", "0")
+        assert load_snapshot("audit", "default") is None
+
+    @pytest.mark.parametrize("edit", ["template.md", "schema.json", "examples/default.yaml"])
+    def test_stale_after_edit(self, edit, use_snapshots, template_root):
+        """Editing the template, schema or preset should invalidate the snapshot."""
+        root = template_root()
+        assert load_snapshot("audit", "default") is not None
+
+        path = root / "audit" / edit
+        if edit == "schema.json":
+            schema = json.loads(path.read_text())
+            schema["title"] = "Changed"
+            path.write_text(json.dumps(schema))
+        else:
+            path.write_text(path.read_text() + "\n# changed\n")
+        assert load_snapshot("audit", "default") is None
+
+    def test_other_version(self, use_snapshots, monkeypatch):
+        """Snapshots built by another promptkit version are ignored."""
+        monkeypatch.setattr(snapshots_module, "__version__", "0.0.0-other")
+        assert load_snapshot("audit", "default") is None
+
+
+class TestRenderCommand:
+    """Tests for serving snapshots from pk render."""
+
+    @pytest.mark.parametrize("template", [t["name"] for t in list_templates()])
+    def test_same_output_as_rendering(self, template, runner, use_snapshots, monkeypatch):
+        """Snapshot output should be byte-identical to a fresh render."""
+        preset = list_presets(template)[0]
+        served = runner.invoke(main, ["render", template, "--preset", preset])
+
+        monkeypatch.setenv("PK_SNAPSHOTS", "0")
+        rendered = runner.invoke(main, ["render", template, "--preset", preset])
+        assert served.exit_code == rendered.exit_code == 0
+        assert served.output == rendered.output
+
+    def test_skips_rendering(self, runner, use_snapshots, tmp_path, monkeypatch):
+        """Plain preset renders, to a file and a run packet, use the snapshot."""
+        forbid_render(monkeypatch)
+        out = tmp_path / "out.md"
+        result = runner.invoke(main, [
+            "render", "audit", "--preset", "default",
+            "--out", str(out), "--run-dir", str(tmp_path / "runs"),
+        ])
+        assert result.exit_code == 0, result.output
+        snapshot = load_snapshot("audit", "default")
+        assert out.read_text() == snapshot.prompt
+
+        (packet,) = (tmp_path / "runs").iterdir()
+        meta = json.loads((packet / "meta.json").read_text())
+        assert meta["prompt_hash"] == snapshot.prompt_hash
+        assert meta["params_hash"] == snapshot.params_hash
+
+    def test_output_through_symlink(self, runner, use_snapshots, tmp_path, monkeypatch):
+        """A snapshot written to a symlinked --out should keep the link and mode."""
+        forbid_render(monkeypatch)
+        target = tmp_path / "target.md"
+        target.write_text("old")
+        target.chmod(0o640)
+        link = tmp_path / "link.md"
+        link.symlink_to(target)
+        result = runner.invoke(main, ["render", "audit", "--preset", "default", "--out", str(link)])
+        assert result.exit_code == 0, result.output
+        assert link.is_symlink()
+        assert target.read_text() == load_snapshot("audit", "default").prompt
+        assert target.stat().st_mode & 0o777 == 0o640
+
+    @pytest.mark.parametrize("extra", [
+        ["--set", "output_format=json"],
+        ["--format", "json"],
+    ])
+    def test_overrides_render(self, extra, runner, use_snapshots, monkeypatch):
+        """Overrides should bypass snapshots."""
+        forbid_render(monkeypatch)
+        result = runner.invoke(main, ["render", "audit", "--preset", "default", *extra])
+        assert result.exit_code != 0
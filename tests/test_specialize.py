@@ -0,0 +1,110 @@
+"""Tests for the specialize module."""
+
+from jinja2 import Environment, nodes
+
+from pk.render import (
+    clear_template_cache,
+    get_specialized_template,
+    list_presets,
+    list_templates,
+    load_preset,
+    load_schema,
+    load_template,
+    merge_params,
+    render,
+    render_specialized,
+    specializable_keys,
+    template_cache_stats,
+)
+from pk.specialize import specialize_ast
+
+
+def _specialize(source, fixed):
+    env = Environment()
+    return specialize_ast(env, env.parse(source), fixed)
+
+
+class TestSpecializeAst:
+    """Tests for specialize_ast function."""
+
+    def test_folds_constant_branches(self):
+        """Branches on fixed values should be removed."""
+        ast = _specialize(
+            "{% if fmt == 'md' %}MD{% elif fmt == 'json' %}JSON{% else %}OTHER{% endif %}",
+            {"fmt": "json"},
+        )
+        assert not list(ast.find_all(nodes.If))
+        data = [n.data for n in ast.find_all(nodes.TemplateData)]
+        assert data == ["JSON"]
+
+    def test_keeps_variable_branches(self):
+        """Branches on non-fixed values should stay."""
+        ast = _specialize(
+            "{% if fmt == 'md' %}A{% elif notes %}B{% else %}C{% endif %}",
+            {"fmt": "json"},
+        )
+        ifs = list(ast.find_all(nodes.If))
+        assert len(ifs) == 1
+        assert isinstance(ifs[0].test, nodes.Name)
+        assert ifs[0].test.name == "notes"
+
+    def test_does_not_substitute_assigned_names(self):
+        """Names the template assigns to must not be treated as constants."""
+        env = Environment()
+        source = "{% for depth in items %}{{ depth }}{% endfor %}|{{ depth }}"
+        ast = specialize_ast(env, env.parse(source), {"depth": "fixed"})
+        template = env.from_string(source)
+        specialized = env.template_class.from_code(
+            env, env.compile(ast), env.make_globals(None)
+        )
+        params = {"items": [1, 2], "depth": "fixed"}
+        assert specialized.render(**params) == template.render(**params)
+
+    def test_merges_static_text(self):
+        """Folding should leave a single Output for contiguous static text."""
+        ast = _specialize("A{% if flag %}B{% endif %}C", {"flag": True})
+        assert len(ast.body) == 1
+        assert isinstance(ast.body[0], nodes.Output)
+
+
+class TestRenderSpecialized:
+    """Tests for specialized rendering through pk.render."""
+
+    def test_matches_render_for_all_presets(self):
+        """Specialized renders must be identical to normal renders."""
+        for template_info in list_templates():
+            name = template_info["name"]
+            text = load_template(name)
+            schema = load_schema(name)
+            keys = specializable_keys(schema)
+            for preset in list_presets(name):
+                params = merge_params(schema, preset_params=load_preset(name, preset))
+                assert render_specialized(text, params, keys, name) == render(text, params, name)
+
+    def test_specializable_keys(self):
+        """Enum and boolean properties should be specializable."""
+        keys = specializable_keys(load_schema("readme"))
+        assert "output_format" in keys
+        assert "include_toc" in keys
+        assert "repo_path" not in keys
+
+    def test_variants_cached_per_signature(self):
+        """Each fixed-param signature should compile one variant."""
+        clear_template_cache()
+        text = "{% if fmt == 'md' %}M{% else %}J{% endif %}{{ n }}"
+        first = get_specialized_template(text, {"fmt": "md"}, "t")
+        assert get_specialized_template(text, {"fmt": "md"}, "t") is first
+        assert get_specialized_template(text, {"fmt": "json"}, "t") is not first
+        assert first.render(fmt="md", n=1) == "M1"
+        # The base compile cache is untouched
+        assert template_cache_stats().size == 0
+
+    def test_equal_values_of_other_types(self):
+        """True, 1 and 1.0 compare equal but must not share a variant."""
+        clear_template_cache()
+        for value in (True, 1, 1.0):
+            variant = get_specialized_template("{{ flag }}", {"flag": value}, "t")
+            assert variant.render(flag=value) == str(value)
+        for value in (True, 1):
+            variant = get_specialized_template("{{ items }}", {"items": [value]}, "t")
+            assert variant.render(items=[value]) == f"[{value}]"
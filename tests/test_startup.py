@@ -0,0 +1,79 @@
+"""Startup cost of the pk CLI, measured with ``python -X importtime``."""
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+HEAVY_MODULES = ("jinja2", "jsonschema", "yaml")
+
+# Total import time per command, in microseconds. Generous enough for slow
+# CI machines without bytecode caches; before imports were made lazy,
+# importing pk.cli alone cost about 280ms.
+LIGHT_BUDGET_US = 200_000
+HEAVY_BUDGET_US = 800_000
+
+
+def import_profile(*args, env=None):
+    """Run ``pk <args>`` under -X importtime and return {module: self_us}."""
+    result = subprocess.run(
+        [
+            sys.executable, "-X", "importtime",
+            "-c", "from pk.cli import main; main(prog_name='pk')", *args,
+        ],
+        capture_output=True,
+        text=True,
+        env={**os.environ, **(env or {})},
+    )
+    assert result.returncode == 0, result.stderr
+    modules = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, _, name = line[len("import time:"):].split("|")
+        modules[name.strip()] = int(self_us)
+    return modules
+
+
+@pytest.mark.parametrize("args", [
+    ["--version"],
+    ["--help"],
+    ["list"],
+    ["show", "audit"],
+    ["presets", "audit"],
+])
+class TestLightCommands:
+    """Commands that only read the template catalog."""
+
+    def test_skip_heavy_dependencies(self, args):
+        """Jinja2, jsonschema and PyYAML should not be imported."""
+        modules = import_profile(*args)
+        assert "pk.cli" in modules
+        heavy = sorted(m for m in modules if m.split(".")[0] in HEAVY_MODULES)
+        assert heavy == []
+
+    def test_within_budget(self, args):
+        """Startup should stay within the light-command budget."""
+        assert sum(import_profile(*args).values()) < LIGHT_BUDGET_US
+
+
+def test_completion_skips_heavy_dependencies():
+    """Shell completion runs on every keystroke and must stay light."""
+    modules = import_profile(env={
+        "_PK_COMPLETE": "bash_complete",
+        "COMP_WORDS": "pk render audit --set output_format=",
+        "COMP_CWORD": "4",
+    })
+    assert "pk.completion" in modules
+    assert sorted(m for m in modules if m.split(".")[0] in HEAVY_MODULES) == []
+    assert sum(modules.values()) < LIGHT_BUDGET_US
+
+
+@pytest.mark.parametrize("args", [
+    ["render", "audit", "--preset", "default"],
+    ["doctor", "-t", "audit"],
+])
+def test_heavy_commands_within_budget(args):
+    """Rendering and validating may import everything, within a budget."""
+    assert sum(import_profile(*args).values()) < HEAVY_BUDGET_US
@@ -0,0 +1,159 @@
+"""Tests for pk.watch module."""
+
+import json
+import shutil
+import time
+
+import pytest
+from click.testing import CliRunner
+
+from pk.cli import main
+from pk.watch import DoctorWatcher
+
+
+@pytest.fixture
+def root(template_root, tmp_path, monkeypatch):
+    """A search root with two copies of audit and a private cache."""
+    monkeypatch.setenv("PK_CACHE_DIR", str(tmp_path / "cache"))
+    return template_root("t1", "t2")
+
+
+def append(path, text):
+    """Append text to a file."""
+    path.write_text(path.read_text() + text)
+
+
+def edit_base_schema(root, key, value):
+    """Set a key of the repo_path definition in the shared base schema."""
+    path = root / "base.schema.json"
+    schema = json.loads(path.read_text())
+    schema["definitions"]["repo_path"][key] = value
+    path.write_text(json.dumps(schema))
+
+
+def rerun(cycle):
+    """(template, check) units a cycle re-ran."""
+    return set(cycle.units)
+
+
+class TestDoctorWatcher:
+    """Tests for DoctorWatcher."""
+
+    def test_start_runs_everything(self, root):
+        """The first cycle should run every check of every template."""
+        watcher = DoctorWatcher()
+        report = watcher.start()
+        assert {r.template for r in report.results} >= {"t1", "t2"}
+        assert report.passed
+        assert watcher.poll() is None
+
+    def test_reruns_checks_reading_changed_file(self, root):
+        """Only the checks reading an edited file should run again."""
+        watcher = DoctorWatcher(["t1", "t2"])
+        watcher.start()
+        (root / "t1" / "tests" / "render_golden.md").write_text("nope\n")
+
+        cycle = watcher.poll()
+        assert rerun(cycle) == {("t1", "golden_test")}
+        assert cycle.changed == ["t1/tests/render_golden.md"]
+        (change,) = cycle.changes
+        assert change.before.passed and not change.after.passed
+        assert "(was ✓)" in cycle.format_cycle()
+        assert cycle.report.failed_count == 1
+
+    def test_template_edit(self, root):
+        """Editing template.md should re-run the checks that read it."""
+        watcher = DoctorWatcher(["t1"])
+        watcher.start()
+        append(root / "t1" / "template.md", "{{ undeclared_x }}\n")
+
+        cycle = watcher.poll()
+        assert rerun(cycle) == {
+            ("t1", "variable_coverage"), ("t1", "render"), ("t1", "golden_test"),
+        }
+        failed = {c.after.check for c in cycle.changes if not c.after.passed}
+        assert "variable_coverage" in failed and "render:default" in failed
+
+    def test_unwatched_template(self, root):
+        """Edits to templates not being watched should run nothing."""
+        watcher = DoctorWatcher(["t1"])
+        watcher.start()
+        append(root / "t2" / "template.md", "{{ undeclared_x }}\n")
+
+        cycle = watcher.poll()
+        assert cycle.units == [] and cycle.changes == []
+        assert "no checks affected" in cycle.format_cycle()
+
+    def test_shared_schema(self, root):
+        """A $ref target change re-runs everything; unused edits re-run nothing."""
+        watcher = DoctorWatcher(["t1", "t2"])
+        watcher.start()
+
+        edit_base_schema(root, "description", "Changed")
+        assert {name for name, _ in rerun(watcher.poll())} == {"t1", "t2"}
+
+        path = root / "base.schema.json"
+        schema = json.loads(path.read_text())
+        schema["title"] = "Not referenced"
+        path.write_text(json.dumps(schema))
+        assert watcher.poll().units == []
+
+    def test_added_and_removed_templates(self, root):
+        """New templates are checked in full and removed ones dropped."""
+        watcher = DoctorWatcher()
+        watcher.start()
+
+        shutil.copytree(root / "t2", root / "t3")
+        cycle = watcher.poll()
+        assert {name for name, _ in rerun(cycle)} == {"t3"}
+        assert all(c.before is None and c.after.template == "t3" for c in cycle.changes)
+
+        shutil.rmtree(root / "t2")
+        cycle = watcher.poll()
+        assert cycle.units == []
+        assert cycle.changes and all(c.after is None for c in cycle.changes)
+        assert "t2" not in {r.template for r in cycle.report.results}
+
+
+    def test_reuses_one_pool(self, root, monkeypatch):
+        """With several jobs, every cycle should run on the same worker pool."""
+        from concurrent.futures import ThreadPoolExecutor
+
+        import pk.watch as watch_module
+
+        pools = []
+
+        class RecordingExecutor(ThreadPoolExecutor):
+            def __init__(self, *args, **kwargs):
+                super().__init__(*args, **kwargs)
+                pools.append(self)
+
+        monkeypatch.setattr(watch_module, "ProcessPoolExecutor", RecordingExecutor)
+        with DoctorWatcher(["t1", "t2"], jobs=2) as watcher:
+            assert watcher.start().passed
+            edit_base_schema(root, "description", "Changed")
+            assert {name for name, _ in rerun(watcher.poll())} == {"t1", "t2"}
+            edit_base_schema(root, "description", "Changed again")
+            assert {name for name, _ in rerun(watcher.poll())} == {"t1", "t2"}
+        assert len(pools) == 1
+        assert pools[0]._shutdown
+
+class TestWatchCommand:
+    """Tests for pk doctor --watch."""
+
+    def test_runs_until_interrupted(self, root, monkeypatch):
+        """The command should print the report, then poll until Ctrl+C."""
+        def interrupt(seconds):
+            raise KeyboardInterrupt
+
+        monkeypatch.setattr(time, "sleep", interrupt)
+        result = CliRunner().invoke(main, ["doctor", "--watch", "-t", "t1"])
+        assert result.exit_code == 0, result.output
+        assert "PROMPTKIT DOCTOR REPORT" in result.output
+        assert "Watching for changes" in result.output
+
+    def test_rejects_fail_fast(self, root):
+        """--fail-fast makes no sense in watch mode."""
+        result = CliRunner().invoke(main, ["doctor", "--watch", "--fail-fast"])
+        assert result.exit_code != 0
+        assert "--fail-fast" in result.output
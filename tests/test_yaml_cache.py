@@ -0,0 +1,113 @@
+"""Tests for pk.yaml_cache module."""
+
+import os
+
+import pytest
+import yaml
+
+import pk.yaml_cache as yaml_cache_module
+from pk.catalog import get_templates_dir
+from pk.yaml_cache import clear_yaml_cache, get_yaml_cache_path, load_yaml_file
+
+OLD_NS = 1_000_000_000_000_000_000
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    """Private cache directory and a cold in-process cache."""
+    monkeypatch.setenv("PK_CACHE_DIR", str(tmp_path / "cache"))
+    clear_yaml_cache()
+    yield tmp_path / "cache"
+    clear_yaml_cache()
+
+
+def write_settled(path, text):
+    """Write a file and backdate it outside the racy window."""
+    path.write_text(text)
+    os.utime(path, ns=(OLD_NS, OLD_NS))
+    return path
+
+
+def forbid_parse(monkeypatch):
+    """Make any YAML parse fail the test."""
+    def fail(*args, **kwargs):
+        raise AssertionError("YAML parsed")
+
+    monkeypatch.setattr(yaml_cache_module.yaml, "load", fail)
+
+
+EXAMPLES = sorted(get_templates_dir().glob("*/examples/*.y*ml"))
+
+
+@pytest.mark.parametrize("path", EXAMPLES, ids=lambda p: f"{p.parent.parent.name}/{p.name}")
+def test_matches_safe_load(path):
+    """Fresh, in-memory and on-disk results should equal yaml.safe_load exactly."""
+    expected = repr(yaml.safe_load(path.read_text(encoding="utf-8")))
+    assert repr(load_yaml_file(path)) == expected
+    assert repr(load_yaml_file(path)) == expected
+    clear_yaml_cache()
+    assert repr(load_yaml_file(path)) == expected
+
+
+class TestLoadYamlFile:
+    """Tests for load_yaml_file function."""
+
+    def test_parses_once(self, tmp_path, cache_dir, monkeypatch):
+        """Later loads should come from memory, then from the disk cache."""
+        path = write_settled(tmp_path / "p.yaml", "a: 1\nb: [x, y]\n")
+        assert load_yaml_file(path) == {"a": 1, "b": ["x", "y"]}
+        assert get_yaml_cache_path(os.path.abspath(path)).exists()
+
+        forbid_parse(monkeypatch)
+        assert load_yaml_file(path) == {"a": 1, "b": ["x", "y"]}
+        clear_yaml_cache()
+        assert load_yaml_file(path) == {"a": 1, "b": ["x", "y"]}
+
+    def test_detects_changes(self, tmp_path):
+        """Edited files should be parsed again."""
+        path = write_settled(tmp_path / "p.yaml", "a: 1\n")
+        load_yaml_file(path)
+        write_settled(path, "a: 22\n")
+        assert load_yaml_file(path) == {"a": 22}
+
+    def test_recent_files_not_cached(self, tmp_path, cache_dir):
+        """Files modified within the racy window should not be cached."""
+        path = tmp_path / "p.yaml"
+        path.write_text("a: 1\n")
+        load_yaml_file(path)
+        assert not get_yaml_cache_path(os.path.abspath(path)).exists()
+
+        # Same size, same mtime: only re-reading can see this edit
+        stat = path.stat()
+        path.write_text("a: 2\n")
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        assert load_yaml_file(path) == {"a": 2}
+
+    def test_returns_copies(self, tmp_path):
+        """Mutating a result should not affect later loads."""
+        path = write_settled(tmp_path / "p.yaml", "a: [1]\n")
+        load_yaml_file(path)["a"].append(2)
+        assert load_yaml_file(path) == {"a": [1]}
+
+    def test_non_json_documents_stay_in_memory(self, tmp_path, cache_dir):
+        """Documents JSON cannot store exactly are not written to disk."""
+        path = write_settled(tmp_path / "p.yaml", "when: 2024-01-02\n1: one\n")
+        first = load_yaml_file(path)
+        assert not get_yaml_cache_path(os.path.abspath(path)).exists()
+        assert load_yaml_file(path) == first
+        assert list(first) == ["when", 1]
+
+    def test_invalid_yaml(self, tmp_path):
+        """Invalid YAML should raise yaml.YAMLError."""
+        path = write_settled(tmp_path / "p.yaml", "a: [1\n")
+        with pytest.raises(yaml.YAMLError):
+            load_yaml_file(path)
+
+    def test_error_shows_source(self, tmp_path):
+        """Errors should quote the offending line with a caret, as SafeLoader does."""
+        path = write_settled(tmp_path / "p.yaml", "a: [1\n")
+        with pytest.raises(yaml.YAMLError) as excinfo:
+            load_yaml_file(path)
+        message = str(excinfo.value)
+        assert "while parsing a flow sequence" in message
+        assert "    a: [1\n       ^" in message